@@ -10,10 +10,12 @@ from openai import OpenAI
 from stegano import tools
 import lib.LogManager as LogManager
 import logging
-from lib.getWeather import MSWeather
-from lib.user_ip import UserIP
+from lib.getWeather import MSWeather, WEATHER_CACHE_TTL
+from lib.weather_scheduler import get_prefetcher
+from lib.user_ip import get_location_resolver
 from plugins_manage import PluginManager
 from lib.ues_skills import UESkills
+from lib.skill_catalog import compile_skill_catalog
 
 # MCP 相关导入
 try:
@@ -256,22 +258,11 @@ class AiAPI:
             return "无"
         return ", ".join([item["name"] for item in file_list])
 
-    def load_skills(self):
-        with open("yyskills/SKILL.md", "r", encoding="utf-8") as f:
-            skills = f.read()
-            return skills
-
-    def load_skills_json(self):
-        with open("yyskills/skill_list.json", "r", encoding="utf-8") as f:
-            skills_json = json.load(f)
-            return skills_json
-
     def load_conversation(self, identity="default"):
         """加载指定标识符的会话记录"""
         GifList = self.load_gif()
         ImgList = self.load_img()
-        skills = self.load_skills()
-        skills_json = self.load_skills_json()
+        skill_catalog = compile_skill_catalog()
 
         filename = f"ai_memory/memory_{identity}.json"
 
@@ -301,16 +292,16 @@ class AiAPI:
         tools_mcp = "你可以使用外部工具查询实时信息，例如高铁票、天气等。如果需要，请直接调用相关工具。"
 
         if not os.path.exists(filename):
-            return [{"role": "system", "content": f"{respon},{sendGif},{HowUseGif},可用的gif有{self._format_file_list(GifList)};{HowSendImg},可用的图片有{self._format_file_list(ImgList)},仅能发送里面有的图片;注意:包含*SEND*标识的消息是用户发送给你的图片，请根据图片内容进行回复。;\n{skills}\n{skills_json}"}]
+            return [{"role": "system", "content": f"{respon},{sendGif},{HowUseGif},可用的gif有{self._format_file_list(GifList)};{HowSendImg},可用的图片有{self._format_file_list(ImgList)},仅能发送里面有的图片;注意:包含*SEND*标识的消息是用户发送给你的图片，请根据图片内容进行回复。;\n{skill_catalog}"}]
 
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 messages = json.load(f)
-                messages[0]["content"] = f"{respon},{sendGif},{HowUseGif},可用的gif有{self._format_file_list(GifList)};{HowSendImg},可用的图片有{self._format_file_list(ImgList)},仅能发送里面有的图片;注意:包含*SEND*标识的消息是用户发送给你的图片，请根据图片内容进行回复。;\n{skills}\n{skills_json}"
+                messages[0]["content"] = f"{respon},{sendGif},{HowUseGif},可用的gif有{self._format_file_list(GifList)};{HowSendImg},可用的图片有{self._format_file_list(ImgList)},仅能发送里面有的图片;注意:包含*SEND*标识的消息是用户发送给你的图片，请根据图片内容进行回复。;\n{skill_catalog}"
                 return messages
         except (json.JSONDecodeError, IOError) as e:
             self.logger.critical(f"加载历史记录失败: {e}")
-            return [{"role": "system", "content": f"{respon},{sendGif},{HowUseGif},可用的gif有{self._format_file_list(GifList)};{HowSendImg},可用的图片有{self._format_file_list(ImgList)},仅能发送里面有的图片;注意:包含*SEND*标识的消息是用户发送给你的图片，请根据图片内容进行回复。;\n{skills}\n{skills_json}"}]
+            return [{"role": "system", "content": f"{respon},{sendGif},{HowUseGif},可用的gif有{self._format_file_list(GifList)};{HowSendImg},可用的图片有{self._format_file_list(ImgList)},仅能发送里面有的图片;注意:包含*SEND*标识的消息是用户发送给你的图片，请根据图片内容进行回复。;\n{skill_catalog}"}]
 
     def save_conversation(self, identity, messages):
         filename = f"ai_memory/memory_{identity}.json"
@@ -473,7 +464,7 @@ class AiAPI:
                 result = await self._handle_weather(cmd_content.strip())
             elif cmd_type == "USESKILLS":
                 # 处理 [USESKILLS:...]
-                result = await self._handle_skills(cmd_content.strip(), working_messages)
+                result = await self._handle_skills(cmd_content.strip(), working_messages, callback)
             else:
                 continue
 
@@ -569,19 +560,22 @@ class AiAPI:
 
     async def _handle_weather(self, location: str) -> str:
         """处理 [Weather:] 命令"""
+        # 预取调度器运行时，缓存有效期跟随其刷新间隔
+        prefetcher = get_prefetcher()
+        ttl = prefetcher.cache_ttl if prefetcher else WEATHER_CACHE_TTL
         if location == "LocalWeather":
-            user_address = await asyncio.to_thread(UserIP().sendAddress)
+            user_address = await asyncio.to_thread(get_location_resolver().get_address)
             self.logger.info(f"获取用户地址: {user_address}")
-            weather_info = await asyncio.to_thread(MSWeather(user_address).return_to_ai)
+            weather_info = await asyncio.to_thread(MSWeather(user_address).return_to_ai, ttl)
         else:
-            weather_info = await asyncio.to_thread(MSWeather(location).return_to_ai)
+            weather_info = await asyncio.to_thread(MSWeather(location).return_to_ai, ttl)
         return weather_info
 
-    async def _handle_skills(self, skill_input: str, messages: List[dict]) -> str:
-        """处理 [USESKILLS:] 命令"""
+    async def _handle_skills(self, skill_input: str, messages: List[dict],
+                             callback: Optional[Callable[[str], None]] = None) -> str:
+        """处理 [USESKILLS:] 命令，异步插件的流式结果通过 callback 实时输出"""
         self.logger.info(f"检测到技能调用指令: {skill_input}")
-        # 假设 UESkills 是同步类
-        skill_result = await asyncio.to_thread(UESkills(skill_input).analyze_skill)
+        skill_result = await UESkills(skill_input).analyze_skill_async(callback)
         # 注意：原代码中处理技能后还会检查是否有插件，这里简化，但可以扩展
         return f"[System]技能返回的结果为: {skill_result}"
 
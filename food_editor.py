@@ -8,78 +8,186 @@ import re  # 添加正则表达式导入
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QLineEdit, QTextEdit, QFileDialog, QMessageBox,
-    QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox, QFormLayout, 
+    QTableView, QHeaderView, QGroupBox, QFormLayout, QAbstractItemView,
     QComboBox  # 添加QComboBox导入
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import (
+    Qt, QThread, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+)
 from PyQt6.QtGui import QPixmap, QIcon
 from lib.food_manager import FoodVerification
+from lib.food_index import get_food_index
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
 import os
+import time
+
+
+# 每批发送给界面的行数，以及两批之间的最长间隔（秒）
+SCAN_BATCH_SIZE = 20
+SCAN_BATCH_INTERVAL = 0.1
+# 关闭窗口时等待扫描线程退出的最长时间（毫秒）
+CLOSE_WAIT_MS = 2000
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
+FOOD_TABLE_HEADERS = ["图片名称", "食物名称", "食物描述", "食物热量", "食物水分", "食用时间", "食物类型"]
+# 按数值排序的列（食物热量、食物水分）
+NUMERIC_COLUMNS = {3, 4}
+
+
+def food_row(image_path, success, data):
+    """把食物信息转换为表格行"""
+    file_name = os.path.basename(image_path)
+    if success:
+        row_data = [
+            file_name,
+            data.get("FoodName", ""),
+            data.get("FoodDescription", ""),
+            str(data.get("FoodCalories", "")),
+            str(data.get("FoodWater", "")),
+            str(data.get("FoodTime", "")),
+            data.get("FoodType", "")  # 添加食物类型字段
+        ]
+    else:
+        # 如果提取失败，填充空白
+        row_data = [file_name, "", "", "", "", "", ""]
+    return row_data, image_path  # 附加image_path用于后续操作
+
+
+def scan_food_file(image_path):
+    """读取单个食物图片的信息并生成表格行（在扫描进程池中执行）"""
+    success, data = FoodVerification.extract_food_info(image_path)
+    return food_row(image_path, success, data)
 
 
 class LoadFoodListWorker(QThread):
-    """加载食物列表的后台线程"""
-    finished = pyqtSignal(list)  # 加载完成信号，传递处理好的数据列表
+    """
+    加载食物列表的后台线程
+    先从食物信息索引中一次读出所有未修改过的图片，其余图片的解析任务分发到进程池，
+    按完成顺序分批把结果发送给界面，可随时取消
+    """
+    batch_ready = pyqtSignal(list)  # 一批处理好的数据 [(row_data, image_path), ...]
+    finished = pyqtSignal(bool)  # 加载结束信号，参数表示是否成功
     progress = pyqtSignal(int, int)  # 进度信号，传递当前进度和总数量
     
-    def __init__(self, folder_path):
+    def __init__(self, folder_path, executor):
         super().__init__()
         self.folder_path = folder_path
+        self.executor = executor
+        self._cancelled = False
+
+    def cancel(self):
+        """取消扫描，尚未开始的任务不会再执行"""
+        self._cancelled = True
     
     def run(self):
-        """在后台线程中执行加载操作"""
+        """在后台线程中分发扫描任务并收集结果"""
+        futures = {}
         try:
-            # 获取所有图片文件扩展名
-            image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
-            
             # 获取food文件夹中的所有图片文件
             image_files = [
                 os.path.join(self.folder_path, file) 
                 for file in os.listdir(self.folder_path) 
-                if os.path.splitext(file)[1].lower() in image_extensions
+                if os.path.splitext(file)[1].lower() in IMAGE_EXTENSIONS
             ]
-            
             total_count = len(image_files)
-            
-            # 准备要发送给主线程的数据
-            result_data = []
-            for idx, image_path in enumerate(image_files):
-                file_name = os.path.basename(image_path)
-                
-                # 尝试提取食物信息
-                success, data = FoodVerification.extract_food_info(image_path)
-                
-                if success:
-                    row_data = [
-                        file_name,
-                        data.get("FoodName", ""),
-                        data.get("FoodDescription", ""),
-                        str(data.get("FoodCalories", "")),
-                        str(data.get("FoodWater", "")),
-                        str(data.get("FoodTime", "")),
-                        data.get("FoodType", "")  # 添加食物类型字段
-                    ]
-                else:
-                    # 如果提取失败，填充空白
-                    row_data = [
-                        file_name,
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        ""
-                    ]
-                
-                result_data.append((row_data, image_path))  # 附加image_path用于后续操作
-                
-                # 发送进度信号
-                self.progress.emit(idx + 1, total_count)
-            
-            self.finished.emit(result_data)
+
+            # 索引中已有且文件没有变化的图片直接生成表格行
+            cached = get_food_index().cached_many(image_files)
+            if cached:
+                self.batch_ready.emit([food_row(path, *cached[path]) for path in cached])
+                self.progress.emit(len(cached), total_count)
+            if self._cancelled:
+                return
+            pending = [path for path in image_files if path not in cached]
+            futures = {self.executor.submit(scan_food_file, path): path for path in pending}
+
+            batch = []
+            last_emit = time.monotonic()
+            for done_count, future in enumerate(as_completed(futures), len(cached) + 1):
+                if self._cancelled:
+                    return
+                try:
+                    batch.append(future.result())
+                except Exception:
+                    # 单个文件失败时仍显示文件名
+                    path = futures[future]
+                    batch.append(([os.path.basename(path), "", "", "", "", "", ""], path))
+
+                if len(batch) >= SCAN_BATCH_SIZE or time.monotonic() - last_emit >= SCAN_BATCH_INTERVAL:
+                    self.batch_ready.emit(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+                    self.progress.emit(done_count, total_count)
+
+            if batch:
+                self.batch_ready.emit(batch)
+            self.progress.emit(total_count, total_count)
+            self.finished.emit(True)
         except Exception as e:
-            # 发送空列表表示加载失败
-            self.finished.emit([])
+            self.finished.emit(False)
+        finally:
+            if self._cancelled:
+                for future in futures:
+                    future.cancel()
+
+
+class FoodTableModel(QAbstractTableModel):
+    """
+    食物列表数据模型
+    每行只保存扫描结果 (row_data, image_path)，不为单元格创建对象；
+    所有已扫描的行都提供给视图，排序和过滤代理才能作用于完整的列表（视图只绘制可见的行）
+    """
+    SortRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._records = []   # 所有已扫描的行
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(FOOD_TABLE_HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._records[index.row()][0][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return value
+        if role == self.SortRole:
+            if index.column() in NUMERIC_COLUMNS:
+                try:
+                    return float(value)
+                except ValueError:
+                    return float("-inf")
+            return value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return FOOD_TABLE_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def append_records(self, records):
+        """追加一批扫描结果"""
+        if not records:
+            return
+        first = len(self._records)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self._records.extend(records)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._records = []
+        self.endResetModel()
+
+    def image_path(self, row):
+        return self._records[row][1]
+
+    def total_count(self):
+        return len(self._records)
 
 
 class SaveFoodDataWorker(QThread):
@@ -144,9 +252,9 @@ class FoodEditorWindow(QMainWindow):
         
         # 初始化工作线程
         self.worker = None
-        self.all_food_data = []  # 存储所有食物数据
-        self.current_display_count = 0  # 当前显示的数量
-        self.load_batch_size = 20  # 每批加载的数量
+        self.load_worker = None
+        self.cancelled_workers = []  # 已取消但尚未退出的扫描线程，保留引用直到线程结束
+        self.scan_executor = None  # 扫描食物图片的进程池，首次加载时创建
         
         # 启动后台线程加载食物列表
         self.load_food_list_async()
@@ -157,17 +265,28 @@ class FoodEditorWindow(QMainWindow):
         left_group = QGroupBox("食物列表")
         left_layout = QVBoxLayout(left_group)
         
-        # 表格显示食物列表
-        self.food_table = QTableWidget()
-        self.food_table.setColumnCount(7)  # 增加一列，总数改为7列
-        self.food_table.setHorizontalHeaderLabels(["图片名称", "食物名称", "食物描述", "食物热量", "食物水分", "食用时间", "食物类型"])
+        # 搜索框，按所有列过滤
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索食物...")
+        left_layout.addWidget(self.search_input)
+
+        # 表格显示食物列表：数据模型 + 排序过滤代理
+        self.food_model = FoodTableModel(self)
+        self.food_proxy = QSortFilterProxyModel(self)
+        self.food_proxy.setSourceModel(self.food_model)
+        self.food_proxy.setSortRole(FoodTableModel.SortRole)
+        self.food_proxy.setFilterKeyColumn(-1)
+        self.food_proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.search_input.textChanged.connect(self.food_proxy.setFilterFixedString)
+
+        self.food_table = QTableView()
+        self.food_table.setModel(self.food_proxy)
+        self.food_table.setSortingEnabled(True)
+        self.food_table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
         self.food_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.food_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.food_table.cellClicked.connect(self.on_food_selected)
-        
-        # 启用滚动条事件监听，用于流式加载
+        self.food_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.food_table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        self.food_table.verticalScrollBar().valueChanged.connect(self.scroll_changed)
+        self.food_table.clicked.connect(self.on_food_selected)
         
         left_layout.addWidget(self.food_table)
         
@@ -252,49 +371,6 @@ class FoodEditorWindow(QMainWindow):
         # 初始化默认文件夹
         self.current_food_folder = "outfood"
     
-    def scroll_changed(self, value):
-        """滚动条变化时触发"""
-        # 检查是否滚动到底部
-        max_scroll = self.food_table.verticalScrollBar().maximum()
-        if value >= max_scroll:
-            # 加载更多数据
-            self.load_more_data()
-    
-    def load_more_data(self):
-        """加载更多数据"""
-        if self.current_display_count < len(self.all_food_data):
-            # 计算接下来要显示的数据
-            start_idx = self.current_display_count
-            end_idx = min(start_idx + self.load_batch_size, len(self.all_food_data))
-            
-            # 临时禁用排序和信号以提高性能
-            self.food_table.setSortingEnabled(False)
-            self.food_table.blockSignals(True)
-            
-            # 添加新行
-            current_row_count = self.food_table.rowCount()
-            rows_to_add = end_idx - start_idx
-            self.food_table.setRowCount(current_row_count + rows_to_add)
-            
-            # 填充数据
-            for i, idx in enumerate(range(start_idx, end_idx)):
-                row = current_row_count + i
-                row_data, _ = self.all_food_data[idx]
-                
-                for col, cell_data in enumerate(row_data):
-                    self.food_table.setItem(row, col, QTableWidgetItem(cell_data))
-            
-            # 恢复排序和信号
-            self.food_table.blockSignals(False)
-            self.food_table.setSortingEnabled(True)
-            
-            # 更新当前显示计数
-            self.current_display_count = end_idx
-            
-            # 更新进度信息
-            self.progress_label.setText(f"已加载 {self.current_display_count}/{len(self.all_food_data)} 个项目")
-            self.progress_label.setVisible(self.current_display_count < len(self.all_food_data))
-    
     def select_food_folder(self):
         """选择食物文件夹"""
         folder_path = QFileDialog.getExistingDirectory(
@@ -307,93 +383,79 @@ class FoodEditorWindow(QMainWindow):
             self.current_food_folder = folder_path
             self.load_food_list_async()
     
+    def get_scan_executor(self):
+        """获取扫描进程池，进程数与CPU核心数一致"""
+        if self.scan_executor is None:
+            self.scan_executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.scan_executor
+
     def load_food_list_async(self):
         """异步加载食物列表"""
         # 检查文件夹是否存在
         if not os.path.exists(self.current_food_folder):
             QMessageBox.warning(self, "警告", f"文件夹 '{self.current_food_folder}' 不存在！")
             return
+
+        # 取消上一次尚未完成的扫描
+        if self.load_worker is not None and self.load_worker.isRunning():
+            self.load_worker.cancel()
+            self.cancelled_workers.append(self.load_worker)
+        self.cancelled_workers = [worker for worker in self.cancelled_workers if worker.isRunning()]
         
         # 清空现有数据
-        self.all_food_data = []
-        self.current_display_count = 0
-        self.food_table.setRowCount(0)
+        self.food_model.clear()
         
         # 显示加载提示
-        self.food_table.setRowCount(1)
-        self.food_table.setItem(0, 0, QTableWidgetItem("正在加载..."))
-        self.food_table.setSpan(0, 0, 1, 7)  # 跨越所有列 (原来是6，现在是7)
         self.progress_label.setVisible(True)
         self.progress_label.setText("正在加载...")
         
         # 创建并启动后台线程
-        self.load_worker = LoadFoodListWorker(self.current_food_folder)
+        self.load_worker = LoadFoodListWorker(self.current_food_folder, self.get_scan_executor())
+        self.load_worker.batch_ready.connect(self.on_batch_ready)
         self.load_worker.finished.connect(self.on_load_finished)
         self.load_worker.progress.connect(self.update_progress)
         self.load_worker.start()
     
     def update_progress(self, current, total):
         """更新加载进度"""
+        if self.sender() is not self.load_worker:
+            return
         self.progress_label.setText(f"正在加载... {current}/{total}")
         self.progress_label.setVisible(True)
+
+    def on_batch_ready(self, rows):
+        """收到一批扫描结果"""
+        # 忽略已取消的扫描发来的结果
+        if self.sender() is not self.load_worker:
+            return
+        self.food_model.append_records(rows)
     
-    def on_load_finished(self, data):
+    def on_load_finished(self, success):
         """处理加载完成的回调"""
-        self.all_food_data = data
-        
-        # 清空表格
-        self.food_table.setRowCount(0)
-        
-        if not data:
+        if self.sender() is not self.load_worker:
+            return
+
+        if self.food_model.total_count() == 0:
             # 如果加载失败，显示错误信息
-            self.food_table.setRowCount(1)
-            self.food_table.setItem(0, 0, QTableWidgetItem("加载失败"))
-            self.food_table.setSpan(0, 0, 1, 7)  # 跨越所有列 (原来是6，现在是7)
-            self.progress_label.setVisible(False)
+            self.progress_label.setText("加载失败")
+            self.progress_label.setVisible(True)
             return
         
-        # 显示第一批数据
-        self.display_initial_data()
-        
         # 更新进度信息
-        self.progress_label.setText(f"已加载 {self.current_display_count}/{len(self.all_food_data)} 个项目")
-        self.progress_label.setVisible(self.current_display_count < len(self.all_food_data))
-    
-    def display_initial_data(self):
-        """显示初始批次的数据"""
-        # 设置表格行数
-        end_idx = min(self.load_batch_size, len(self.all_food_data))
-        self.food_table.setRowCount(end_idx)
-        
-        # 批量禁用排序和信号，提高插入性能
-        self.food_table.setSortingEnabled(False)
-        self.food_table.blockSignals(True)
-        
-        # 插入数据
-        for row, idx in enumerate(range(0, end_idx)):
-            row_data, _ = self.all_food_data[idx]
-            for col, cell_data in enumerate(row_data):
-                self.food_table.setItem(row, col, QTableWidgetItem(cell_data))
-        
-        # 恢复排序和信号
-        self.food_table.blockSignals(False)
-        self.food_table.setSortingEnabled(True)
-        
-        # 调整列宽
-        self.food_table.resizeColumnsToContents()
-        
-        # 更新当前显示计数
-        self.current_display_count = end_idx
+        self.progress_label.setText(f"已加载 {self.food_model.total_count()} 个项目")
+        self.progress_label.setVisible(True)
     
-    def on_food_selected(self, row, column):
+    def on_food_selected(self, proxy_index):
         """当选择食物时，加载详细信息"""
-        # 获取文件名
-        file_item = self.food_table.item(row, 0)
-        if not file_item:
+        # 获取图片路径
+        source_index = self.food_proxy.mapToSource(proxy_index)
+        if not source_index.isValid():
             return
         
-        file_name = file_item.text()
-        image_path = os.path.join(self.current_food_folder, file_name)
+        image_path = self.food_model.image_path(source_index.row())
         
         # 显示图片预览
         pixmap = QPixmap(image_path)
@@ -514,6 +576,18 @@ class FoodEditorWindow(QMainWindow):
         # 清理线程对象
         self.worker = None
 
+    def closeEvent(self, event):
+        """关闭窗口时取消扫描并关闭进程池"""
+        workers = [worker for worker in self.cancelled_workers + [self.load_worker] if worker is not None]
+        for worker in workers:
+            worker.cancel()
+        # 先取消排队中的任务，扫描线程只需等待正在执行的少量任务
+        if self.scan_executor is not None:
+            self.scan_executor.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.wait(CLOSE_WAIT_MS)
+        super().closeEvent(event)
+
 
 def main():
     """启动食物数据编辑器"""
@@ -524,4 +598,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
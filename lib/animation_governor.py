@@ -0,0 +1,162 @@
+'''
+动画调速模块
+根据宠物窗口的状态调整GIF播放：窗口隐藏、最小化、完全透明或移出屏幕时暂停播放；
+一段时间没有交互后降低帧率；鼠标移入或点击时立即恢复全速。
+配置（demo_setting.json）: "animation_governor": {"enabled": true, "idle_seconds": 60, "idle_fps": 5}
+'''
+
+import json
+import logging
+
+from PyQt6.QtCore import Qt, QEvent, QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_SECONDS = 60
+DEFAULT_IDLE_FPS = 5
+# 检查窗口透明度和位置的间隔（毫秒），这两项变化时没有事件通知
+POLL_INTERVAL = 2000
+# 透明度低于此值视为看不见
+MIN_VISIBLE_OPACITY = 0.02
+
+ACTIVE = "active"          # 全速播放
+IDLE = "idle"              # 降低帧率
+SUSPENDED = "suspended"    # 暂停
+
+# 视为用户交互的事件
+_INTERACTION_EVENTS = {
+    QEvent.Type.Enter,
+    QEvent.Type.HoverMove,
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseButtonDblClick,
+    QEvent.Type.MouseMove,
+    QEvent.Type.Wheel,
+    QEvent.Type.DragEnter,
+    QEvent.Type.KeyPress,
+}
+# 可能改变可见性的事件
+_VISIBILITY_EVENTS = {
+    QEvent.Type.Show,
+    QEvent.Type.Hide,
+    QEvent.Type.WindowStateChange,
+    QEvent.Type.Move,
+}
+
+
+class AnimationGovernor(QObject):
+    """
+    宠物动画调速器
+    通过事件过滤器监听宠物窗口，按 active / idle / suspended 三种状态控制 GifPlayer
+    """
+    stateChanged = pyqtSignal(str)
+
+    def __init__(self, window, player, idle_seconds=DEFAULT_IDLE_SECONDS, idle_fps=DEFAULT_IDLE_FPS, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.player = player
+        self.idle_fps = idle_fps
+        self.state = ACTIVE
+        self._idle = False
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(max(1, int(idle_seconds * 1000)))
+        self._idle_timer.timeout.connect(self._on_idle)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL)
+        self._poll_timer.timeout.connect(self._update)
+
+    @classmethod
+    def from_settings(cls, window, player, setting_path="demo_setting.json", parent=None):
+        """根据配置文件创建调速器，配置中关闭时返回None"""
+        try:
+            with open(setting_path, "r", encoding="utf-8") as f:
+                config = json.load(f).get("animation_governor", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            config = {}
+        if not config.get("enabled", True):
+            return None
+        return cls(
+            window, player,
+            idle_seconds=config.get("idle_seconds", DEFAULT_IDLE_SECONDS),
+            idle_fps=config.get("idle_fps", DEFAULT_IDLE_FPS),
+            parent=parent
+        )
+
+    def start(self):
+        # 开启悬停事件，鼠标停在宠物上移动时也算作交互
+        self.window.setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.window.installEventFilter(self)
+        self._idle_timer.start()
+        self._poll_timer.start()
+        self._update()
+
+    def stop(self):
+        """停止调速并恢复全速播放"""
+        self.window.removeEventFilter(self)
+        self._idle_timer.stop()
+        self._poll_timer.stop()
+        self._idle = False
+        self.player.set_max_fps(None)
+        self.player.resume()
+        self.state = ACTIVE
+
+    def notify_activity(self):
+        """有交互或宠物主动做出反应（说话、进食等）时调用，立即恢复全速"""
+        self._idle_timer.start()
+        if self._idle:
+            self._idle = False
+            self._update()
+
+    def effective_fps(self):
+        """当前实际的画面刷新帧率，用于诊断"""
+        return self.player.effective_fps()
+
+    def diagnostics(self):
+        return {
+            "state": self.state,
+            "effective_fps": round(self.effective_fps(), 1),
+            "max_fps": self.idle_fps if self.state == IDLE else None,
+        }
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type in _INTERACTION_EVENTS:
+            self.notify_activity()
+        elif event_type in _VISIBILITY_EVENTS:
+            # 在事件处理完后再检查，此时窗口状态已经更新
+            QTimer.singleShot(0, self._update)
+        return False
+
+    def _on_idle(self):
+        self._idle = True
+        self._update()
+
+    def _is_visible(self):
+        window = self.window
+        if not window.isVisible() or window.isMinimized():
+            return False
+        if window.windowOpacity() < MIN_VISIBLE_OPACITY or self.player.opacity < MIN_VISIBLE_OPACITY:
+            return False
+        # 整个窗口被拖到所有屏幕之外
+        return QGuiApplication.screenAt(window.frameGeometry().center()) is not None
+
+    def _update(self):
+        if not self._is_visible():
+            state = SUSPENDED
+        elif self._idle:
+            state = IDLE
+        else:
+            state = ACTIVE
+        if state == self.state:
+            return
+        self.state = state
+        if state == SUSPENDED:
+            self.player.pause()
+        else:
+            self.player.set_max_fps(self.idle_fps if state == IDLE else None)
+            self.player.resume()
+        logger.debug(f"动画状态: {state}")
+        self.stateChanged.emit(state)
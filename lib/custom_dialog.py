@@ -4,13 +4,20 @@ from PyQt6.QtWidgets import (QApplication,QDialog, QStyle,
                             QVBoxLayout,
                             QHBoxLayout, QLabel, QPushButton, QWidget, 
                             )
-from PyQt6.QtCore import Qt, QPoint, QSize, QRectF, QRect
-from PyQt6.QtGui import (QMouseEvent, QPainter, QImage, QPixmap, QColor, 
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QPoint, QSize, QRectF, QRect, QTimer
+from PyQt6.QtGui import (QMouseEvent, QPainter, QImage, QImageReader, QPixmap, QColor, 
                          QPainterPath)
 
 import lib.LogManager as LogManager
 import logging
 
+# 背景图片缩放结果最多缓存的尺寸数量
+SCALED_CACHE_SIZE = 4
+# 调整窗口大小停下多久后再平滑缩放背景（毫秒），调整过程中先拉伸上一次的结果
+RESIZE_SETTLE_MS = 120
+
 class CustomDialog(QDialog):
     def __init__(self, font_manager=None):
         super().__init__()
@@ -24,10 +31,15 @@ class CustomDialog(QDialog):
         self.transparency_img_value = 0.5  # 透明度值
         self.luminance_img_value = 128  # 亮度值
 
-        # 加载背景图片
+        # 背景图片：原图只解码一次，按窗口尺寸缓存缩放结果，透明度和亮度在绘制时叠加
         self.background_path = None
-        self.background_pixmap = QPixmap(800, 600)
-        self.background_pixmap.fill(QColor("white"))  # 默认白色背景
+        self.background_image = QImage()
+        self._scaled_cache = OrderedDict()  # {(宽, 高): QPixmap}
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_SETTLE_MS)
+        self._resize_timer.timeout.connect(self.update)
         
         # 创建VerticalTabWidget用于获取初始设置
         from lib.vertical_tab_widget import VerticalTabWidget
@@ -40,7 +52,7 @@ class CustomDialog(QDialog):
         
         # 如果有背景路径，加载图片
         if self.background_path:
-            self.background_pixmap = self.load_and_process_image(self.background_path)
+            self.background_image = self.load_background_image(self.background_path)
         
         # 初始化UI
         self.initUI()
@@ -197,28 +209,44 @@ class CustomDialog(QDialog):
         self.setGeometry(300, 300, 800, 600)
         self.setWindowTitle('背景图片设置 - 实时预览')
 
-    def load_and_process_image(self, path):
-        """ 加载并处理图像透明度 """
-        image = QImage(path)
+    def load_background_image(self, path):
+        """ 读取背景图片，比屏幕还大的图片在解码时直接缩小 """
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        source_size = reader.size()
+        screen = QApplication.primaryScreen()
+        if screen and source_size.isValid():
+            limit = screen.virtualSize() * screen.devicePixelRatio()
+            target = source_size.scaled(limit, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+            if target.width() < source_size.width():
+                reader.setScaledSize(target)
+        image = reader.read()
         if image.isNull():
-            # print("无法加载图片")
-            self.logger.error("无法加载图片")
-            
-            return QPixmap()
-        
-        # 调整图片大小以匹配窗口尺寸
-        scaled_image = image.scaled(self.size(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
-
-        # 创建带透明度的新图像
-        transparent_image = QImage(scaled_image.size(), QImage.Format.Format_ARGB32)
-        transparent_image.fill(Qt.GlobalColor.transparent)
-
-        painter = QPainter(transparent_image)
-        painter.setOpacity(self.transparency_img_value)  # 设置整体透明度 (0.0 ~ 1.0)
-        painter.drawImage(0, 0, scaled_image)
-        painter.end()
-
-        return QPixmap.fromImage(transparent_image)
+            self.logger.error(f"无法加载图片: {path}")
+        self._scaled_cache.clear()
+        return image
+
+    def scaled_background(self):
+        """ 获取缩放到当前窗口尺寸的背景，按尺寸缓存 """
+        key = (self.width(), self.height())
+        pixmap = self._scaled_cache.get(key)
+        if pixmap is not None:
+            self._scaled_cache.move_to_end(key)
+            return pixmap
+        if self._resize_timer.isActive() and self._scaled_cache:
+            # 正在调整窗口大小，先拉伸最近一次的结果，停下后再平滑缩放
+            return next(reversed(self._scaled_cache.values()))
+        pixmap = QPixmap.fromImage(self.background_image.scaled(
+            self.size(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+        ))
+        self._scaled_cache[key] = pixmap
+        while len(self._scaled_cache) > SCALED_CACHE_SIZE:
+            self._scaled_cache.popitem(last=False)
+        return pixmap
+
+    def resizeEvent(self, event):
+        self._resize_timer.start()
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
         # 创建圆角路径
@@ -230,13 +258,18 @@ class CustomDialog(QDialog):
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # 绘制背景图片
-        if not self.background_pixmap.isNull():
+        if not self.background_image.isNull():
             # 设置裁剪区域为圆角矩形
             painter.setClipPath(path)
-            # 绘制背景图片
-            painter.drawPixmap(self.rect(), self.background_pixmap)
+            # 绘制背景图片（透明度在这里叠加，不需要重新生成图片）
+            painter.setOpacity(self.transparency_img_value)
+            painter.drawPixmap(self.rect(), self.scaled_background())
+            painter.setOpacity(1.0)
             # 重置裁剪区域
             painter.setClipping(False)
+        elif not self.background_path:
+            # 没有选择图片时使用白色背景
+            painter.fillPath(path, QColor("white"))
         
         # 绘制半透明覆盖层
         overlay_color = QColor(0, 0, 0, self.luminance_img_value)
@@ -250,10 +283,7 @@ class CustomDialog(QDialog):
     # 处理透明度变化
     def handle_transparency_changed(self, value):
         self.transparency_img_value = value
-        # 重新加载并处理图片
-        if self.background_path:
-            self.background_pixmap = self.load_and_process_image(self.background_path)
-        self.update()  # 触发重绘
+        self.update()  # 连续变化时 Qt 会合并为一次重绘
 
     # 处理亮度变化
     def handle_luminance_changed(self, value):
@@ -263,12 +293,9 @@ class CustomDialog(QDialog):
     # 处理背景图片变化
     def handle_background_changed(self, path):
         self.background_path = path
-        if path:
-            self.background_pixmap = self.load_and_process_image(path)
-        else:
-            # 如果没有选择图片，则使用默认的白色背景
-            self.background_pixmap = QPixmap(self.size())
-            self.background_pixmap.fill(Qt.GlobalColor.white)
+        # 如果没有选择图片，则使用默认的白色背景
+        self.background_image = self.load_background_image(path) if path else QImage()
+        self._scaled_cache.clear()
         self.update()  # 触发重绘
 
     # 切换最大化/还原
@@ -123,25 +123,7 @@ class EatingTimer:
         
         # 更改宠物动画为闭眼状态
         try:
-            import json
-            from PyQt6.QtGui import QMovie
-            
-            with open("demo_setting.json", "r", encoding="utf-8") as f:
-                setting = json.load(f)
-            
-            # 更新设置中的GIF
-            setting["gif"] = "闭眼.gif"
-            
-            # 保存回文件
-            with open("demo_setting.json", "w", encoding="utf-8") as f:
-                import json
-                json.dump(setting, f, ensure_ascii=False, indent=4)
-            
-            # 更改宠物动画
-            gif_folder = setting.get('gif_folder', '蜡笔小新组')
-            self.parent_window.movie = QMovie(f"{gif_folder}/闭眼.gif")
-            self.parent_window.label.setMovie(self.parent_window.movie)
-            self.parent_window.movie.start()
+            self.parent_window.animation.set_idle("闭眼.gif")
         except Exception as e:
             self.logger.error(f"更改宠物动画失败: {e}")
 
@@ -0,0 +1,191 @@
+'''
+食物信息索引模块
+把从食物图片中解码出的食物信息缓存到 cache/food_index.sqlite，
+按 (路径, 文件大小, 修改时间) 命中缓存；文件被复制、移动或重新保存但内容未变时按内容哈希命中，
+命中时完全跳过像素解码
+'''
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = "cache/food_index.sqlite"
+HASH_CHUNK_SIZE = 1024 * 1024
+# 批量查询时每条 SQL 的路径数量（SQLite 默认最多 999 个参数）
+QUERY_BATCH_SIZE = 500
+# 数据库被其他进程锁定时等待的时间（秒），食物编辑器的多个扫描进程会同时写入索引
+BUSY_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS food_info (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_food_info_hash ON food_info (content_hash);
+"""
+
+
+def _content_hash(path):
+    """计算文件内容的哈希（只读文件字节，比像素解码快得多）"""
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class FoodIndex:
+    """
+    食物信息索引
+    只缓存确定的结果（解码成功，或图片中确实没有食物信息），读取出错时不写入索引
+    """
+
+    def __init__(self, index_path=INDEX_PATH):
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # 食物编辑器和喂食都可能在后台线程中读取，统一由 _lock 串行化；
+            # 多个进程之间由 SQLite 的文件锁串行化，写入冲突时等待 BUSY_TIMEOUT 而不是立即失败
+            self._conn = sqlite3.connect(self.index_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            self._conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT * 1000}")
+            # WAL 模式下读取不会被写入阻塞
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _store(self, key, size, mtime_ns, content_hash, success, data):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO food_info VALUES (?, ?, ?, ?, ?, ?)",
+            (key, size, mtime_ns, content_hash, int(success), json.dumps(data, ensure_ascii=False))
+        )
+        conn.commit()
+
+    def lookup(self, image_path, decoder):
+        """
+        读取食物信息，索引未命中时调用 decoder 解码并写入索引
+        :param image_path: 图片路径
+        :param decoder: 解码函数，接收图片路径，返回 (success, data)
+        :return: (success, data)
+        """
+        key = os.path.abspath(image_path)
+        try:
+            st = os.stat(key)
+        except OSError as e:
+            return False, {"error": f"读取食物信息失败: {str(e)}"}
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size, mtime_ns, content_hash, success, data FROM food_info WHERE path = ?",
+                    (key,)
+                ).fetchone()
+                if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                    return bool(row[3]), json.loads(row[4])
+
+                # 文件状态变了，按内容哈希查找（例如编辑器保存到临时文件后替换原文件）
+                content_hash = _content_hash(key)
+                same = conn.execute(
+                    "SELECT success, data FROM food_info WHERE content_hash = ? LIMIT 1",
+                    (content_hash,)
+                ).fetchone()
+                if same:
+                    self._store(key, st.st_size, st.st_mtime_ns, content_hash, bool(same[0]), json.loads(same[1]))
+                    return bool(same[0]), json.loads(same[1])
+        except sqlite3.Error as e:
+            logger.warning(f"食物信息索引不可用，直接解码: {e}")
+            return decoder(image_path)
+
+        success, data = decoder(image_path)
+        if success or data.get("error") == "未找到嵌入的食物信息":
+            try:
+                with self._lock:
+                    self._store(key, st.st_size, st.st_mtime_ns, content_hash, success, data)
+            except sqlite3.Error as e:
+                logger.warning(f"写入食物信息索引失败: {e}")
+        return success, data
+
+    def cached_many(self, image_paths):
+        """
+        批量读取索引中文件状态没有变化的条目，不解码也不计算哈希
+        :return: {图片路径: (success, data)}，只包含命中的图片
+        """
+        stats = {}
+        for path in image_paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[os.path.abspath(path)] = (path, st.st_size, st.st_mtime_ns)
+
+        result = {}
+        keys = list(stats)
+        try:
+            with self._lock:
+                conn = self._connect()
+                # 分批查询，避免超过 SQLite 的参数数量限制
+                for start in range(0, len(keys), QUERY_BATCH_SIZE):
+                    chunk = keys[start:start + QUERY_BATCH_SIZE]
+                    rows = conn.execute(
+                        "SELECT path, size, mtime_ns, success, data FROM food_info "
+                        f"WHERE path IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    for key, size, mtime_ns, success, data in rows:
+                        path, st_size, st_mtime_ns = stats[key]
+                        if size == st_size and mtime_ns == st_mtime_ns:
+                            result[path] = (bool(success), json.loads(data))
+        except sqlite3.Error as e:
+            logger.warning(f"读取食物信息索引失败: {e}")
+        return result
+
+    def put(self, image_path, data):
+        """写入刚嵌入的食物信息，之后读取同一图片（或内容相同的副本）时无需解码"""
+        key = os.path.abspath(image_path)
+        try:
+            st = os.stat(key)
+            content_hash = _content_hash(key)
+            with self._lock:
+                self._store(key, st.st_size, st.st_mtime_ns, content_hash, True, data)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"写入食物信息索引失败: {e}")
+
+    def prune(self):
+        """删除已不存在的图片对应的索引条目"""
+        with self._lock:
+            conn = self._connect()
+            paths = [row[0] for row in conn.execute("SELECT path FROM food_info")]
+            missing = [(path,) for path in paths if not os.path.exists(path)]
+            if missing:
+                conn.executemany("DELETE FROM food_info WHERE path = ?", missing)
+                conn.commit()
+            return len(missing)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_food_index():
+    """获取全局食物信息索引"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FoodIndex()
+        return _index
@@ -5,30 +5,86 @@
 
 
 from PyQt6.QtGui import  QColor, QPainter, QPixmap
-from PyQt6.QtCore import Qt, QPoint,  pyqtSignal,  QTimer
+from PyQt6.QtCore import (
+    Qt, QPoint, QThread, pyqtSignal, QTimer, QSize, QModelIndex, QAbstractListModel, QSortFilterProxyModel
+)
 from PyQt6.QtWidgets import QGraphicsDropShadowEffect
 from PyQt6.QtGui import QPainterPath
+import operator
 import os  # 添加os模块导入
 import re  # 添加正则表达式导入
+from collections import OrderedDict
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QScrollArea, QTextEdit, QFrame,
-    QHBoxLayout, QToolButton, QGridLayout
+    QApplication, QWidget, QVBoxLayout, QLabel, QTextEdit, QFrame,
+    QHBoxLayout, QToolButton, QListView, QLineEdit, QComboBox, QAbstractItemView
 )
 from stegano import lsb
 import json
+try:
+    from lib import lsb_codec
+except ImportError:
+    # 没有安装numpy时只使用stegano
+    lsb_codec = None
+from lib.food_index import get_food_index
+from lib import png_meta
 
+from lib.thumbnail_cache import ThumbnailProvider
 import lib.LogManager as LogManager
 import logging
 
 # 预编译正则表达式以提高性能
 TIME_FORMAT_PATTERN = re.compile(r'^(\d+[smhd])+$')
 TIME_UNIT_PATTERN = re.compile(r'(\d+)([smhd])')
+# 食谱搜索中的数值条件，例如 热量>100、水分<=50
+FOOD_FILTER_PATTERN = re.compile(r'(热量|水分)\s*(>=|<=|>|<|=)\s*(\d+)')
+FOOD_FILTER_FIELDS = {"热量": "FoodCalories", "水分": "FoodWater"}
+FOOD_FILTER_OPERATORS = {
+    ">": operator.gt, "<": operator.lt, ">=": operator.ge, "<=": operator.le, "=": operator.eq
+}
+FOOD_IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp']
+THUMBNAIL_SIZE = QSize(180, 150)
+# 程序退出或弹窗销毁时等待后台线程结束的最长时间（毫秒）
+STOP_WAIT_MS = 1000
 
 class FoodVerification:
     '''
     食物信息验证类
     用于给食物图片写入信息和读取信息
     '''
+
+    # LSB引擎: "numpy"(默认，向量化处理) 或 "stegano"；numpy引擎不支持的图片自动回退到stegano
+    lsb_engine = "numpy"
+
+    @staticmethod
+    def _use_numpy():
+        return FoodVerification.lsb_engine == "numpy" and lsb_codec is not None
+
+    @staticmethod
+    def lsb_hide(image_path, message):
+        """把消息写入图片像素的最低位，返回PIL Image"""
+        if FoodVerification._use_numpy():
+            try:
+                return lsb_codec.hide(image_path, message)
+            except lsb_codec.UnsupportedImageError:
+                pass
+        return lsb.hide(image_path, message)
+
+    @staticmethod
+    def lsb_reveal(image_path):
+        """读取图片像素最低位中的消息"""
+        if FoodVerification._use_numpy():
+            try:
+                return lsb_codec.reveal(image_path)
+            except lsb_codec.UnsupportedImageError:
+                pass
+        return lsb.reveal(image_path)
+
+    @staticmethod
+    def save_food_image(image, message, output_path):
+        """保存写入了LSB信息的图片，PNG图片同时写入iTXt文本块，读取时无需解码像素"""
+        image.save(output_path)
+        if png_meta.is_png(output_path):
+            png_meta.write_food_chunk(output_path, message)
     
     @staticmethod
     def embed_food_info(image_path, food_name, food_description, food_calories, food_water, food_time, output_path, food_type=None):
@@ -54,7 +110,9 @@ class FoodVerification:
         
         try:
             # 将数据写入图片
-            lsb.hide(image_path, json.dumps(data)).save(output_path)
+            message = json.dumps(data)
+            FoodVerification.save_food_image(FoodVerification.lsb_hide(image_path, message), message, output_path)
+            get_food_index().put(output_path, data)
             return True, "食物信息嵌入成功"
         except Exception as e:
             return False, f"食物信息嵌入失败: {str(e)}"
@@ -62,12 +120,24 @@ class FoodVerification:
     @staticmethod
     def extract_food_info(image_path):
         """
-        从图片中提取食物信息
+        从图片中提取食物信息（优先读取食物信息索引，未命中时才解码像素）
+        :param image_path: 图片路径
+        :return: (success, data dict)
+        """
+        return get_food_index().lookup(image_path, FoodVerification.decode_food_info)
+
+    @staticmethod
+    def decode_food_info(image_path):
+        """
+        解码图片中嵌入的食物信息，不经过索引
+        优先读取PNG文本块（只扫描数据块头部），旧图片没有文本块时再解码像素LSB
         :param image_path: 图片路径
         :return: (success, data dict)
         """
         try:
-            data_str = lsb.reveal(image_path)
+            data_str = png_meta.read_food_chunk(image_path)
+            if data_str is None:
+                data_str = FoodVerification.lsb_reveal(image_path)
             if data_str:
                 data = json.loads(data_str)
                 # 确保返回的数据包含FoodType字段
@@ -108,7 +178,9 @@ class FoodVerification:
             
             try:
                 # 将默认数据写入图片
-                lsb.hide(image_path, json.dumps(default_data)).save(output_path)
+                message = json.dumps(default_data)
+                FoodVerification.save_food_image(FoodVerification.lsb_hide(image_path, message), message, output_path)
+                get_food_index().put(output_path, default_data)
                 return True, "已创建默认食物信息"
             except Exception as e:
                 return False, f"创建默认食物信息失败: {str(e)}"
@@ -279,6 +351,205 @@ class RecipeButton(QToolButton):
         super().mousePressEvent(event)
 
 
+class FoodInfoLoader(QThread):
+    """在后台线程中读取食物信息（经过食物信息索引），分批发送给模型"""
+    batch_ready = pyqtSignal(list)  # [(image_path, data), ...]
+
+    BATCH_SIZE = 50
+
+    def __init__(self, image_paths, parent=None):
+        super().__init__(parent)
+        self.image_paths = list(image_paths)
+
+    def run(self):
+        batch = []
+        for image_path in self.image_paths:
+            if self.isInterruptionRequested():
+                return
+            success, data = FoodVerification.extract_food_info(image_path)
+            batch.append((image_path, data if success else {}))
+            if len(batch) >= self.BATCH_SIZE:
+                self.batch_ready.emit(batch)
+                batch = []
+        if batch:
+            self.batch_ready.emit(batch)
+
+
+def _stop_workers(thumbnails, info_loader, wait_ms=None):
+    """
+    结束缩略图线程和食物信息读取线程
+    :param wait_ms: 等待线程结束的最长时间（毫秒），None 表示不等待
+    """
+    thumbnails.stop(None if wait_ms is None else wait_ms / 1000)
+    info_loader.requestInterruption()
+    if wait_ms is not None:
+        info_loader.wait(wait_ms)
+
+
+def _on_model_destroyed(thumbnails, info_loader):
+    _stop_workers(thumbnails, info_loader, STOP_WAIT_MS)
+    # QThread 对象销毁时线程必须已经结束（读取线程每张图片检查一次中断请求，很快就会结束）
+    info_loader.wait()
+
+
+def _make_tile_pixmap(text, color):
+    """生成占位图块"""
+    pixmap = QPixmap(THUMBNAIL_SIZE)
+    pixmap.fill(QColor("#f9f9f9"))
+    painter = QPainter(pixmap)
+    painter.setPen(QColor(color))
+    painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, text)
+    painter.end()
+    return pixmap
+
+
+class FoodListModel(QAbstractListModel):
+    """
+    食谱弹窗的数据模型
+    只保存图片路径和食物信息；视图绘制到某个条目时才异步请求它的缩略图，
+    内存中只保留最近使用的缩略图
+    """
+    PathRole = Qt.ItemDataRole.UserRole + 1
+    InfoRole = Qt.ItemDataRole.UserRole + 2
+    PIXMAP_CACHE_SIZE = 128
+
+    info_loaded = pyqtSignal()
+
+    def __init__(self, image_paths, parent=None):
+        super().__init__(parent)
+        self._paths = list(image_paths)
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+        self._info = {}
+        self._pixmaps = OrderedDict()
+        self._failed = set()
+        self._placeholder = _make_tile_pixmap("加载中...", "#999")
+        self._error_tile = _make_tile_pixmap("图片加载失败", "#e53935")
+
+        self.thumbnails = ThumbnailProvider(THUMBNAIL_SIZE.width(), THUMBNAIL_SIZE.height(), self)
+        self.thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.thumbnails.thumbnail_failed.connect(self._on_thumbnail_failed)
+
+        self.info_loader = FoodInfoLoader(self._paths, self)
+        self.info_loader.batch_ready.connect(self._on_info_loaded)
+        self.info_loader.start()
+
+        # 模型随弹窗一起销毁时也结束后台线程（此时子对象还没有销毁，不能再访问模型自身）
+        thumbnails, info_loader = self.thumbnails, self.info_loader
+        self.destroyed.connect(lambda: _on_model_destroyed(thumbnails, info_loader))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        image_path = self._paths[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            name = self._info.get(image_path, {}).get("FoodName")
+            return name or os.path.splitext(os.path.basename(image_path))[0]
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._pixmaps.get(image_path)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(image_path)
+                return pixmap
+            if image_path in self._failed:
+                return self._error_tile
+            self.thumbnails.request(image_path)
+            return self._placeholder
+        if role == Qt.ItemDataRole.ToolTipRole:
+            info = self._info.get(image_path)
+            if info:
+                return (f"{info.get('FoodType', '未知类型')}  热量: {info.get('FoodCalories', '')}"
+                        f"  水分: {info.get('FoodWater', '')}")
+            return None
+        if role == self.PathRole:
+            return image_path
+        if role == self.InfoRole:
+            return self._info.get(image_path)
+        return None
+
+    def food_types(self):
+        """已读取到的所有食物类型"""
+        return sorted({info.get("FoodType", "未知类型") for info in self._info.values() if info})
+
+    def stop(self, wait_ms=None):
+        """
+        结束缩略图线程和食物信息读取线程，之后模型不会再加载缩略图
+        :param wait_ms: 等待线程结束的最长时间（毫秒），None 表示不等待
+        """
+        _stop_workers(self.thumbnails, self.info_loader, wait_ms)
+
+    def _on_thumbnail_ready(self, image_path, image):
+        row = self._rows.get(image_path)
+        if row is None:
+            return
+        self._pixmaps[image_path] = QPixmap.fromImage(image)
+        while len(self._pixmaps) > self.PIXMAP_CACHE_SIZE:
+            self._pixmaps.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def _on_thumbnail_failed(self, image_path):
+        row = self._rows.get(image_path)
+        if row is None:
+            return
+        self._failed.add(image_path)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def _on_info_loaded(self, batch):
+        rows = []
+        for image_path, data in batch:
+            self._info[image_path] = data
+            rows.append(self._rows[image_path])
+        self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+        self.info_loaded.emit()
+
+
+class FoodFilterProxyModel(QSortFilterProxyModel):
+    """
+    食物过滤模型
+    支持按关键字（名称、类型、描述）、食物类型，以及热量、水分条件（如 热量>100 水分<=50）过滤
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keywords = []
+        self._conditions = []
+        self._food_type = None
+
+    def set_query(self, text):
+        self._conditions = FOOD_FILTER_PATTERN.findall(text)
+        self._keywords = FOOD_FILTER_PATTERN.sub(" ", text).lower().split()
+        self.invalidateFilter()
+
+    def set_food_type(self, food_type):
+        self._food_type = food_type or None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        info = index.data(FoodListModel.InfoRole) or {}
+        if self._food_type and info.get("FoodType") != self._food_type:
+            return False
+        for field, op, value in self._conditions:
+            try:
+                actual = float(info.get(FOOD_FILTER_FIELDS[field]))
+            except (TypeError, ValueError):
+                return False
+            if not FOOD_FILTER_OPERATORS[op](actual, float(value)):
+                return False
+        if self._keywords:
+            text = " ".join([
+                index.data(Qt.ItemDataRole.DisplayRole) or "",
+                str(info.get("FoodType", "")),
+                str(info.get("FoodDescription", "")),
+                os.path.basename(index.data(FoodListModel.PathRole))
+            ]).lower()
+            return all(keyword in text for keyword in self._keywords)
+        return True
+
+
 class RecipePopup(QWidget):
     def __init__(self, food_folder="outfood", parent=None):
         super().__init__(parent)
@@ -299,6 +570,19 @@ class RecipePopup(QWidget):
         
         self.setup_ui()
         self.hide()  # 初始化时隐藏窗口
+
+        # 弹窗只会隐藏并被 RecipeButton 反复显示，后台线程只在程序退出或弹窗销毁时结束
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._on_about_to_quit)
+
+    def stop_loading(self, wait_ms=None):
+        """结束数据模型的后台线程（结束后弹窗不再加载缩略图）"""
+        if self.food_model is not None:
+            self.food_model.stop(wait_ms)
+
+    def _on_about_to_quit(self):
+        self.stop_loading(STOP_WAIT_MS)
     
     def show(self):
         """重写show方法，添加定时器逻辑"""
@@ -387,17 +671,66 @@ class RecipePopup(QWidget):
         
         container_layout.addLayout(title_layout)
         
-        # 滚动区域
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
+        # 搜索栏：关键字或热量、水分条件，加上食物类型筛选
+        search_layout = QHBoxLayout()
+        search_layout.setSpacing(6)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索，如: 可乐 热量>50")
+        self.search_input.setStyleSheet("""
+            QLineEdit {
+                border: 1px solid #c5e1a5;
+                border-radius: 8px;
+                padding: 4px 6px;
+                background-color: white;
+            }
+        """)
+        self.type_combo = QComboBox()
+        self.type_combo.addItem("全部类型", None)
+        search_layout.addWidget(self.search_input, 1)
+        search_layout.addWidget(self.type_combo)
+        container_layout.addLayout(search_layout)
+
+        # 提示信息（文件夹不存在或没有图片时显示）
+        self.status_label = QLabel()
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setWordWrap(True)
+        self.status_label.setStyleSheet("""
+            QLabel {
+                font-size: 16px;
+                color: #e53935;
+                padding: 20px;
+            }
+        """)
+        self.status_label.hide()
+        container_layout.addWidget(self.status_label)
+
+        # 图片列表：只绘制可见区域内的条目，缩略图按需异步加载
+        self.food_list = QListView()
+        self.food_list.setViewMode(QListView.ViewMode.IconMode)
+        self.food_list.setIconSize(THUMBNAIL_SIZE)
+        self.food_list.setGridSize(QSize(THUMBNAIL_SIZE.width() + 20, THUMBNAIL_SIZE.height() + 35))
+        self.food_list.setUniformItemSizes(True)
+        self.food_list.setMovement(QListView.Movement.Static)
+        self.food_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.food_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.food_list.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.food_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.food_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.food_list.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.food_list.setStyleSheet("""
+            QListView {
                 border: none;
                 background-color: transparent;
                 border-radius: 10px;
             }
+            QListView::item {
+                border: 1px solid #ddd;
+                border-radius: 8px;
+                background-color: #f9f9f9;
+            }
+            QListView::item:hover {
+                border: 1px solid #4CAF50;
+            }
             QScrollBar:vertical {
                 width: 10px;
                 background-color: transparent;
@@ -412,109 +745,65 @@ class RecipePopup(QWidget):
                 background-color: #a5d6a7;
             }
         """)
-        container_layout.addWidget(scroll_area)
-        
-        # 图片内容容器
-        content_widget = QWidget()
-        content_layout = QGridLayout(content_widget)
-        content_layout.setContentsMargins(5, 5, 5, 5)
-        content_layout.setSpacing(10)
-        content_widget.setStyleSheet("background-color: transparent;")
-        
+        self.food_list.clicked.connect(
+            lambda index: self.show_image_detail(index.data(FoodListModel.PathRole))
+        )
+        container_layout.addWidget(self.food_list)
+
+        self.food_model = None
+        self.food_proxy = FoodFilterProxyModel(self)
+        self.food_list.setModel(self.food_proxy)
+        self.search_input.textChanged.connect(self.food_proxy.set_query)
+        self.type_combo.currentIndexChanged.connect(
+            lambda: self.food_proxy.set_food_type(self.type_combo.currentData())
+        )
+
         # 加载food文件夹中的图片
-        self.load_food_images(content_layout)
+        self.load_food_images()
         
-        scroll_area.setWidget(content_widget)
         layout.addWidget(container)
         self.setLayout(layout)
     
-    def load_food_images(self, layout):
-        """从food文件夹加载并显示图片"""
+    def show_status(self, text):
+        """显示提示信息并隐藏图片列表"""
+        self.status_label.setText(text)
+        self.status_label.show()
+        self.food_list.hide()
+
+    def load_food_images(self):
+        """从food文件夹读取图片列表，交给数据模型按需加载缩略图和食物信息"""
         if not os.path.exists(self.food_folder):
             # 如果outfood文件夹不存在，显示提示信息
-            label = QLabel(f"文件夹 '{self.food_folder}' 不存在")
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            label.setStyleSheet("""
-                QLabel {
-                    font-size: 16px;
-                    color: #e53935;
-                    padding: 20px;
-                }
-            """)
-            layout.addWidget(label)
+            self.show_status(f"文件夹 '{self.food_folder}' 不存在")
             return
         
         # 获取food文件夹中的所有图片文件
-        image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp']
-        image_files = []
-        
-        for file in os.listdir(self.food_folder):
-            file_ext = os.path.splitext(file)[1].lower()
-            if file_ext in image_extensions:
-                image_files.append(os.path.join(self.food_folder, file))
+        image_files = [
+            os.path.join(self.food_folder, file)
+            for file in os.listdir(self.food_folder)
+            if os.path.splitext(file)[1].lower() in FOOD_IMAGE_EXTENSIONS
+        ]
         
         if not image_files:
             # 如果没有找到图片，显示提示信息
-            label = QLabel(f"在 '{self.food_folder}' 文件夹中未找到图片文件")
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            label.setStyleSheet("""
-                QLabel {
-                    font-size: 16px;
-                    color: #e53935;
-                    padding: 20px;
-                }
-            """)
-            layout.addWidget(label)
+            self.show_status(f"在 '{self.food_folder}' 文件夹中未找到图片文件")
             return
-        
-        # 按单列布局添加图片
-        row = 0
-        for image_path in image_files:
-            # 创建可点击的图片标签
-            image_label = ClickableLabel()
-            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            image_label.setScaledContents(True)
-            image_label.setFixedSize(180, 150)  # 设置固定大小，适合单列显示，尺寸更小
-            image_label.setStyleSheet("""
-                QLabel {
-                    border: 1px solid #ddd;
-                    border-radius: 8px;
-                    background-color: #f9f9f9;
-                    padding: 5px;
-                }
-            """)
-            
-            # 加载并缩放图片
-            pixmap = QPixmap(image_path)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(
-                    180, 150, 
-                    Qt.AspectRatioMode.KeepAspectRatio, 
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                image_label.setPixmap(scaled_pixmap)
-            else:
-                # 如果图片加载失败，显示错误信息
-                image_label.setText("图片加载失败")
-                image_label.setStyleSheet("""
-                    QLabel {
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        background-color: #f9f9f9;
-                        padding: 5px;
-                        color: #e53935;
-                        font-size: 12px;
-                    }
-                """)
-            
-            # 连接点击事件
-            image_label.clicked.connect(lambda path=image_path: self.show_image_detail(path))
-            
-            # 添加到布局
-            layout.addWidget(image_label, row, 0)  # 单列布局，列索引始终为0
-            
-            # 更新行索引
-            row += 1
+
+        self.food_model = FoodListModel(image_files, self)
+        self.food_model.info_loaded.connect(self.update_type_filter)
+        self.food_proxy.setSourceModel(self.food_model)
+
+    def update_type_filter(self):
+        """根据已读取的食物信息更新类型下拉框"""
+        current = self.type_combo.currentData()
+        self.type_combo.blockSignals(True)
+        self.type_combo.clear()
+        self.type_combo.addItem("全部类型", None)
+        for food_type in self.food_model.food_types():
+            self.type_combo.addItem(food_type, food_type)
+        index = self.type_combo.findData(current)
+        self.type_combo.setCurrentIndex(max(index, 0))
+        self.type_combo.blockSignals(False)
     
     def show_image_detail(self, image_path):
         """显示图片详情窗口"""
@@ -576,6 +865,44 @@ class RecipePopup(QWidget):
         painter.fillRect(self.rect(), Qt.GlobalColor.transparent)
 
 
+IMAGE_DETAIL_STYLE = """
+    QWidget {
+        background-color: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1, 
+                                         stop: 0 #ffffff, stop: 1 #f0f0f0);
+        border-radius: 10px;
+    }
+    QLabel#foodName {
+        font-size: 16px;
+        font-weight: bold;
+        color: #2e7d32;
+        padding: 5px;
+    }
+    QLabel#foodPreview {
+        border: 1px solid #ddd;
+        background-color: white;
+        border-radius: 8px;
+        padding: 5px;
+    }
+    QFrame#foodSeparator {
+        color: #ccc;
+    }
+    QLabel#foodInfoTitle {
+        font-size: 14px;
+        font-weight: bold;
+        color: #555;
+        padding: 5px;
+    }
+    QTextEdit {
+        border: 1px solid #ddd;
+        border-radius: 5px;
+        padding: 10px;
+        background-color: white;
+        font-size: 13px;
+        color: black;
+    }
+"""
+
+
 class ImageDetailWindow(QWidget):
     def __init__(self, image_path, parent=None):
         super().__init__(parent)
@@ -584,14 +911,8 @@ class ImageDetailWindow(QWidget):
         self.setWindowTitle("食物详情")
         self.setFixedSize(400, 500)
         
-        # 设置窗口样式
-        self.setStyleSheet("""
-            QWidget {
-                background-color: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1, 
-                                                 stop: 0 #ffffff, stop: 1 #f0f0f0);
-                border-radius: 10px;
-            }
-        """)
+        # 窗口和所有子控件的样式写在同一份样式表中，只解析一次
+        self.setStyleSheet(IMAGE_DETAIL_STYLE)
         
         layout = QVBoxLayout()
         layout.setContentsMargins(20, 20, 20, 20)
@@ -611,28 +932,14 @@ class ImageDetailWindow(QWidget):
             }
 
         name_label = QLabel(f"食物名称: {data['FoodName']}")
-        name_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #2e7d32;
-                padding: 5px;
-            }
-        """)
+        name_label.setObjectName("foodName")
         layout.addWidget(name_label)
         
         # 图片预览
         image_preview = QLabel()
         image_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
         image_preview.setFixedSize(300, 200)
-        image_preview.setStyleSheet("""
-            QLabel {
-                border: 1px solid #ddd;
-                background-color: white;
-                border-radius: 8px;
-                padding: 5px;
-            }
-        """)
+        image_preview.setObjectName("foodPreview")
         
         pixmap = QPixmap(image_path)
         if not pixmap.isNull():
@@ -650,19 +957,12 @@ class ImageDetailWindow(QWidget):
         line = QFrame()
         line.setFrameShape(QFrame.Shape.HLine)
         line.setFrameShadow(QFrame.Shadow.Sunken)
-        line.setStyleSheet("color: #ccc;")
+        line.setObjectName("foodSeparator")
         layout.addWidget(line)
         
         # 详细信息标签
         info_label = QLabel("食物详细信息:")
-        info_label.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                font-weight: bold;
-                color: #555;
-                padding: 5px;
-            }
-        """)
+        info_label.setObjectName("foodInfoTitle")
         layout.addWidget(info_label)
         
         # 详细信息内容
@@ -674,16 +974,6 @@ class ImageDetailWindow(QWidget):
             f"食物水分: {data['FoodWater']}\n"
             f"食用时间: {data.get('FoodTime', '无')}"
         )
-        detail_text.setStyleSheet("""
-            QTextEdit {
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                padding: 10px;
-                background-color: white;
-                font-size: 13px;
-                color: black;
-            }
-        """)
         layout.addWidget(detail_text)
         
         self.setLayout(layout)
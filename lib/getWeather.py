@@ -1,8 +1,98 @@
-from playwright.sync_api import sync_playwright
-import asyncio
 import json
+import logging
+import os
+import threading
+import time
+from collections import deque
 import requests
 
+logger = logging.getLogger(__name__)
+
+# 天气接口地址的特征串，用于在浏览器请求中识别真实接口
+OVERVIEW_URL_PREFIX = "https://assets.msn.cn/service/weather/overview?apikey="
+# 已发现的接口地址缓存文件（按城市保存）
+ENDPOINT_CACHE_FILE = "cache/weather_endpoints.json"
+# 解析后的天气结果缓存有效期（秒）
+WEATHER_CACHE_TTL = 10 * 60
+# 直接请求接口的超时时间（秒）
+REQUEST_TIMEOUT = 10
+# 浏览器嗅探接口地址的最长等待时间（毫秒）
+SNIFF_TIMEOUT_MS = 15000
+
+_cache_lock = threading.Lock()
+_endpoint_cache = None  # {city: overview_url}，首次使用时从磁盘加载
+_weather_cache = {}     # {city: (fetched_at, current_data)}
+_recent_cities = deque(maxlen=5)  # 最近查询过的城市，供预取使用
+
+
+def _load_endpoint_cache():
+    """从磁盘加载接口地址缓存（只加载一次）"""
+    global _endpoint_cache
+    if _endpoint_cache is None:
+        try:
+            with open(ENDPOINT_CACHE_FILE, "r", encoding="utf-8") as f:
+                _endpoint_cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _endpoint_cache = {}
+    return _endpoint_cache
+
+
+def get_cached_endpoint(city):
+    """获取已缓存的城市接口地址，没有则返回None"""
+    with _cache_lock:
+        return _load_endpoint_cache().get(city)
+
+
+def save_endpoint(city, url):
+    """缓存城市对应的接口地址并写入磁盘"""
+    with _cache_lock:
+        cache = _load_endpoint_cache()
+        if url:
+            cache[city] = url
+        else:
+            cache.pop(city, None)
+        try:
+            os.makedirs(os.path.dirname(ENDPOINT_CACHE_FILE), exist_ok=True)
+            with open(ENDPOINT_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"保存天气接口缓存失败: {e}")
+
+
+def get_cached_weather(city, ttl=WEATHER_CACHE_TTL):
+    """
+    获取缓存中未过期的天气数据
+    :param city: 城市名称
+    :param ttl: 有效期（秒）
+    :return: 天气数据字典，没有或已过期返回None
+    """
+    with _cache_lock:
+        entry = _weather_cache.get(city)
+    if entry and time.time() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+
+def put_cached_weather(city, data):
+    """写入天气结果缓存"""
+    with _cache_lock:
+        _weather_cache[city] = (time.time(), data)
+
+
+def record_query(city):
+    """记录一次城市查询"""
+    with _cache_lock:
+        if city in _recent_cities:
+            _recent_cities.remove(city)
+        _recent_cities.append(city)
+
+
+def get_recent_cities():
+    """获取最近查询过的城市列表"""
+    with _cache_lock:
+        return list(_recent_cities)
+
+
 class MSWeather:
     def __init__(self,city):
         self.city = city
@@ -11,22 +101,73 @@ class MSWeather:
         self.url = f"https://www.msn.cn/zh-cn/weather/forecast/in-{self.city}"
 
     def get_weather_data(self):
-        with sync_playwright() as p:
-            browser =  p.chromium.launch(headless=True)
-            page =  browser.new_page()
-            page.goto(self.url)
-            page.on("request", self.on_request)
-            page.wait_for_timeout(3000)
-            page.close()
+        '''
+        get_weather_data 的 Docstring
+
+        获取天气数据，优先直接请求已缓存的接口地址，
+        失败时才启动浏览器重新嗅探接口地址
+        '''
+        cached_url = get_cached_endpoint(self.city)
+        if cached_url:
+            try:
+                self.ls = self._fetch(cached_url)
+                self.get_url = cached_url
+                return
+            except Exception as e:
+                logger.warning(f"缓存的天气接口失效({self.city}): {e}，重新获取接口地址")
+                save_endpoint(self.city, None)
+
+        self.get_url = self._discover_endpoint()
+        if not self.get_url:
+            raise RuntimeError(f"未能获取到 {self.city} 的天气接口地址")
+        self.ls = self._fetch(self.get_url)
+        save_endpoint(self.city, self.get_url)
+
+    def _fetch(self, url):
+        '''
+        _fetch 的 Docstring
 
-        response = requests.get(self.get_url)
-        self.ls = response.json()
+        直接请求天气接口，并校验返回的数据结构
+        '''
+        response = requests.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        # 提前校验结构，避免把失效接口的返回值当成天气数据
+        data["responses"][0]["weather"][0]["current"]
+        return data
+
+    def _discover_endpoint(self):
+        '''
+        _discover_endpoint 的 Docstring
+
+        启动无头浏览器打开天气页面，捕获到接口请求后立即返回
+        '''
+        # 仅在需要回退时才导入playwright，避免拖慢普通的天气查询
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            try:
+                page = browser.new_page()
+                page.on("request", self.on_request)
+                try:
+                    with page.expect_request(
+                        lambda request: OVERVIEW_URL_PREFIX in request.url,
+                        timeout=SNIFF_TIMEOUT_MS
+                    ):
+                        page.goto(self.url)
+                except Exception as e:
+                    logger.warning(f"嗅探天气接口超时或失败: {e}")
+                page.close()
+            finally:
+                browser.close()
+        return self.get_url
 
     def on_request(self,request):
         # print(request.url)
-        if "https://assets.msn.cn/service/weather/overview?apikey=" in request.url:
+        if OVERVIEW_URL_PREFIX in request.url:
             self.get_url = request.url
-            print(self.get_url)
+            logger.debug(f"捕获到天气接口: {self.get_url}")
 
 
     def analyze_data(self):
@@ -107,15 +248,27 @@ class MSWeather:
         with open("weather_data.json","w") as f:
             json.dump(self.analyze_data(),f,indent=4)
 
-    def return_to_ai(self):
+    def return_to_ai(self, ttl=WEATHER_CACHE_TTL):
         '''
         return_to_ai 的 Docstring
         
         将数据返回给AI
         '''
-        self.get_weather_data()
-        format_weather_report = self.analyze_data()
-        return self.format_weather_report(format_weather_report)
+        record_query(self.city)
+        return self.format_weather_report(self.get_current(ttl))
+
+    def get_current(self, ttl=WEATHER_CACHE_TTL):
+        '''
+        get_current 的 Docstring
+
+        获取当前天气，缓存未过期时直接使用缓存结果
+        '''
+        current = get_cached_weather(self.city, ttl)
+        if current is None:
+            self.get_weather_data()
+            current = self.analyze_data()
+            put_cached_weather(self.city, current)
+        return current
     
     def run(self):
         self.get_weather_data()
@@ -126,8 +279,8 @@ def ai_get_local_weather():
     '''
     ai获取本地天气的函数
     '''
-    from lib.user_ip import UserIP
-    user_address = UserIP().sendAddress()
+    from lib.user_ip import get_location_resolver
+    user_address = get_location_resolver().get_address()
     ms = MSWeather(user_address)
     return ms.return_to_ai()
 
@@ -0,0 +1,211 @@
+'''
+GIF 优化模块
+离线把角色文件夹中的GIF优化为适合宠物窗口的副本：缩放到显示尺寸、合并相同的连续帧（延时相加）、
+所有帧使用同一个重新量化的调色板。副本保存在 cache/optimized/<角色>/<宽>x<高>/ 中
+（生成的文件不写进纳入版本控制的角色文件夹），程序解码GIF时优先使用比原图新的副本
+
+优化: python -m lib.gif_optimizer gif/猫 [gif/蜡笔小新组 ...] [--size 80] [--scale 1] [--colors 128]
+'''
+
+import hashlib
+import os
+import time
+
+OPTIMIZED_DIR = "cache/optimized"
+DEFAULT_SIZE = 80
+DEFAULT_COLORS = 128
+# 缩放后 alpha 低于此值的像素视为透明（GIF只有全透明和不透明两种）
+ALPHA_THRESHOLD = 128
+
+
+def character_cache_dir(root, gif_folder):
+    """
+    角色文件夹在缓存目录 root 下对应的子目录
+    目录名为文件夹名加上绝对路径的哈希，不同位置的同名文件夹不会冲突
+    """
+    folder = os.path.abspath(gif_folder)
+    digest = hashlib.sha1(folder.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(root, f"{os.path.basename(folder)}_{digest}")
+
+
+def optimized_path(gif_path, width, height):
+    folder, name = os.path.split(gif_path)
+    return os.path.join(character_cache_dir(OPTIMIZED_DIR, folder), f"{width}x{height}", name)
+
+
+def preferred_gif(gif_path, width, height):
+    """
+    返回解码时应该使用的文件：有比原图新的优化副本时使用副本，否则使用原图
+    """
+    path = optimized_path(gif_path, width, height)
+    try:
+        optimized_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return gif_path
+    try:
+        if os.stat(gif_path).st_mtime_ns > optimized_mtime:
+            return gif_path  # 原图在优化之后被修改过
+    except OSError:
+        pass
+    return path
+
+
+def _read_frames(gif_path, width, height):
+    """读取GIF并缩放到目标尺寸，返回 ([RGBA图像], [延时], 原图尺寸, 循环次数)"""
+    from PIL import Image, ImageSequence
+    from lib.gif_player import DEFAULT_FRAME_DELAY, MIN_FRAME_DELAY
+
+    frames, delays = [], []
+    with Image.open(gif_path) as im:
+        source_size = im.size
+        loop = im.info.get("loop", 0)
+        for frame in ImageSequence.Iterator(im):
+            delay = frame.info.get("duration", 0)
+            # 与播放器的处理一致，保证合并后的总时长不变
+            delays.append(max(MIN_FRAME_DELAY, delay) if delay > 0 else DEFAULT_FRAME_DELAY)
+            frames.append(frame.convert("RGBA").resize((width, height), Image.Resampling.LANCZOS))
+    return frames, delays, source_size, loop
+
+
+def _dedupe(frames, delays):
+    """合并内容相同的连续帧，延时相加"""
+    result_frames, result_delays = [], []
+    previous = None
+    for frame, delay in zip(frames, delays):
+        data = frame.tobytes()
+        if data == previous:
+            result_delays[-1] += delay
+            continue
+        previous = data
+        result_frames.append(frame)
+        result_delays.append(delay)
+    return result_frames, result_delays
+
+
+def _quantize(frames, colors):
+    """所有帧共用一个调色板，调色板之后的第一个索引留作透明色，返回 (调色板图像列表, 透明色索引)"""
+    from PIL import Image
+
+    width, height = frames[0].size
+    sheet = Image.new("RGB", (width, height * len(frames)))
+    for i, frame in enumerate(frames):
+        sheet.paste(frame.convert("RGB"), (0, height * i))
+    quantized = sheet.quantize(colors - 1, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    count = min(colors - 1, len(quantized.getcolors(256)))
+    palette_data = quantized.getpalette()[:3 * count]
+    # 其余位置填第一个颜色，映射颜色时不会落到这些位置（包括透明色）上
+    palette = Image.new("P", (1, 1))
+    palette.putpalette(palette_data + palette_data[:3] * (256 - count))
+    transparent = count
+
+    result = []
+    for frame in frames:
+        indexed = frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+        mask = frame.getchannel("A").point(lambda a: 255 if a < ALPHA_THRESHOLD else 0)
+        indexed.paste(transparent, mask=mask)
+        indexed.putpalette(palette_data + [0, 0, 0])
+        result.append(indexed)
+    return result, transparent
+
+
+def _decode_time(gif_path, width, height, repeat=3):
+    """按程序中的方式解码并缩放，返回最短耗时（毫秒）"""
+    from PyQt6.QtCore import QSize
+    from lib.gif_player import decode_gif
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode_gif(gif_path, QSize(width, height))
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def optimize_gif(gif_path, width=DEFAULT_SIZE, height=DEFAULT_SIZE, colors=DEFAULT_COLORS):
+    """
+    优化一个GIF，结果比原图更大且没有减少解码工作量时不保留副本
+    :return: 报告字典（文件大小、帧数、解码耗时、解码内存、是否保留副本）
+    """
+    frames, delays, source_size, loop = _read_frames(gif_path, width, height)
+    source_frames = len(frames)
+    frames, delays = _dedupe(frames, delays)
+    indexed, transparent = _quantize(frames, max(2, min(256, colors)))
+
+    output_path = optimized_path(gif_path, width, height)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temp_path = output_path + ".tmp"
+    indexed[0].save(
+        temp_path, "GIF", save_all=True, append_images=indexed[1:], duration=delays,
+        loop=loop, disposal=2, transparency=transparent, optimize=False
+    )
+
+    source_pixels = source_frames * source_size[0] * source_size[1]
+    output_pixels = len(frames) * width * height
+    report = {
+        "name": os.path.basename(gif_path),
+        "source_bytes": os.path.getsize(gif_path),
+        "output_bytes": os.path.getsize(temp_path),
+        "source_frames": source_frames,
+        "output_frames": len(frames),
+        "source_size": source_size,
+        # 解码时每帧都会先得到原尺寸的 ARGB32 图像，再缩放
+        "source_memory": source_pixels * 4,
+        "output_memory": output_pixels * 4,
+        "source_ms": _decode_time(gif_path, width, height),
+        "output_ms": _decode_time(temp_path, width, height),
+    }
+    report["kept"] = report["output_bytes"] < report["source_bytes"] or output_pixels < source_pixels
+    if report["kept"]:
+        os.replace(temp_path, output_path)
+    else:
+        os.remove(temp_path)
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    return report
+
+
+def optimize_folder(gif_folder, width=DEFAULT_SIZE, height=DEFAULT_SIZE, colors=DEFAULT_COLORS):
+    """优化角色文件夹中的所有GIF，返回每个文件的报告（失败的文件包含 "error"）"""
+    reports = []
+    for name in sorted(os.listdir(gif_folder)):
+        gif_path = os.path.join(gif_folder, name)
+        if not name.lower().endswith(".gif") or not os.path.isfile(gif_path):
+            continue
+        try:
+            reports.append(optimize_gif(gif_path, width, height, colors))
+        except Exception as e:
+            reports.append({"name": name, "error": str(e)})
+    return reports
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="把角色GIF优化为适合宠物窗口的副本")
+    parser.add_argument("folders", nargs="+", help="角色文件夹，例如 gif/猫")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="显示尺寸（逻辑像素）")
+    parser.add_argument("--scale", type=float, default=1.0, help="屏幕缩放比例，高分屏可以再生成一份 2 倍的副本")
+    parser.add_argument("--colors", type=int, default=DEFAULT_COLORS, help="调色板颜色数（含透明色）")
+    args = parser.parse_args()
+
+    pixels = round(args.size * args.scale)
+    for folder in args.folders:
+        print(f"{folder} -> {pixels}x{pixels}")
+        totals = [0, 0, 0.0, 0.0]
+        for r in optimize_folder(folder, pixels, pixels, args.colors):
+            if "error" in r:
+                print(f"  {r['name']}: 失败 {r['error']}")
+                continue
+            print(f"  {r['name']}: {r['source_bytes'] / 1024:.0f} KB -> {r['output_bytes'] / 1024:.0f} KB，"
+                  f"{r['source_frames']} -> {r['output_frames']} 帧，"
+                  f"解码 {r['source_ms']:.1f} -> {r['output_ms']:.1f} ms，"
+                  f"解码内存 {r['source_memory'] / 1024:.0f} -> {r['output_memory'] / 1024:.0f} KB"
+                  f"{'' if r['kept'] else '（没有收益，未保留）'}")
+            if r["kept"]:
+                totals[0] += r["source_bytes"]
+                totals[1] += r["output_bytes"]
+                totals[2] += r["source_ms"]
+                totals[3] += r["output_ms"]
+        print(f"  合计（保留的副本）: {totals[0] / 1024:.0f} KB -> {totals[1] / 1024:.0f} KB，"
+              f"解码 {totals[2]:.1f} -> {totals[3]:.1f} ms")
@@ -0,0 +1,281 @@
+'''
+GIF 播放模块
+每个GIF只解码一次（角色文件夹有打包好的图集时直接从图集读取，见 sprite_atlas），
+帧直接缩放到显示尺寸并预先乘上透明度，按 (GIF, 尺寸, 透明度) 缓存；
+播放时由定时器按帧延时切换到缓存好的 QPixmap，不再为每一帧分配图像、绘制和转换
+'''
+
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+
+from PyQt6.QtCore import Qt, QObject, QSize, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPainter, QPixmap
+
+from lib.gif_optimizer import preferred_gif
+from lib.sprite_atlas import get_atlas
+
+logger = logging.getLogger(__name__)
+
+# 帧延时缺失或过小时使用的默认值（毫秒），与常见浏览器的处理一致
+DEFAULT_FRAME_DELAY = 100
+MIN_FRAME_DELAY = 20
+# 最多缓存的 (GIF, 尺寸, 透明度) 组合数量
+FRAME_CACHE_SIZE = 32
+# 统计实际帧率的时间窗口（秒）
+FPS_WINDOW = 2.0
+
+
+class GifFrames:
+    """一个GIF在某个尺寸和透明度下的全部帧"""
+
+    def __init__(self, pixmaps, delays):
+        self.pixmaps = pixmaps
+        self.delays = delays
+
+    def __len__(self):
+        return len(self.pixmaps)
+
+
+_decoded = OrderedDict()   # {(路径, 修改时间, 宽, 高): ([QImage], [延时])}
+_frames = OrderedDict()    # {(路径, 修改时间, 宽, 高, 透明度): GifFrames}
+
+
+def _trim(cache):
+    while len(cache) > FRAME_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def decode_gif(gif_path, size):
+    """解码GIF的所有帧并缩放到 size（像素）"""
+    reader = QImageReader(gif_path)
+    images, delays = [], []
+    while True:
+        image = reader.read()
+        if image.isNull():
+            break
+        delay = reader.nextImageDelay()
+        images.append(image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied).scaled(
+            size, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+        ))
+        delays.append(max(MIN_FRAME_DELAY, delay) if delay > 0 else DEFAULT_FRAME_DELAY)
+        if not reader.canRead():
+            break
+    return images, delays
+
+
+def _apply_opacity(image, opacity):
+    if opacity >= 1.0:
+        return QPixmap.fromImage(image)
+    result = QImage(image.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    result.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(result)
+    painter.setOpacity(opacity)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return QPixmap.fromImage(result)
+
+
+def load_gif_frames(gif_path, size, opacity=1.0, device_pixel_ratio=1.0):
+    """
+    获取GIF缩放到显示尺寸并带有透明度的帧
+    :param gif_path: GIF路径
+    :param size: 显示尺寸（逻辑像素，QSize）
+    :param opacity: 透明度 0~1
+    :param device_pixel_ratio: 屏幕缩放比例，高分屏下按物理像素缩放
+    :return: GifFrames，无法解码时返回None
+    """
+    pixel_size = QSize(round(size.width() * device_pixel_ratio), round(size.height() * device_pixel_ratio))
+    try:
+        mtime = os.stat(gif_path).st_mtime_ns
+    except OSError:
+        return None
+    atlas = get_atlas(os.path.dirname(gif_path), pixel_size.width(), pixel_size.height())
+    opacity = round(max(0.0, min(1.0, opacity)), 2)
+    base_key = (os.path.abspath(gif_path), mtime, pixel_size.width(), pixel_size.height())
+    key = base_key + (opacity, device_pixel_ratio)
+
+    frames = _frames.get(key)
+    if frames is not None:
+        _frames.move_to_end(key)
+        return frames
+
+    decoded = _decoded.get(base_key)
+    if decoded is None:
+        # 有预先打包的图集时直接从图集读取帧，不再解码GIF
+        decoded = atlas.frames(gif_path) if atlas else None
+        if decoded is None:
+            # 有优化过的副本时解码副本（已缩放到显示尺寸，见 gif_optimizer）
+            decoded = decode_gif(preferred_gif(gif_path, pixel_size.width(), pixel_size.height()), pixel_size)
+        if not decoded[0]:
+            return None
+        _decoded[base_key] = decoded
+        _trim(_decoded)
+    else:
+        _decoded.move_to_end(base_key)
+
+    images, delays = decoded
+    pixmaps = []
+    for image in images:
+        pixmap = _apply_opacity(image, opacity)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmaps.append(pixmap)
+    frames = GifFrames(pixmaps, delays)
+    _frames[key] = frames
+    _trim(_frames)
+    return frames
+
+
+class GifPlayer(QObject):
+    """
+    轻量的GIF播放器，把缓存好的帧按延时依次设置到 QLabel 上
+    可以暂停，也可以限制最高帧率：限速时按真实时间跳过中间的帧，动作的快慢不变，只是画面更新变少
+    """
+    frameChanged = pyqtSignal(int)
+    cycleFinished = pyqtSignal()  # 播放完一轮（回到第一帧）时发出
+
+    def __init__(self, label, parent=None):
+        super().__init__(parent)
+        self.label = label
+        self.gif_path = None
+        self.opacity = 1.0
+        self._frames = None
+        self._index = 0
+        self._paused = False
+        self._max_fps = None
+        self._elapsed = 0          # 当前帧已经显示的时间（毫秒），用于限速时跳帧
+        self._last_tick = None
+        self._shown_at = deque()   # 最近显示帧的时间，用于统计实际帧率
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._timer.timeout.connect(self._next_frame)
+
+    def _load(self):
+        return load_gif_frames(
+            self.gif_path, self.label.size(), self.opacity, self.label.devicePixelRatioF()
+        )
+
+    def play(self, gif_path):
+        """
+        播放GIF
+        :return: 是否成功加载
+        """
+        if gif_path == self.gif_path and self._frames is not None:
+            if not self._timer.isActive() and not self._paused:
+                self._show_frame(self._index)
+            return True
+        previous = self.gif_path
+        self.gif_path = gif_path
+        frames = self._load()
+        if frames is None:
+            self.gif_path = previous
+            logger.warning(f"无法加载GIF文件: {gif_path}")
+            return False
+        self._frames = frames
+        self._show_frame(0)
+        return True
+
+    def set_opacity(self, opacity):
+        """修改透明度，使用（或生成）对应透明度的缓存帧，不中断播放"""
+        self.opacity = opacity
+        if self.gif_path is None:
+            return
+        frames = self._load()
+        if frames is not None:
+            self._frames = frames
+            self.label.setPixmap(frames.pixmaps[min(self._index, len(frames) - 1)])
+
+    def stop(self):
+        self._timer.stop()
+
+    def pause(self):
+        """暂停在当前帧，暂停期间切换GIF只显示第一帧"""
+        self._paused = True
+        self._timer.stop()
+
+    def resume(self):
+        if not self._paused:
+            return
+        self._paused = False
+        if self._frames is not None:
+            self._show_frame(self._index)
+
+    def is_paused(self):
+        return self._paused
+
+    def set_max_fps(self, fps):
+        """
+        限制最高帧率
+        :param fps: 每秒最多更新的帧数，None表示按GIF原本的速度播放
+        """
+        self._max_fps = fps if fps and fps > 0 else None
+        if self._timer.isActive():
+            # 立即按新的速度安排下一帧
+            self._timer.start(self._interval())
+
+    def effective_fps(self):
+        """最近一段时间内实际更新画面的帧率"""
+        if self._paused or not self._timer.isActive():
+            return 0.0
+        self._forget_old_frames(time.monotonic())
+        return len(self._shown_at) / FPS_WINDOW
+
+    def is_playing(self):
+        return self._timer.isActive()
+
+    def current_pixmap(self):
+        if self._frames is None:
+            return QPixmap()
+        return self._frames.pixmaps[self._index]
+
+    def _forget_old_frames(self, now):
+        while self._shown_at and now - self._shown_at[0] > FPS_WINDOW:
+            self._shown_at.popleft()
+
+    def _interval(self):
+        """距离下一次更新画面的时间（毫秒）"""
+        remaining = max(1, self._frames.delays[self._index] - self._elapsed)
+        if self._max_fps:
+            return max(remaining, round(1000 / self._max_fps))
+        return remaining
+
+    def _show_frame(self, index, elapsed=0):
+        self._index = index
+        self._elapsed = elapsed
+        self.label.setPixmap(self._frames.pixmaps[index])
+        self.frameChanged.emit(index)
+        now = time.monotonic()
+        self._last_tick = now
+        self._shown_at.append(now)
+        self._forget_old_frames(now)
+        if len(self._frames) > 1 and not self._paused:
+            self._timer.start(self._interval())
+
+    def _next_frame(self):
+        if self._frames is None:
+            return
+        now = time.monotonic()
+        elapsed = self._elapsed + round((now - self._last_tick) * 1000)
+        index = self._index
+        wrapped = False
+        # 按真实经过的时间前进，限速时会跳过中间的帧；最多前进一整轮
+        for _ in range(len(self._frames)):
+            delay = self._frames.delays[index]
+            if elapsed < delay:
+                break
+            elapsed -= delay
+            index = (index + 1) % len(self._frames)
+            wrapped = wrapped or index == 0
+        else:
+            elapsed = 0
+        if index == self._index and not wrapped:
+            # 定时器提前触发（粗精度定时器允许少量误差），等到当前帧真正结束再切换
+            self._elapsed = elapsed
+            self._last_tick = now
+            self._timer.start(self._interval())
+            return
+        self._show_frame(index, elapsed)
+        if wrapped:
+            self.cycleFinished.emit()
@@ -11,6 +11,44 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtProperty, QPoint, pyqtSignal
 from PyQt6.QtGui import QColor
 
+from lib.style_registry import apply_style_sheet, cached_style
+
+
+@cached_style
+def glass_button_style(rgba, border_radius, pressed=True):
+    """
+    玻璃按钮在某种颜色下的样式表，同样的颜色和圆角只生成一次，所有同款按钮共用
+    :param rgba: 背景颜色 (r, g, b, a)
+    :param pressed: 是否包含按下状态的样式
+    """
+    r, g, b, a = rgba
+    bg_color = f"rgba({r}, {g}, {b}, {a})"
+    # 边框颜色更不透明一些
+    border_color = f"rgba({r}, {g}, {b}, {min(a + 0.2, 1.0)})"
+    style = f"""
+            QPushButton {{
+                background: {bg_color};
+                border: 2px solid {border_color};
+                border-radius: {border_radius}px;
+                color: white;
+                font-size: 16px;
+                font-weight: bold;
+                padding: 5px;
+            }}
+            QPushButton:hover {{
+                background: {bg_color.replace(str(a), str(min(a + 0.1, 1.0)))};
+                border: 2px solid {border_color.replace(str(a), str(min(a + 0.2, 1.0)))};
+            }}
+        """
+    if pressed:
+        style += f"""
+            QPushButton:pressed {{
+                background: {bg_color.replace(str(a), str(max(a - 0.1, 0.1)))};
+                border: 2px solid {border_color.replace(str(a), str(min(a + 0.3, 1.0)))};
+            }}
+        """
+    return style
+
 
 class GlassButton(QPushButton):
     """
@@ -106,38 +144,9 @@ class GlassButton(QPushButton):
         self._animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
     
     def _update_style(self):
-        """更新按钮样式"""
-        if self._is_clicked:
-            bg_color = self._rgba_to_str(self._clicked_rgba)
-            border_color = self._clicked_border
-        else:
-            bg_color = self._rgba_to_str(self._normal_rgba)
-            border_color = self._normal_border
-        
-        # 创建悬停状态的颜色
-        hover_bg = bg_color.replace(str(self._normal_rgba[3]), str(min(self._normal_rgba[3] + 0.1, 1.0))) if not self._is_clicked else \
-                  bg_color.replace(str(self._clicked_rgba[3]), str(min(self._clicked_rgba[3] + 0.1, 1.0)))
-        
-        style = f"""
-            QPushButton {{
-                background: {bg_color};
-                border: 2px solid {border_color};
-                border-radius: {self._border_radius}px;
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 5px;
-            }}
-            QPushButton:hover {{
-                background: {hover_bg};
-                border: 2px solid {border_color.replace(str(self._normal_rgba[3]), str(min(self._normal_rgba[3] + 0.2, 1.0))) if not self._is_clicked else border_color.replace(str(self._clicked_rgba[3]), str(min(self._clicked_rgba[3] + 0.2, 1.0)))};
-            }}
-            QPushButton:pressed {{
-                background: {bg_color.replace(str(self._normal_rgba[3]), str(max(self._normal_rgba[3] - 0.1, 0.1))) if not self._is_clicked else bg_color.replace(str(self._clicked_rgba[3]), str(max(self._clicked_rgba[3] - 0.1, 0.1)))};
-                border: 2px solid {border_color.replace(str(self._normal_rgba[3]), str(min(self._normal_rgba[3] + 0.3, 1.0))) if not self._is_clicked else border_color.replace(str(self._clicked_rgba[3]), str(min(self._clicked_rgba[3] + 0.3, 1.0)))};
-            }}
-        """
-        self.setStyleSheet(style)
+        """更新按钮样式（样式表按颜色缓存，状态没有变化时不重新设置）"""
+        rgba = self._clicked_rgba if self._is_clicked else self._normal_rgba
+        apply_style_sheet(self, glass_button_style(rgba, self._border_radius))
     
     @pyqtProperty(float)
     def opacity(self):
@@ -253,13 +262,6 @@ class ToggleGlassButton(GlassButton):
     
     def _update_toggle_style(self):
         """更新切换按钮样式"""
-        if self._is_selected:
-            bg_color = self._rgba_to_str(self._selected_rgba)
-            border_color = self._get_border_color(self._selected_rgba)
-        else:
-            bg_color = self._rgba_to_str(self._normal_rgba)
-            border_color = self._normal_border
-        
         # 更新文本
         if self._show_checkmark:
             if self._is_selected:
@@ -267,26 +269,8 @@ class ToggleGlassButton(GlassButton):
             else:
                 self.setText(self._original_text)
         
-        # 悬停颜色
-        hover_bg = bg_color.replace(str(self._normal_rgba[3]), str(min(self._normal_rgba[3] + 0.1, 1.0))) if not self._is_selected else \
-                  bg_color.replace(str(self._selected_rgba[3]), str(min(self._selected_rgba[3] + 0.1, 1.0)))
-        
-        style = f"""
-            QPushButton {{
-                background: {bg_color};
-                border: 2px solid {border_color};
-                border-radius: {self._border_radius}px;
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 5px;
-            }}
-            QPushButton:hover {{
-                background: {hover_bg};
-                border: 2px solid {border_color.replace(str(self._normal_rgba[3]), str(min(self._normal_rgba[3] + 0.2, 1.0))) if not self._is_selected else border_color.replace(str(self._selected_rgba[3]), str(min(self._selected_rgba[3] + 0.2, 1.0)))};
-            }}
-        """
-        self.setStyleSheet(style)
+        rgba = self._selected_rgba if self._is_selected else self._normal_rgba
+        apply_style_sheet(self, glass_button_style(rgba, self._border_radius, pressed=False))
     
     def mouseReleaseEvent(self, event):
         """鼠标释放事件 - 切换选中状态"""
@@ -0,0 +1,260 @@
+'''
+LSB 编解码模块
+用 NumPy 一次性处理整张图片的像素，替代 stegano 逐像素的 Python 循环。
+与 stegano.lsb 的格式逐位兼容：按行优先顺序使用每个像素 R、G、B 三个分量的最低位，
+内容为 "<字节数>:" 前缀加 UTF-8 消息，每个字节高位在前
+'''
+
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+from PIL import Image
+
+SUPPORTED_MODES = ("RGB", "RGBA")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG颜色类型 -> 每像素通道数（只处理8位、非隔行的RGB/RGBA）
+PNG_CHANNELS = {2: 3, 6: 4}
+# 长度前缀最多读取的字节数（数字加冒号），超过仍未找到冒号视为没有嵌入信息
+MAX_PREFIX_BYTES = 20
+
+
+class UnsupportedImageError(Exception):
+    """图片模式不是 RGB/RGBA，交给 stegano 处理"""
+
+
+def _open_pixels(image):
+    img = image if isinstance(image, Image.Image) else Image.open(image)
+    if img.mode not in SUPPORTED_MODES:
+        raise UnsupportedImageError(f"不支持的图片模式: {img.mode}")
+    return img
+
+
+class _PngRowReader:
+    """
+    按需解码PNG的前若干行：只解压并反滤波读到的行，消息通常只占图片开头的一两行
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            if self._file.read(8) != PNG_SIGNATURE:
+                raise UnsupportedImageError("不是PNG图片")
+            length, chunk_type = struct.unpack(">I4s", self._file.read(8))
+            if chunk_type != b"IHDR":
+                raise UnsupportedImageError("PNG缺少IHDR")
+            width, height, depth, color_type, _, _, interlace = struct.unpack(
+                ">IIBBBBB", self._file.read(length)
+            )
+            self._file.read(4)
+            if depth != 8 or color_type not in PNG_CHANNELS or interlace:
+                raise UnsupportedImageError("不支持的PNG格式")
+        except (struct.error, UnsupportedImageError):
+            self._file.close()
+            raise
+        self.width, self.height = width, height
+        self.channels = PNG_CHANNELS[color_type]
+        self._stride = width * self.channels
+        self._inflater = zlib.decompressobj()
+        self._raw = bytearray()
+        self._rows = []
+        self._prev = bytes(self._stride)
+        self._idat_left = 0
+
+    def close(self):
+        self._file.close()
+
+    def _feed(self):
+        """读取下一段IDAT数据并解压，没有更多数据时返回False"""
+        while self._idat_left == 0:
+            header = self._file.read(8)
+            if len(header) < 8:
+                return False
+            length, chunk_type = struct.unpack(">I4s", header)
+            if chunk_type == b"IDAT":
+                self._idat_left = length
+            elif chunk_type == b"IEND":
+                return False
+            else:
+                self._file.seek(length + 4, os.SEEK_CUR)
+        data = self._file.read(min(self._idat_left, 64 * 1024))
+        self._idat_left -= len(data)
+        if self._idat_left == 0:
+            self._file.read(4)  # CRC
+        self._raw += self._inflater.decompress(data)
+        return True
+
+    def _unfilter(self, filter_type, line):
+        bpp, prev = self.channels, self._prev
+        if filter_type == 0:
+            return bytes(line)
+        if filter_type == 1:
+            # Sub 等价于每个通道的累加和
+            values = np.frombuffer(bytes(line), dtype=np.uint8).reshape(-1, bpp)
+            return np.cumsum(values, axis=0, dtype=np.uint8).tobytes()
+        if filter_type == 2:
+            return (np.frombuffer(bytes(line), dtype=np.uint8) + np.frombuffer(prev, dtype=np.uint8)).tobytes()
+        out = bytearray(line)
+        for i in range(len(out)):
+            left = out[i - bpp] if i >= bpp else 0
+            up = prev[i]
+            if filter_type == 3:
+                out[i] = (out[i] + ((left + up) >> 1)) & 0xFF
+            else:
+                upper_left = prev[i - bpp] if i >= bpp else 0
+                p = left + up - upper_left
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - upper_left)
+                if pa <= pb and pa <= pc:
+                    predictor = left
+                elif pb <= pc:
+                    predictor = up
+                else:
+                    predictor = upper_left
+                out[i] = (out[i] + predictor) & 0xFF
+        return bytes(out)
+
+    def rows(self, count):
+        """返回前 count 行像素，形状为 (count, width, channels)"""
+        count = min(count, self.height)
+        while len(self._rows) < count:
+            while len(self._raw) < self._stride + 1:
+                if not self._feed():
+                    raise IndexError("Impossible to detect message.")
+            filter_type, line = self._raw[0], self._raw[1:self._stride + 1]
+            del self._raw[:self._stride + 1]
+            if filter_type > 4:
+                raise UnsupportedImageError("PNG数据损坏")
+            self._prev = self._unfilter(filter_type, line)
+            self._rows.append(self._prev)
+        data = b"".join(self._rows[:count])
+        return np.frombuffer(data, dtype=np.uint8).reshape(count, self.width, self.channels)
+
+
+def _read_bytes(channels, start_byte, count):
+    """从颜色分量序列中读取 count 个隐藏字节，起点为第 start_byte 个字节"""
+    begin = start_byte * 8
+    end = begin + count * 8
+    if end > channels.shape[0]:
+        raise IndexError("Impossible to detect message.")
+    return np.packbits(channels[begin:end] & 1).tobytes()
+
+
+def _reveal(channels, total_pixels):
+    """
+    按 stegano 的格式读取消息，读到长度前缀指定的字节数后立即停止
+    :param channels: 函数，接收需要的字节数，返回至少覆盖这些字节的颜色分量序列
+    :param total_pixels: 图片像素总数
+    """
+    prefix = _read_bytes(channels(MAX_PREFIX_BYTES), 0, min(MAX_PREFIX_BYTES, total_pixels * 3 // 8))
+    colon = prefix.find(b":")
+    if colon <= 0 or not prefix[:colon].isdigit():
+        raise IndexError("Impossible to detect message.")
+    limit = int(prefix[:colon])
+
+    start = colon + 1
+    payload = _read_bytes(channels(start + limit), start, limit)
+    try:
+        return payload.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise IndexError("Impossible to detect message.") from exc
+
+
+def _pixels_needed(byte_count):
+    return -(-byte_count * 8 // 3)
+
+
+def reveal(image):
+    """
+    读取图片中隐藏的消息
+    8位RGB/RGBA的PNG文件只解码消息所在的前几行，其他情况解码整张图片
+    :param image: 图片路径或 PIL Image
+    :return: 消息字符串
+    """
+    if isinstance(image, (str, os.PathLike)):
+        try:
+            reader = _PngRowReader(image)
+        except UnsupportedImageError:
+            reader = None
+        if reader is not None:
+            try:
+                def png_channels(byte_count):
+                    rows = -(-_pixels_needed(byte_count) // reader.width)
+                    return reader.rows(rows).reshape(-1, reader.channels)[:, :3].reshape(-1)
+                return _reveal(png_channels, reader.width * reader.height)
+            finally:
+                reader.close()
+
+    img = _open_pixels(image)
+    pixels = np.asarray(img)
+    # 每个像素只取 R、G、B，按行优先展开（只对需要的像素做切片，不复制整张图）
+    flat = pixels.reshape(-1, pixels.shape[-1])
+
+    def channels(byte_count):
+        pixel_count = min(flat.shape[0], _pixels_needed(byte_count))
+        return flat[:pixel_count, :3].reshape(-1)
+
+    return _reveal(channels, flat.shape[0])
+
+
+def hide(image, message):
+    """
+    把消息隐藏到图片中
+    :param image: 图片路径或 PIL Image
+    :param message: 消息字符串
+    :return: 写入消息后的 PIL Image（由调用方保存）
+    """
+    assert len(message) != 0, "message length is zero"
+    img = _open_pixels(image)
+    message_bytes = message.encode("utf-8")
+    payload = f"{len(message_bytes)}:".encode("ascii") + message_bytes
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    bits = np.concatenate([bits, np.zeros((-len(bits)) % 3, dtype=np.uint8)])
+
+    pixels = np.array(img)
+    flat = pixels.reshape(-1, pixels.shape[-1])
+    pixel_count = len(bits) // 3
+    if pixel_count > flat.shape[0]:
+        raise Exception(f"The message you want to hide is too long: {len(message_bytes)} bytes")
+    flat[:pixel_count, :3] = (flat[:pixel_count, :3] & 0xFE) | bits.reshape(-1, 3)
+    return Image.fromarray(pixels, img.mode)
+
+
+def benchmark(folder="food"):
+    """对比 stegano 与本模块读取 folder 中所有图片的耗时，并校验结果一致"""
+    from stegano import lsb
+
+    names = sorted(
+        name for name in os.listdir(folder)
+        if os.path.splitext(name)[1].lower() == ".png"
+    )
+    totals = {"stegano": 0.0, "numpy": 0.0}
+    mismatches = []
+    for name in names:
+        path = os.path.join(folder, name)
+        results, elapsed = {}, {}
+        for engine, func in (("stegano", lsb.reveal), ("numpy", reveal)):
+            start = time.perf_counter()
+            try:
+                results[engine] = func(path)
+            except Exception as e:
+                results[engine] = type(e).__name__
+            elapsed[engine] = time.perf_counter() - start
+            totals[engine] += elapsed[engine]
+        if results["stegano"] != results["numpy"]:
+            mismatches.append(name)
+        print(f"{name}: stegano {elapsed['stegano'] * 1000:.1f}ms, numpy {elapsed['numpy'] * 1000:.1f}ms")
+
+    print(f"图片数量: {len(names)}")
+    print(f"stegano 总耗时: {totals['stegano']:.2f}s")
+    print(f"numpy   总耗时: {totals['numpy']:.2f}s")
+    if totals["numpy"]:
+        print(f"加速比: {totals['stegano'] / totals['numpy']:.1f}x")
+    print(f"结果不一致: {mismatches or '无'}")
+    return totals, mismatches
+
+
+if __name__ == "__main__":
+    import sys
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else "food")
@@ -0,0 +1,205 @@
+'''
+宠物动画控制模块
+为当前 gif_folder 建立一次动作索引并预加载常用动作（站立、进食、睡觉、走路、情绪），
+切换动作时只查内存索引、使用已解码的帧，不再读取配置文件或重新解码GIF；
+索引中找不到时检查文件夹的修改时间，运行期间新加入的GIF会被重新索引；
+同时负责临时动作结束后回到待机动作
+'''
+
+import json
+import logging
+import os
+
+from PyQt6.QtCore import QObject, QTimer
+
+from lib.gif_player import load_gif_frames
+
+logger = logging.getLogger(__name__)
+
+SETTING_PATH = "demo_setting.json"
+DEFAULT_GIF_FOLDER = "gif/猫"
+DEFAULT_IDLE_GIF = "闭眼.gif"
+DEFAULT_GIF_PATH = "gif/猫/闭眼.gif"
+
+# 动作名 -> 候选GIF文件名（按顺序取角色文件夹中第一个存在的）
+POSES = {
+    "stand": ["站起.gif"],
+    "eat": ["吃东西.gif", "吃饭.gif", "吃糖.gif"],
+    "sleep": ["闭眼.gif"],
+    "walk": ["走路.gif"],
+    "happy": ["啦啦啦.gif", "爱你哟.gif", "跳舞.gif", "开口.gif"],
+    "sad": ["哭.gif", "我要哭了.gif"],
+    "angry": ["生气.gif"],
+    "refuse": ["不要嘛.gif", "摇头.gif"],
+}
+
+
+class PetAnimationController(QObject):
+    """
+    宠物动画状态机
+    待机动作来自配置中的 "gif"；其他动作播放指定时长或指定轮数后自动回到待机动作
+    """
+
+    def __init__(self, player, setting_path=SETTING_PATH, parent=None):
+        super().__init__(parent)
+        self.player = player
+        self.setting_path = setting_path
+        self.gif_folder = None
+        self.idle_gif = DEFAULT_IDLE_GIF
+        self.state = None
+        self._index = {}     # {GIF文件名: 路径}
+        self._poses = {}     # {动作名: 路径}
+        self._folder_mtime = None
+        self._loops_left = 0
+        self._return_timer = QTimer(self)
+        self._return_timer.setSingleShot(True)
+        self._return_timer.timeout.connect(self.return_to_idle)
+        self.player.cycleFinished.connect(self._on_cycle_finished)
+
+    def _read_settings(self):
+        try:
+            with open(self.setting_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"读取{self.setting_path}失败: {e}")
+            return {}
+
+    def reload_settings(self):
+        """重新读取配置（配置被其他模块修改后调用），角色文件夹变化时重建索引"""
+        setting = self._read_settings()
+        self.idle_gif = setting.get("gif", DEFAULT_IDLE_GIF).strip() or DEFAULT_IDLE_GIF
+        gif_folder = setting.get("gif_folder", DEFAULT_GIF_FOLDER)
+        if gif_folder != self.gif_folder:
+            self.load_folder(gif_folder)
+
+    def load_folder(self, gif_folder):
+        """为角色文件夹建立索引并预解码所有动作"""
+        self.gif_folder = gif_folder
+        self._build_index()
+        self.preload(self._poses.values())
+        logger.debug(f"已为 {gif_folder} 预加载动作: {sorted(self._poses)}")
+
+    def _folder_stat(self):
+        try:
+            return os.stat(self.gif_folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def _build_index(self):
+        gif_folder = self.gif_folder
+        # 先记录修改时间再列目录，列目录期间加入的文件下次查找时还会被发现
+        self._folder_mtime = self._folder_stat()
+        try:
+            names = os.listdir(gif_folder)
+        except OSError as e:
+            logger.warning(f"读取GIF文件夹失败: {gif_folder}: {e}")
+            names = []
+        self._index = {
+            name: f"{gif_folder}/{name}" for name in names if name.lower().endswith(".gif")
+        }
+        self._poses = {}
+        for pose, candidates in POSES.items():
+            for name in candidates:
+                if name in self._index:
+                    self._poses[pose] = self._index[name]
+                    break
+
+    def _refresh_index(self):
+        """
+        角色文件夹在建立索引后有变化（例如运行期间加入了新的GIF）时重建索引
+        :return: 是否重建了索引
+        """
+        if self.gif_folder is None or self._folder_stat() == self._folder_mtime:
+            return False
+        self._build_index()
+        logger.debug(f"{self.gif_folder} 有变化，已重建动作索引")
+        return True
+
+    def preload(self, gif_paths):
+        """按当前显示尺寸和透明度预解码GIF帧"""
+        label = self.player.label
+        for gif_path in gif_paths:
+            load_gif_frames(gif_path, label.size(), self.player.opacity, label.devicePixelRatioF())
+
+    def has_pose(self, pose):
+        return pose in self._poses or (self._refresh_index() and pose in self._poses)
+
+    def resolve(self, name):
+        """
+        把动作名或GIF文件名解析为路径，索引中没有时先检查角色文件夹是否有变化
+        :return: 路径，找不到时返回None
+        """
+        if name in self._poses:
+            return self._poses[name]
+        if name in self._index:
+            return self._index[name]
+        if self._refresh_index():
+            return self.resolve(name)
+        # 配置中也可以写绝对路径
+        if name.startswith("/") or ":" in name:
+            return name if os.path.exists(name) else None
+        return None
+
+    def _play(self, name):
+        gif_path = self.resolve(name)
+        if gif_path and self.player.play(gif_path):
+            return True
+        return False
+
+    def return_to_idle(self):
+        """回到待机动作，待机GIF不可用时使用默认GIF"""
+        self._return_timer.stop()
+        self._loops_left = 0
+        self.state = "idle"
+        if self._play(self.idle_gif):
+            return
+        logger.warning(f"GIF文件不存在: {self.gif_folder}/{self.idle_gif}，使用默认GIF")
+        if not self.player.play(DEFAULT_GIF_PATH):
+            logger.warning("默认GIF也无法加载")
+
+    def set_state(self, state, duration_ms=None, loops=None):
+        """
+        切换到某个动作
+        :param state: 动作名（见 POSES）或GIF文件名
+        :param duration_ms: 播放多久后回到待机动作，None表示一直保持
+        :param loops: 播放几轮后回到待机动作，None表示一直保持
+        :return: 是否切换成功（角色没有该动作时保持当前动作）
+        """
+        if not self._play(state):
+            return False
+        self.state = state
+        self._return_timer.stop()
+        self._loops_left = loops or 0
+        if duration_ms:
+            self._return_timer.start(duration_ms)
+        return True
+
+    def react(self, state, loops=1):
+        """播放一次临时动作（例如情绪），结束后回到待机动作"""
+        return self.set_state(state, loops=loops)
+
+    def set_idle(self, gif_name, persist=True):
+        """
+        修改待机动作并立即切换
+        :param gif_name: 待机GIF文件名
+        :param persist: 是否写回配置文件，下次启动时保持
+        """
+        if gif_name not in self._index:
+            return False
+        self.idle_gif = gif_name
+        if persist:
+            setting = self._read_settings()
+            setting["gif"] = gif_name
+            try:
+                with open(self.setting_path, "w", encoding="utf-8") as f:
+                    json.dump(setting, f, ensure_ascii=False, indent=4)
+            except OSError as e:
+                logger.error(f"写入{self.setting_path}失败: {e}")
+        self.return_to_idle()
+        return True
+
+    def _on_cycle_finished(self):
+        if self._loops_left > 0:
+            self._loops_left -= 1
+            if self._loops_left == 0:
+                self.return_to_idle()
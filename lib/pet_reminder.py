@@ -16,6 +16,7 @@ class  PetReminder(QObject):
         
         self._remindTalk()
         self._remindEat()
+        self._remindWeather()
         
     def _show_random_message(self, message_list):
         """显示随机提醒消息"""
@@ -39,17 +40,23 @@ class  PetReminder(QObject):
                 self.logger.warning(f"加载吃饭提醒配置失败: {e}")
 
 
-    # def _show_weather_message(self, weather_report):
-    #     if self.parent():
-    #         try:
-    #             with open("demo_setting.json", "r", encoding="utf-8") as f:
-    #                 weather = json.load(f)
-    #                 weather_y = weather.get("openai_key")
-    #                 if weather_y:
-    #                     import AiAPI
-
-    #         except Exception as e:
-    #             self.logger.warning(f"发送天气提醒失败: {e}")
+    def _show_weather_message(self):
+        """显示天气提醒，只读取预取缓存，不会阻塞界面"""
+        if not self.parent():
+            return
+        from lib.weather_scheduler import get_prefetcher
+        prefetcher = get_prefetcher()
+        if prefetcher is None:
+            return
+        city, weather = prefetcher.get_local_weather()
+        if not weather:
+            self.logger.debug("暂无预取的天气数据，跳过天气提醒")
+            return
+        message = f"{city}现在{weather.get('cap', '')}，{weather.get('temp', 'N/A')}°C"
+        if "雨" in str(weather.get('cap', '')):
+            message += "，出门记得带伞哦"
+        self.logger.info(f"[天气提醒] {message}")
+        show_temp_message(self.parent(), message, duration=3000, fade_duration=1000)
     
     
     def start_talk_reminder(self, parent, remind_time=30):
@@ -71,6 +78,15 @@ class  PetReminder(QObject):
         else:
             self.logger.info("吃饭提醒已在运行中")
     
+    def start_weather_reminder(self, parent, remind_time=60*60):
+        """启动天气提醒 - 使用Qt定时器"""
+        if not self.weather_timer.isActive():
+            self.setParent(parent)  # 设置父对象
+            self.weather_timer.start(remind_time * 1000)  # 转换为毫秒
+            self.logger.info(f"天气提醒已启动，间隔{remind_time}秒")
+        else:
+            self.logger.info("天气提醒已在运行中")
+
     def stop_talk_reminder(self):
         """停止说话提醒"""
         if self.talk_timer.isActive():
@@ -83,6 +99,12 @@ class  PetReminder(QObject):
         if self.eat_timer.isActive():
             self.eat_timer.stop()
             self.logger.info("吃饭提醒已停止")
+
+    def stop_weather_reminder(self):
+        """停止天气提醒"""
+        if self.weather_timer.isActive():
+            self.weather_timer.stop()
+            self.logger.info("天气提醒已停止")
     
 
     def _remindTalk(self):
@@ -105,11 +127,9 @@ class  PetReminder(QObject):
         self.eat_timer = QTimer(self)
         self.eat_timer.timeout.connect(lambda: self._show_eat_message(self.eat_list))
 
-    # def _remindWeather(self):
-    #     from lib.getWeather import ai_get_local_weather
-    #     weather_report = ai_get_local_weather()
-    #     self.weather_timer = QTimer(self)
-    #     self.weather_timer.timeout.connect(lambda: self._show_weather_message(weather_report))
+    def _remindWeather(self):
+        self.weather_timer = QTimer(self)
+        self.weather_timer.timeout.connect(self._show_weather_message)
 
         
 
@@ -58,7 +58,7 @@ class PluginCardWidget(QFrame):
         title_layout.addWidget(self.icon_label)
         
         # 插件名称 - 增强视觉效果
-        self.name_label = QLabel(self.plugin_name)
+        self.name_label = QLabel()
         self.name_label.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -78,7 +78,7 @@ class PluginCardWidget(QFrame):
         main_layout.addLayout(title_layout)
         
         # 描述信息 - 增强视觉效果
-        self.desc_label = QLabel(self.plugin_data.get('discription', '暂无描述'))
+        self.desc_label = QLabel()
         self.desc_label.setWordWrap(True)
         self.desc_label.setStyleSheet("""
             QLabel {
@@ -92,89 +92,79 @@ class PluginCardWidget(QFrame):
         """)
         main_layout.addWidget(self.desc_label)
         
-        # 格式信息
-        format_text = self.plugin_data.get('format', '')
-        if format_text:
-            format_label = QLabel(f"格式: {format_text}")
-            format_label.setStyleSheet("""
-                QLabel {
-                    font-size: 12px;
-                    color: #666666;
-                    font-family: Consolas, Monaco, monospace;
-                    background-color: #f8f8f8;
-                    padding: 3px 6px;
-                    border-radius: 3px;
-                }
-            """)
-            main_layout.addWidget(format_label)
+        # 格式信息（内容为空时隐藏，更新数据时再显示）
+        self.format_label = QLabel()
+        self.format_label.setStyleSheet("""
+            QLabel {
+                font-size: 12px;
+                color: #666666;
+                font-family: Consolas, Monaco, monospace;
+                background-color: #f8f8f8;
+                padding: 3px 6px;
+                border-radius: 3px;
+            }
+        """)
+        main_layout.addWidget(self.format_label)
         
         # 使用说明
-        usage_text = self.plugin_data.get('usage', '')
-        if usage_text:
-            usage_label = QLabel(f"说明: {usage_text}")
-            usage_label.setWordWrap(True)
-            usage_label.setStyleSheet("""
-                QLabel {
-                    font-size: 12px;
-                    color: #444444;
-                    padding: 3px 0;
-                }
-            """)
-            main_layout.addWidget(usage_label)
+        self.usage_label = QLabel()
+        self.usage_label.setWordWrap(True)
+        self.usage_label.setStyleSheet("""
+            QLabel {
+                font-size: 12px;
+                color: #444444;
+                padding: 3px 0;
+            }
+        """)
+        main_layout.addWidget(self.usage_label)
         
         # 注意事项
-        attention_text = self.plugin_data.get('attention', '')
-        if attention_text:
-            attention_label = QLabel(f"注意: {attention_text}")
-            attention_label.setWordWrap(True)
-            attention_label.setStyleSheet("""
-                QLabel {
-                    font-size: 12px;
-                    color: #8B0000;
-                    padding: 3px 0;
-                    font-style: italic;
-                }
-            """)
-            main_layout.addWidget(attention_label)
+        self.attention_label = QLabel()
+        self.attention_label.setWordWrap(True)
+        self.attention_label.setStyleSheet("""
+            QLabel {
+                font-size: 12px;
+                color: #8B0000;
+                padding: 3px 0;
+                font-style: italic;
+            }
+        """)
+        main_layout.addWidget(self.attention_label)
         
         # 状态信息
         status_layout = QHBoxLayout()
         status_layout.setSpacing(15)
         
         # AI可使用状态
-        ai_status = "✅" if self.plugin_data.get('AI_can_use', False) else "❌"
-        ai_label = QLabel(f"AI可用: {ai_status}")
-        ai_label.setStyleSheet("""
+        self.ai_label = QLabel()
+        self.ai_label.setStyleSheet("""
             QLabel {
                 font-size: 12px;
                 color: #2F4F2F;
             }
         """)
-        status_layout.addWidget(ai_label)
+        status_layout.addWidget(self.ai_label)
         
         # 详细信息状态
-        detail_status = "📋" if self.plugin_data.get('detailed_info', False) else "📄"
-        detail_label = QLabel(f"详情: {detail_status}")
-        detail_label.setStyleSheet("""
+        self.detail_label = QLabel()
+        self.detail_label.setStyleSheet("""
             QLabel {
                 font-size: 12px;
                 color: #2F4F2F;
             }
         """)
-        status_layout.addWidget(detail_label)
+        status_layout.addWidget(self.detail_label)
         
         # 外部插件状态 - 新增功能
-        external_status = "🔌" if self.plugin_data.get('have_plugin', False) else "💻"
-        external_text = "外部插件" if self.plugin_data.get('have_plugin', False) else "内置功能"
-        external_label = QLabel(f"{external_text}: {external_status}")
-        external_label.setStyleSheet("""
+        self.external_label = QLabel()
+        self.external_label.setStyleSheet("""
             QLabel {
                 font-size: 12px;
                 color: #2F4F2F;
                 font-weight: bold;
             }
         """)
-        status_layout.addWidget(external_label)
+        status_layout.addWidget(self.external_label)
         
         status_layout.addStretch()
         main_layout.addLayout(status_layout)
@@ -253,6 +243,28 @@ class PluginCardWidget(QFrame):
             for widget in widgets_to_register:
                 if hasattr(widget, 'setFont'):
                     self.font_manager.register_widget(widget)
+        
+        self.show_plugin_data()
+    
+    def show_plugin_data(self):
+        """把当前插件数据填入各个标签（只修改文字和可见性，不重建控件和样式）"""
+        data = self.plugin_data
+        self.name_label.setText(self.plugin_name)
+        self.desc_label.setText(data.get('discription', '暂无描述'))
+        
+        for label, prefix, key in ((self.format_label, "格式", 'format'),
+                                   (self.usage_label, "说明", 'usage'),
+                                   (self.attention_label, "注意", 'attention')):
+            text = data.get(key, '')
+            label.setText(f"{prefix}: {text}" if text else "")
+            label.setVisible(bool(text))
+        
+        self.ai_label.setText(f"AI可用: {'✅' if data.get('AI_can_use', False) else '❌'}")
+        self.detail_label.setText(f"详情: {'📋' if data.get('detailed_info', False) else '📄'}")
+        if data.get('have_plugin', False):
+            self.external_label.setText("外部插件: 🔌")
+        else:
+            self.external_label.setText("内置功能: 💻")
     
     def apply_styles(self):
         """应用卡片样式 - 增强视觉效果"""
@@ -291,12 +303,8 @@ class PluginCardWidget(QFrame):
         self.plugin_name = plugin_name
         self.plugin_data = plugin_data
         
-        # 更新显示内容
-        self.name_label.setText(plugin_name)
-        self.desc_label.setText(plugin_data.get('discription', '暂无描述'))
-        
-        # 重新应用样式（可能需要更新某些状态显示）
-        self.apply_styles()
+        # 更新显示内容（样式不变，不需要重新应用）
+        self.show_plugin_data()
 
 # 测试代码
 if __name__ == "__main__":
@@ -13,6 +13,8 @@ from lib.plugin_card_widget import PluginCardWidget
 # 延迟导入，避免循环依赖
 # from lib.add_plugin_dialog import AddPluginDialog
 
+MAX_COLS = 2  # 每行最多2个卡片
+
 class PluginPageWidget(QWidget):
     """插件页面主组件"""
     
@@ -28,6 +30,8 @@ class PluginPageWidget(QWidget):
         self.font_manager = font_manager
         self.plugin_manager = PluginManager()
         self.plugin_cards = {}  # 存储插件卡片引用
+        self.card_order = []  # 插件名称，按卡片在网格中的顺序
+        self.state_label = None  # 空状态或错误提示
         
         # 初始化日志
         self.logger = logging.getLogger(__name__)
@@ -176,41 +180,32 @@ class PluginPageWidget(QWidget):
         return toolbar
     
     def load_plugins(self):
-        """加载并显示所有插件"""
+        """
+        按插件管理器中的数据同步插件卡片
+        只为新增的插件创建卡片、更新内容有变化的卡片、删除已不存在的卡片，其余卡片保持不动
+        """
         try:
-            # 清除现有卡片
-            self.clear_plugin_cards()
-            
-            # 获取插件数据
             plugins = self.plugin_manager.get_plugins()
             
+            first_removed = None
+            for plugin_name in [name for name in self.card_order if name not in plugins]:
+                index = self.remove_card(plugin_name, reflow=False)
+                first_removed = index if first_removed is None else min(first_removed, index)
+            
+            for plugin_name, plugin_data in plugins.items():
+                card = self.plugin_cards.get(plugin_name)
+                if card is None:
+                    self.create_card(plugin_name, plugin_data)
+                elif card.plugin_data != plugin_data:
+                    card.update_plugin_data(plugin_name, dict(plugin_data))
+            
+            # 按插件管理器中的顺序排列，只移动位置发生变化的卡片
+            self.reflow(list(plugins), first_removed)
+            
             if not plugins:
                 self.show_empty_state()
                 return
             
-            # 创建插件卡片
-            row, col = 0, 0
-            max_cols = 2  # 每行最多2个卡片
-            
-            for plugin_name, plugin_data in plugins.items():
-                card = PluginCardWidget(plugin_name, plugin_data, self.font_manager)
-                
-                # 连接信号
-                card.edit_clicked.connect(self.edit_plugin)
-                card.delete_clicked.connect(self.delete_plugin)
-                
-                # 添加到布局
-                self.cards_layout.addWidget(card, row, col)
-                
-                # 保存卡片引用
-                self.plugin_cards[plugin_name] = card
-                
-                # 更新行列位置
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-            
             # 更新状态信息
             self.update_status(f"已加载 {len(plugins)} 个插件")
             
@@ -218,6 +213,80 @@ class PluginPageWidget(QWidget):
             self.logger.error(f"加载插件失败: {e}")
             self.show_error_state(f"加载插件失败: {str(e)}")
     
+    def create_card(self, plugin_name: str, plugin_data: dict):
+        """为插件创建卡片并放到网格末尾"""
+        self.clear_state_label()
+        card = PluginCardWidget(plugin_name, dict(plugin_data), self.font_manager)
+        
+        # 连接信号（卡片改名后信号携带新名称，不需要重新连接）
+        card.edit_clicked.connect(self.edit_plugin)
+        card.delete_clicked.connect(self.delete_plugin)
+        
+        index = len(self.card_order)
+        self.cards_layout.addWidget(card, index // MAX_COLS, index % MAX_COLS)
+        self.plugin_cards[plugin_name] = card
+        self.card_order.append(plugin_name)
+        return card
+    
+    def refresh_card(self, plugin_name: str, new_name: str = None):
+        """
+        用插件管理器中的最新数据更新一张卡片
+        :param new_name: 插件改名时的新名称，卡片保持原来的位置
+        """
+        new_name = new_name or plugin_name
+        plugin_data = self.plugin_manager.get_plugin(new_name)
+        card = self.plugin_cards.get(plugin_name)
+        if card is None or plugin_data is None:
+            self.load_plugins()
+            return
+        if new_name != plugin_name:
+            del self.plugin_cards[plugin_name]
+            self.plugin_cards[new_name] = card
+            self.card_order[self.card_order.index(plugin_name)] = new_name
+        card.update_plugin_data(new_name, dict(plugin_data))
+    
+    def remove_card(self, plugin_name: str, reflow: bool = True):
+        """
+        删除一张卡片，reflow 为 True 时把后面的卡片向前移动
+        :return: 卡片原来的位置，卡片不存在时返回None
+        """
+        card = self.plugin_cards.pop(plugin_name, None)
+        if card is None:
+            return None
+        index = self.card_order.index(plugin_name)
+        del self.card_order[index]
+        self.cards_layout.removeWidget(card)
+        card.deleteLater()
+        if reflow:
+            self.place_cards(index)
+            if not self.card_order:
+                self.show_empty_state()
+        return index
+    
+    def reflow(self, order, start=None):
+        """
+        按给定顺序排列卡片，从第一个位置不同的卡片开始重新放置
+        :param start: 已知需要从这个位置开始重新放置（例如前面删除过卡片）
+        """
+        first_changed = next(
+            (i for i, (old, new) in enumerate(zip(self.card_order, order)) if old != new),
+            min(len(self.card_order), len(order))
+        )
+        if start is not None:
+            first_changed = min(first_changed, start)
+        if first_changed >= len(order):
+            self.card_order = list(order)
+            return
+        self.card_order = list(order)
+        self.place_cards(first_changed)
+    
+    def place_cards(self, start: int):
+        """把 start 及之后的卡片放到与顺序对应的网格位置"""
+        for index in range(start, len(self.card_order)):
+            card = self.plugin_cards[self.card_order[index]]
+            self.cards_layout.removeWidget(card)
+            self.cards_layout.addWidget(card, index // MAX_COLS, index % MAX_COLS)
+    
     def clear_plugin_cards(self):
         """清除所有插件卡片"""
         # 清除布局中的所有widget
@@ -228,9 +297,19 @@ class PluginPageWidget(QWidget):
         
         # 清空卡片引用
         self.plugin_cards.clear()
+        self.card_order.clear()
+        self.state_label = None
+    
+    def clear_state_label(self):
+        """移除空状态或错误提示"""
+        if self.state_label is not None:
+            self.cards_layout.removeWidget(self.state_label)
+            self.state_label.deleteLater()
+            self.state_label = None
     
     def show_empty_state(self):
         """显示空状态"""
+        self.clear_state_label()
         empty_label = QLabel("暂无插件，请点击「添加插件」按钮创建新插件")
         empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         empty_label.setStyleSheet("""
@@ -244,11 +323,13 @@ class PluginPageWidget(QWidget):
         if self.font_manager:
             self.font_manager.register_widget(empty_label)
         
+        self.state_label = empty_label
         self.cards_layout.addWidget(empty_label, 0, 0)
         self.update_status("暂无插件")
     
     def show_error_state(self, error_message: str):
         """显示错误状态"""
+        self.clear_plugin_cards()
         error_label = QLabel(f"❌ {error_message}")
         error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         error_label.setStyleSheet("""
@@ -265,6 +346,7 @@ class PluginPageWidget(QWidget):
         if self.font_manager:
             self.font_manager.register_widget(error_label)
         
+        self.state_label = error_label
         self.cards_layout.addWidget(error_label, 0, 0)
         self.update_status(f"错误: {error_message}")
     
@@ -289,7 +371,8 @@ class PluginPageWidget(QWidget):
                 plugin_name = plugin_data.pop('name')  # 提取插件名称
                 
                 if self.plugin_manager.add_plugin(plugin_name, plugin_data):
-                    self.load_plugins()  # 重新加载显示
+                    self.create_card(plugin_name, plugin_data)  # 只为新插件创建卡片
+                    self.update_status(f"已加载 {len(self.card_order)} 个插件")
                     QMessageBox.information(self, "成功", f"插件 '{plugin_name}' 添加成功！")
                 else:
                     QMessageBox.critical(self, "错误", "添加插件失败！")
@@ -320,7 +403,7 @@ class PluginPageWidget(QWidget):
                     # 先删除旧插件，再添加新插件
                     if self.plugin_manager.delete_plugin(plugin_name):
                         if self.plugin_manager.add_plugin(new_name, new_plugin_data):
-                            self.load_plugins()
+                            self.refresh_card(plugin_name, new_name)
                             QMessageBox.information(self, "成功", f"插件已更新为 '{new_name}'！")
                         else:
                             # 如果添加失败，尝试恢复原插件
@@ -331,7 +414,7 @@ class PluginPageWidget(QWidget):
                 else:
                     # 名称未改变，直接更新
                     if self.plugin_manager.update_plugin(plugin_name, new_plugin_data):
-                        self.load_plugins()
+                        self.refresh_card(plugin_name)
                         QMessageBox.information(self, "成功", f"插件 '{plugin_name}' 更新成功！")
                     else:
                         QMessageBox.critical(self, "错误", "更新插件失败！")
@@ -357,7 +440,9 @@ class PluginPageWidget(QWidget):
             
             if reply == QMessageBox.StandardButton.Yes:
                 if self.plugin_manager.delete_plugin(plugin_name):
-                    self.load_plugins()  # 重新加载显示
+                    self.remove_card(plugin_name)  # 只移除这一张卡片
+                    if self.card_order:
+                        self.update_status(f"已加载 {len(self.card_order)} 个插件")
                     QMessageBox.information(self, "成功", f"插件 '{plugin_name}' 已删除！")
                 else:
                     QMessageBox.critical(self, "错误", "删除插件失败！")
@@ -0,0 +1,336 @@
+'''
+插件进程池模块
+插件在常驻的子进程中执行，与AI工作线程和Qt界面隔离，
+每次调用都有超时和内存上限，并统计每个插件的耗时
+'''
+
+import asyncio
+import atexit
+import inspect
+import json
+import logging
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+from multiprocessing.reduction import ForkingPickler
+
+from plugins_manage import get_registry
+
+logger = logging.getLogger(__name__)
+
+# 默认配置，可在demo_setting.json中覆盖
+DEFAULT_POOL_SIZE = 2
+DEFAULT_TIMEOUT = 30          # 单次调用超时（秒）
+DEFAULT_MEMORY_LIMIT_MB = 512  # 单个工作进程的内存上限（MB）
+
+
+def _apply_memory_limit(memory_limit_mb):
+    """限制工作进程可用的内存（仅支持类Unix系统）"""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = int(memory_limit_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+async def _join_async_gen(agen):
+    parts = []
+    async for partial in agen:
+        parts.append(str(partial))
+    return "".join(parts)
+
+
+def resolve_result(result):
+    """
+    插件返回协程或异步生成器时（例如 register() 返回了内部定义的 async 函数），
+    在当前线程中运行到结束，异步生成器的部分结果拼接为完整结果
+    """
+    if inspect.iscoroutine(result):
+        return asyncio.run(result)
+    if inspect.isasyncgen(result):
+        return asyncio.run(_join_async_gen(result))
+    return result
+
+
+# 插件结果中允许原样传回主进程的类型，其余对象转为 repr
+# （插件自定义的类在主进程中无法还原，插件模块只在工作进程中导入）
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def to_plain(value):
+    """把插件结果转换为只包含内置类型的对象，保证主进程能反序列化"""
+    if type(value) in _PLAIN_TYPES:
+        return value
+    if type(value) in (list, tuple, set, frozenset):
+        return type(value)(to_plain(item) for item in value)
+    if type(value) is dict:
+        return {to_plain(key): to_plain(item) for key, item in value.items()}
+    return repr(value)
+
+
+def _worker_main(conn, plugin_dir, memory_limit_mb):
+    """工作进程主循环：接收调用请求，执行插件并返回结果"""
+    _apply_memory_limit(memory_limit_mb)
+    registry = get_registry(plugin_dir)
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        plugin_name, args, kwargs = request
+        try:
+            func = registry.get(plugin_name)
+            if func is None:
+                response = ("error", f"插件 {plugin_name} 未找到")
+            else:
+                response = ("ok", to_plain(resolve_result(func(*args, **kwargs))))
+        except MemoryError:
+            response = ("error", "插件超出内存上限")
+        except BaseException as e:
+            response = ("error", f"{type(e).__name__}: {e}")
+        try:
+            conn.send(response)
+        except (EOFError, OSError):
+            break
+
+
+class _Worker:
+    """单个常驻工作进程"""
+
+    def __init__(self, ctx, plugin_dir, memory_limit_mb):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, plugin_dir, memory_limit_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def kill(self):
+        try:
+            self.process.terminate()
+            self.process.join(1)
+        finally:
+            self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (EOFError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class PluginProcessPool:
+    """
+    插件进程池
+    调用结果统一返回 {"ok", "result", "error", "elapsed_ms"} 结构
+    """
+
+    def __init__(self, plugin_dir="plugins", size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+        self.plugin_dir = plugin_dir
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._workers = []
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self):
+        worker = _Worker(self._ctx, self.plugin_dir, self.memory_limit_mb)
+        self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker):
+        """结束异常的工作进程并补充一个新的"""
+        worker.kill()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if not self._closed:
+            self._spawn()
+
+    def record_call(self, plugin_name, elapsed_ms, ok, timed_out=False):
+        """记录一次插件调用的耗时和结果（在事件循环中直接执行的异步插件也通过此方法统计）"""
+        with self._stats_lock:
+            stat = self._stats.setdefault(plugin_name, {
+                "calls": 0, "errors": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0
+            })
+            stat["calls"] += 1
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+            if not ok:
+                stat["errors"] += 1
+            if timed_out:
+                stat["timeouts"] += 1
+
+    def _acquire(self, deadline):
+        """取出一个存活的空闲工作进程，超过 deadline 仍没有空闲进程时抛出 queue.Empty"""
+        while True:
+            worker = self._idle.get(timeout=max(0.0, deadline - time.perf_counter()))
+            if worker.is_alive():
+                return worker
+            self._replace(worker)
+
+    def call(self, plugin_name, args=(), kwargs=None, timeout=None):
+        """
+        在工作进程中调用插件
+        :param plugin_name: 插件名称
+        :param args: 位置参数
+        :param kwargs: 关键字参数
+        :param timeout: 超时时间（秒），默认使用进程池配置，等待空闲工作进程的时间也计算在内
+        :return: {"ok": bool, "result": 插件返回值, "error": 错误信息, "elapsed_ms": 耗时}
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+        timed_out = False
+        try:
+            worker = self._acquire(deadline)
+        except queue.Empty:
+            worker = None
+            timed_out = True
+            result = {"ok": False, "result": None, "error": f"等待空闲插件进程超时（{timeout}秒）"}
+
+        if worker is not None:
+            # 序列化和反序列化在管道读写之外进行：失败时管道中没有残留数据，工作进程可以继续使用；
+            # 管道读写出错或超时则无法确定工作进程的状态，直接替换。无论哪种情况工作进程都会归还或替换
+            try:
+                request = ForkingPickler.dumps((plugin_name, tuple(args), dict(kwargs or {})))
+            except Exception as e:
+                self._idle.put(worker)
+                result = {"ok": False, "result": None, "error": f"插件参数无法传递: {type(e).__name__}: {e}"}
+            else:
+                try:
+                    worker.conn.send_bytes(request)
+                    if worker.conn.poll(max(0.0, deadline - time.perf_counter())):
+                        response = worker.conn.recv_bytes()
+                    else:
+                        response = None
+                except BaseException as e:
+                    # 工作进程崩溃（例如超出内存上限被系统结束）
+                    self._replace(worker)
+                    if not isinstance(e, Exception):
+                        raise
+                    result = {"ok": False, "result": None, "error": f"插件进程异常: {type(e).__name__}: {e}"}
+                else:
+                    if response is None:
+                        timed_out = True
+                        self._replace(worker)
+                        result = {"ok": False, "result": None, "error": f"插件执行超时（{timeout}秒）"}
+                    else:
+                        self._idle.put(worker)
+                        try:
+                            status, payload = pickle.loads(response)
+                        except Exception as e:
+                            status, payload = "error", f"插件结果无法读取: {type(e).__name__}: {e}"
+                        ok = status == "ok"
+                        result = {"ok": ok, "result": payload if ok else None, "error": None if ok else payload}
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        result["elapsed_ms"] = elapsed_ms
+        self.record_call(plugin_name, elapsed_ms, result["ok"], timed_out)
+        if not result["ok"]:
+            logger.warning(f"插件 {plugin_name} 执行失败: {result['error']}")
+        return result
+
+    def get_stats(self):
+        """获取每个插件的调用统计（次数、错误、超时、平均/最大耗时）"""
+        with self._stats_lock:
+            stats = {}
+            for name, stat in self._stats.items():
+                stats[name] = dict(stat, avg_ms=stat["total_ms"] / stat["calls"])
+            return stats
+
+    def shutdown(self):
+        """关闭所有工作进程"""
+        self._closed = True
+        for worker in list(self._workers):
+            worker.close()
+        self._workers.clear()
+
+
+class InlinePluginRunner(PluginProcessPool):
+    """
+    在当前线程中直接执行插件（关闭插件隔离时使用）
+    返回结构和统计方式与进程池一致，但不启动工作进程，因此不调用父类的初始化。
+    同步插件在当前线程中执行，无法中断，call 的 timeout 参数会被忽略；
+    timeout 只用于在事件循环中直接执行的异步插件
+    """
+
+    def __init__(self, plugin_dir="plugins", timeout=DEFAULT_TIMEOUT):
+        self.plugin_dir = plugin_dir
+        self.timeout = timeout
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def call(self, plugin_name, args=(), kwargs=None, timeout=None):
+        """在当前线程中调用插件，timeout 参数只为与进程池保持一致，不起作用"""
+        start = time.perf_counter()
+        try:
+            func = get_registry(self.plugin_dir).get(plugin_name)
+            if func is None:
+                result = {"ok": False, "result": None, "error": f"插件 {plugin_name} 未找到"}
+            else:
+                result = {"ok": True, "result": resolve_result(func(*args, **(kwargs or {}))), "error": None}
+        except Exception as e:
+            result = {"ok": False, "result": None, "error": f"{type(e).__name__}: {e}"}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        result["elapsed_ms"] = elapsed_ms
+        self.record_call(plugin_name, elapsed_ms, result["ok"])
+        return result
+
+    def shutdown(self):
+        pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_plugin_pool(setting_path="demo_setting.json"):
+    """
+    获取全局插件执行器，首次调用时根据配置创建
+    配置项: plugin_isolation(是否使用子进程), plugin_pool_size, plugin_timeout, plugin_memory_limit_mb
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            try:
+                with open(setting_path, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                config = {}
+            if config.get("plugin_isolation", True):
+                _pool = PluginProcessPool(
+                    size=config.get("plugin_pool_size", DEFAULT_POOL_SIZE),
+                    timeout=config.get("plugin_timeout", DEFAULT_TIMEOUT),
+                    memory_limit_mb=config.get("plugin_memory_limit_mb", DEFAULT_MEMORY_LIMIT_MB)
+                )
+                atexit.register(_pool.shutdown)
+                logger.info(f"插件进程池已启动，工作进程数: {_pool.size}")
+            else:
+                _pool = InlinePluginRunner(timeout=config.get("plugin_timeout", DEFAULT_TIMEOUT))
+        return _pool
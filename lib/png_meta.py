@@ -0,0 +1,143 @@
+'''
+PNG 文本块模块
+把食物信息以 iTXt 文本块的形式写入 PNG 文件。读取时只扫描数据块的头部并跳过像素数据，
+不需要解码图片；写入在字节层面插入到 IEND 之前，不会改动像素（像素中的LSB信息保持不变）
+'''
+
+import os
+import struct
+import zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+FOOD_KEYWORD = b"FoodInfo"
+
+
+def _iter_chunks(f):
+    """依次返回 (数据块类型, 数据长度, 数据起始位置)，不读取数据内容"""
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        length, chunk_type = struct.unpack(">I4s", header)
+        offset = f.tell()
+        yield chunk_type, length, offset
+        if chunk_type == b"IEND":
+            return
+        f.seek(offset + length + 4)
+
+
+def _parse_itxt(data):
+    """解析 iTXt 数据块，返回 (关键字, 文本)"""
+    keyword, rest = data.split(b"\0", 1)
+    compressed, _method = rest[0], rest[1]
+    _language, rest = rest[2:].split(b"\0", 1)
+    _translated, text = rest.split(b"\0", 1)
+    if compressed:
+        text = zlib.decompress(text)
+    return keyword, text.decode("utf-8")
+
+
+def _build_itxt(keyword, text):
+    data = keyword + b"\0" + b"\0\0" + b"\0" + b"\0" + text.encode("utf-8")
+    body = b"iTXt" + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+
+def is_png(path):
+    with open(path, "rb") as f:
+        return f.read(8) == PNG_SIGNATURE
+
+
+def read_food_chunk(path):
+    """
+    读取 PNG 中的食物信息文本块
+    :return: 文本块中的字符串，没有文本块或不是PNG时返回None
+    """
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return None
+        for chunk_type, length, offset in _iter_chunks(f):
+            if chunk_type != b"iTXt" or length <= len(FOOD_KEYWORD):
+                continue
+            f.seek(offset)
+            data = f.read(length)
+            if not data.startswith(FOOD_KEYWORD + b"\0"):
+                continue
+            try:
+                return _parse_itxt(data)[1]
+            except (ValueError, IndexError, zlib.error, UnicodeDecodeError):
+                return None
+    return None
+
+
+def write_food_chunk(path, text):
+    """
+    把食物信息写入 PNG 文本块（替换已有的食物信息文本块）
+    先写临时文件再替换原文件，中途失败不会损坏图片
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    if not content.startswith(PNG_SIGNATURE):
+        raise ValueError("不是PNG图片")
+
+    parts = [PNG_SIGNATURE]
+    pos = len(PNG_SIGNATURE)
+    inserted = False
+    while pos + 8 <= len(content):
+        length, chunk_type = struct.unpack(">I4s", content[pos:pos + 8])
+        end = pos + 12 + length
+        chunk = content[pos:end]
+        if chunk_type == b"iTXt" and content[pos + 8:pos + 8 + length].startswith(FOOD_KEYWORD + b"\0"):
+            pos = end
+            continue
+        if chunk_type == b"IEND":
+            parts.append(_build_itxt(FOOD_KEYWORD, text))
+            inserted = True
+        parts.append(chunk)
+        pos = end
+        if chunk_type == b"IEND":
+            break
+    if not inserted:
+        raise ValueError("PNG缺少IEND数据块")
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(temp_path, path)
+
+
+def upgrade_folders(folders=("food", "outfood")):
+    """
+    为已有的食物图片补写文本块：从像素LSB中读出食物信息后原样写入文本块
+    :return: {"upgraded": 数量, "skipped": 已有文本块的数量, "failed": [文件名]}
+    """
+    from lib.food_manager import FoodVerification
+
+    report = {"upgraded": 0, "skipped": 0, "failed": []}
+    for folder in folders:
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if not name.lower().endswith(".png") or not os.path.isfile(path):
+                continue
+            if read_food_chunk(path) is not None:
+                report["skipped"] += 1
+                continue
+            try:
+                text = FoodVerification.lsb_reveal(path)
+                if not text:
+                    raise ValueError("未找到嵌入的食物信息")
+                write_food_chunk(path, text)
+                report["upgraded"] += 1
+            except Exception as e:
+                report["failed"].append(f"{path}: {e}")
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    result = upgrade_folders(sys.argv[1:] or ("food", "outfood"))
+    print(f"已升级: {result['upgraded']}，已有文本块: {result['skipped']}，失败: {len(result['failed'])}")
+    for item in result["failed"]:
+        print(f"  {item}")
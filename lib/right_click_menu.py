@@ -17,8 +17,8 @@ from PyQt6.QtGui import  QColor,  QPainter, QPixmap
 from PyQt6.QtCore import Qt, QPoint,  pyqtSignal, QTimer
 from PyQt6.QtWidgets import QGraphicsDropShadowEffect
 from PyQt6.QtGui import QPainterPath
-# from lib.food_manager import FoodVerification
-from stegano import lsb
+from lib.food_manager import FoodVerification
+from lib.thumbnail_cache import ThumbnailWorker
 import lib.LogManager as LogManager
 import logging
 
@@ -289,7 +289,8 @@ class RecipePopup(QWidget):
             layout.addWidget(label)
             return
         
-        # 按单列布局添加图片
+        # 按单列布局添加图片，先显示占位文字，缩略图由后台线程从缓存读取或生成
+        self.image_labels = {}
         row = 0
         for image_path in image_files:
             # 创建可点击的图片标签
@@ -303,40 +304,48 @@ class RecipePopup(QWidget):
                     border-radius: 8px;
                     background-color: #f9f9f9;
                     padding: 5px;
+                    color: #999;
+                    font-size: 12px;
                 }
             """)
-            
-            # 加载并缩放图片
-            pixmap = QPixmap(image_path)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(
-                    180, 150, 
-                    Qt.AspectRatioMode.KeepAspectRatio, 
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                image_label.setPixmap(scaled_pixmap)
-            else:
-                # 如果图片加载失败，显示错误信息
-                image_label.setText("图片加载失败")
-                image_label.setStyleSheet("""
-                    QLabel {
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        background-color: #f9f9f9;
-                        padding: 5px;
-                        color: #e53935;
-                        font-size: 12px;
-                    }
-                """)
+            image_label.setText("加载中...")
             
             # 连接点击事件
             image_label.clicked.connect(lambda path=image_path: self.show_image_detail(path))
             
             # 添加到布局
             layout.addWidget(image_label, row, 0)  # 单列布局，列索引始终为0
+            self.image_labels[image_path] = image_label
             
             # 更新行索引
             row += 1
+
+        self.thumbnail_worker = ThumbnailWorker(image_files, 180, 150, self)
+        self.thumbnail_worker.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.thumbnail_worker.thumbnail_failed.connect(self.on_thumbnail_failed)
+        self.thumbnail_worker.start()
+
+    def on_thumbnail_ready(self, image_path, image):
+        """缩略图就绪后替换占位文字"""
+        image_label = self.image_labels.get(image_path)
+        if image_label is not None:
+            image_label.setPixmap(QPixmap.fromImage(image))
+
+    def on_thumbnail_failed(self, image_path):
+        """图片无法读取时显示错误信息"""
+        image_label = self.image_labels.get(image_path)
+        if image_label is not None:
+            image_label.setText("图片加载失败")
+            image_label.setStyleSheet("""
+                QLabel {
+                    border: 1px solid #ddd;
+                    border-radius: 8px;
+                    background-color: #f9f9f9;
+                    padding: 5px;
+                    color: #e53935;
+                    font-size: 12px;
+                }
+            """)
     
     def show_image_detail(self, image_path):
         """显示图片详情窗口"""
@@ -402,10 +411,8 @@ class ImageDetailWindow(QWidget):
         # 图片名称
         image_name = os.path.basename(image_path)
         #加载食物
-        try:
-            data = lsb.reveal(f"./{image_path}")
-            data = json.loads(data)
-        except IndexError:
+        success, data = FoodVerification.extract_food_info(image_path)
+        if not success:
             data = {
                 "FoodName":"未知食物", #食物名称
                 "FoodDescription":"无描述", #食物描述
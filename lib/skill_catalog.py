@@ -0,0 +1,101 @@
+'''
+技能目录编译模块
+将 yyskills/SKILL.md 和 skill_list.json 编译成紧凑、稳定的提示词片段：
+只保留AI可以使用的技能，去掉冗长字段，并按文件哈希缓存编译结果
+'''
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+SKILL_MD_PATH = "yyskills/SKILL.md"
+SKILL_LIST_PATH = "yyskills/skill_list.json"
+
+# SKILL.md 中说明 skill_list.json 字段的章节，编译后改用紧凑格式，不再需要
+MORE_SKILLS_HEADING = re.compile(r'^#+\s*\d*\.?\s*更多技能列表')
+CJK_PATTERN = re.compile(r'[　-〿㐀-鿿＀-￯]')
+
+_lock = threading.Lock()
+_stat_key = None     # (SKILL.md状态, skill_list.json状态)，文件未变化时连哈希都不用算
+_content_hash = None
+_compiled = None
+
+
+def estimate_tokens(text):
+    """粗略估算文本的token数：中文约每字1个token，其余约每4个字符1个token"""
+    cjk = len(CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def _compact_markdown(text):
+    """去掉markdown修饰和空行，并去掉字段说明章节"""
+    lines = []
+    for line in text.splitlines():
+        if MORE_SKILLS_HEADING.match(line.strip()):
+            break
+        line = line.replace("**", "").replace("`", "").rstrip()
+        if not line.strip():
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _compact_skill_list(skills):
+    """只保留AI可以使用的技能，每个技能一行：名称|描述|格式"""
+    lines = ["更多技能(名称|描述|格式):"]
+    for name in sorted(skills):
+        skill = skills[name]
+        if not skill.get("AI_can_use", False):
+            continue
+        line = f"{name}|{skill.get('discription', '')}|{skill.get('format', '')}"
+        if skill.get("detailed_info"):
+            line += "|可调用获取详细说明"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _file_state(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def compile_skill_catalog(skill_md_path=SKILL_MD_PATH, skill_list_path=SKILL_LIST_PATH):
+    """
+    获取编译后的技能目录提示词片段
+    :return: 提示词片段字符串
+    """
+    global _stat_key, _content_hash, _compiled
+    with _lock:
+        stat_key = (_file_state(skill_md_path), _file_state(skill_list_path))
+        if stat_key == _stat_key and _compiled is not None:
+            return _compiled
+
+        with open(skill_md_path, "rb") as f:
+            md_bytes = f.read()
+        with open(skill_list_path, "rb") as f:
+            list_bytes = f.read()
+        content_hash = hashlib.sha1(md_bytes + b"\0" + list_bytes).hexdigest()
+        _stat_key = stat_key
+        if content_hash == _content_hash and _compiled is not None:
+            return _compiled
+
+        md_text = md_bytes.decode("utf-8")
+        skills = json.loads(list_bytes.decode("utf-8"))
+        compiled = f"{_compact_markdown(md_text)}\n{_compact_skill_list(skills)}"
+
+        # 与原来直接拼接 SKILL.md 和 json.dumps(skill_list) 的方式对比
+        raw_tokens = estimate_tokens(f"{md_text}\n{skills}")
+        compiled_tokens = estimate_tokens(compiled)
+        logger.info(
+            f"技能目录已编译: 约{compiled_tokens} tokens，"
+            f"比原始内容节省约{raw_tokens - compiled_tokens} tokens"
+        )
+
+        _content_hash = content_hash
+        _compiled = compiled
+        return compiled
@@ -0,0 +1,241 @@
+'''
+角色图集模块
+离线把一个角色文件夹中的所有GIF打包成一个图集：一张按显示尺寸预先缩放好的原始帧表
+（ARGB32 预乘格式，逐帧连续存放）和一个 JSON 索引（动作、帧延时、锚点、源文件信息），
+保存在 cache/atlas/<角色>/ 中。程序运行时用内存映射打开帧表，读取某个动作只需按偏移量复制对应的帧，
+不再解码GIF；图集只是缓存，源GIF被修改或删除后索引中的信息对不上，自动回退到直接解码GIF。
+重新打包时帧表写入新的文件名，不覆盖正在被映射的旧帧表（Windows 上无法替换已映射的文件）
+
+取舍：帧表是未压缩的像素数据（每帧 宽*高*4 字节），比GIF大得多，例如 80x80 下
+gif/蜡笔小新组 约 15 MB，而GIF只有约 226 KB。换来的是读取时不需要解码和缩放；
+帧表通过内存映射读取，只有用到的动作所在的页面会被读入内存（并且可以被系统回收），
+每帧只复制一次到 QImage。磁盘空间紧张时可以不打包，程序会直接解码GIF（或 gif_optimizer 的副本）
+
+打包: python -m lib.sprite_atlas gif/猫 [gif/蜡笔小新组 ...] [--size 80] [--scale 1]
+'''
+
+import json
+import logging
+import mmap
+import os
+import time
+
+from PyQt6 import sip
+from PyQt6.QtGui import QImage
+
+from lib.gif_optimizer import character_cache_dir
+
+logger = logging.getLogger(__name__)
+
+ATLAS_DIR = "cache/atlas"
+ATLAS_VERSION = 2
+ATLAS_FORMAT = "ARGB32_Premultiplied"
+DEFAULT_FRAME_SIZE = 80  # 与宠物窗口中 QLabel 的尺寸一致
+
+
+def atlas_index_path(gif_folder, width, height):
+    """图集索引的路径，按角色文件夹和像素尺寸区分；帧表的文件名记录在索引中"""
+    return os.path.join(character_cache_dir(ATLAS_DIR, gif_folder), f"atlas_{width}x{height}.json")
+
+
+def _remove_old_sheets(folder, prefix, keep):
+    """删除旧的帧表，仍被映射的文件（Windows）删除失败时留到下次打包再删"""
+    for name in os.listdir(folder):
+        if name.startswith(prefix) and name.endswith(".rgba") and name != keep:
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+
+
+def _anchor(image):
+    """
+    计算帧中不透明区域的底部中点，作为动作之间对齐的锚点
+    :return: [x, y]，整帧透明时返回帧底部中点
+    """
+    import numpy as np
+
+    width, height = image.width(), image.height()
+    alpha = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), dtype=np.uint8)
+    alpha = alpha.reshape(height, image.bytesPerLine())[:, 3:width * 4:4]  # 小端序 BGRA 中的 A
+    rows = np.flatnonzero(alpha.any(axis=1))
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if not len(rows):
+        return [width // 2, height]
+    return [int(cols[0] + cols[-1] + 1) // 2, int(rows[-1]) + 1]
+
+
+def pack_folder(gif_folder, width=DEFAULT_FRAME_SIZE, height=DEFAULT_FRAME_SIZE):
+    """
+    把角色文件夹打包为图集
+    :return: {"animations": 动作数量, "frames": 帧数量, "gif_bytes": GIF总大小, "atlas_bytes": 帧表大小, "failed": [文件名]}
+    """
+    from PyQt6.QtCore import QSize
+    from lib.gif_optimizer import preferred_gif
+    from lib.gif_player import decode_gif
+
+    index_path = atlas_index_path(gif_folder, width, height)
+    atlas_folder = os.path.dirname(index_path)
+    os.makedirs(atlas_folder, exist_ok=True)
+    prefix = f"atlas_{width}x{height}_"
+    sheet_name = f"{prefix}{time.time_ns()}.rgba"
+    frame_bytes = width * height * 4
+    index = {
+        "version": ATLAS_VERSION,
+        "format": ATLAS_FORMAT,
+        "frame_size": [width, height],
+        "frame_bytes": frame_bytes,
+        "sheet": sheet_name,
+        "animations": {},
+    }
+    report = {"animations": 0, "frames": 0, "gif_bytes": 0, "atlas_bytes": 0, "failed": []}
+
+    names = sorted(name for name in os.listdir(gif_folder) if name.lower().endswith(".gif"))
+    first = 0
+    with open(os.path.join(atlas_folder, sheet_name), "wb") as sheet:
+        for name in names:
+            gif_path = os.path.join(gif_folder, name)
+            st = os.stat(gif_path)
+            images, delays = decode_gif(preferred_gif(gif_path, width, height), QSize(width, height))
+            if not images:
+                report["failed"].append(name)
+                continue
+            anchors = []
+            for image in images:
+                # 按行写入，去掉可能存在的行尾对齐字节
+                bits = image.constBits().asstring(image.sizeInBytes())
+                stride = image.bytesPerLine()
+                for y in range(height):
+                    sheet.write(bits[y * stride:y * stride + width * 4])
+                anchors.append(_anchor(image))
+            # 以各帧锚点的中位数作为动作的锚点，避免个别帧的特效拉偏
+            xs = sorted(a[0] for a in anchors)
+            ys = sorted(a[1] for a in anchors)
+            index["animations"][name] = {
+                "first": first,
+                "count": len(images),
+                "durations": delays,
+                "anchor": [xs[len(xs) // 2], ys[len(ys) // 2]],
+                "source_size": st.st_size,
+                "source_mtime_ns": st.st_mtime_ns,
+            }
+            first += len(images)
+            report["animations"] += 1
+            report["gif_bytes"] += st.st_size
+    # 索引读取后即关闭，可以原子替换；替换后新打开的图集使用新的帧表
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, index_path)
+    _remove_old_sheets(atlas_folder, prefix, sheet_name)
+
+    report["frames"] = first
+    report["atlas_bytes"] = first * frame_bytes
+    _atlases.pop((os.path.abspath(gif_folder), width, height), None)
+    return report
+
+
+class SpriteAtlas:
+    """内存映射打开的角色图集"""
+
+    def __init__(self, sheet_path, index):
+        self.sheet_path = sheet_path
+        self.width, self.height = index["frame_size"]
+        self.frame_bytes = index["frame_bytes"]
+        self.animations = index["animations"]
+        with open(sheet_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def names(self):
+        return list(self.animations)
+
+    def has(self, name):
+        return name in self.animations
+
+    def anchor(self, name):
+        entry = self.animations.get(name)
+        return tuple(entry["anchor"]) if entry else None
+
+    def frames(self, gif_path):
+        """
+        读取某个GIF对应的帧
+        :return: ([QImage], [延时])，图集中没有该GIF或源GIF已被修改、删除时返回None
+        """
+        entry = self.animations.get(os.path.basename(gif_path))
+        if entry is None:
+            return None
+        try:
+            st = os.stat(gif_path)
+        except OSError:
+            return None
+        if st.st_size != entry["source_size"] or st.st_mtime_ns != entry["source_mtime_ns"]:
+            return None
+        images = []
+        offset = entry["first"] * self.frame_bytes
+        with memoryview(self._map) as view:
+            for _ in range(entry["count"]):
+                with view[offset:offset + self.frame_bytes] as frame:
+                    # 直接在映射的内存上构造图像，只复制一次，之后不再引用内存映射
+                    image = QImage(sip.voidptr(frame), self.width, self.height, self.width * 4,
+                                   QImage.Format.Format_ARGB32_Premultiplied)
+                    images.append(image.copy())
+                    del image
+                offset += self.frame_bytes
+        return images, list(entry["durations"])
+
+
+_atlases = {}  # {(角色文件夹, 宽, 高): (索引修改时间, SpriteAtlas 或 None)}
+
+
+def get_atlas(gif_folder, width, height):
+    """
+    获取角色文件夹在某个像素尺寸下的图集，索引文件变化后重新打开
+    :return: SpriteAtlas，没有可用的图集时返回None
+    """
+    key = (os.path.abspath(gif_folder), width, height)
+    index_path = atlas_index_path(gif_folder, width, height)
+    try:
+        index_mtime = os.stat(index_path).st_mtime_ns
+    except OSError:
+        _atlases.pop(key, None)
+        return None
+    cached = _atlases.get(key)
+    if cached is not None and cached[0] == index_mtime:
+        return cached[1]
+
+    atlas = None
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if (index.get("version") == ATLAS_VERSION and index.get("format") == ATLAS_FORMAT
+                and index.get("frame_size") == [width, height]):
+            sheet_path = os.path.join(os.path.dirname(index_path), index["sheet"])
+            atlas = SpriteAtlas(sheet_path, index)
+            total = sum(entry["count"] for entry in atlas.animations.values())
+            if len(atlas._map) < total * atlas.frame_bytes:
+                logger.warning(f"图集帧表不完整，忽略: {sheet_path}")
+                atlas = None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"打开图集失败({index_path}): {e}")
+        atlas = None
+    _atlases[key] = (index_mtime, atlas)
+    return atlas
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="把角色GIF文件夹打包为图集")
+    parser.add_argument("folders", nargs="+", help="角色文件夹，例如 gif/猫")
+    parser.add_argument("--size", type=int, default=DEFAULT_FRAME_SIZE, help="显示尺寸（逻辑像素）")
+    parser.add_argument("--scale", type=float, default=1.0, help="屏幕缩放比例，高分屏可以再打包一份 2 倍的图集")
+    args = parser.parse_args()
+
+    pixels = round(args.size * args.scale)
+    for folder in args.folders:
+        result = pack_folder(folder, pixels, pixels)
+        print(f"{folder}: {result['animations']} 个动作，{result['frames']} 帧，"
+              f"GIF {result['gif_bytes'] / 1024:.0f} KB -> 帧表 {result['atlas_bytes'] / 1024:.0f} KB "
+              f"({pixels}x{pixels})")
+        for name in result["failed"]:
+            print(f"  无法解码: {name}")
@@ -0,0 +1,56 @@
+'''
+样式表注册模块
+同样的样式表只生成一次：生成样式表的函数按参数缓存结果，.qss 文件按修改时间缓存内容；
+设置样式表时内容没有变化就跳过，避免 Qt 重新解析和刷新控件
+'''
+
+import functools
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# 每个样式生成函数最多缓存的参数组合数量
+STYLE_CACHE_SIZE = 64
+
+_qss_files = {}  # {路径: (修改时间, 内容)}
+
+
+def cached_style(builder):
+    """装饰样式生成函数，同样的参数只生成一次样式表（参数必须可哈希）"""
+    return functools.lru_cache(maxsize=STYLE_CACHE_SIZE)(builder)
+
+
+def load_qss(path):
+    """
+    读取 .qss 文件，文件没有变化时直接返回缓存的内容
+    :return: 样式表内容，文件不存在或读取失败时返回空字符串
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        _qss_files.pop(path, None)
+        return ""
+    cached = _qss_files.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"读取样式表失败({path}): {e}")
+        return ""
+    _qss_files[path] = (mtime, content)
+    return content
+
+
+def apply_style_sheet(widget, style):
+    """
+    设置控件的样式表，内容与当前相同时跳过（setStyleSheet 每次都会重新解析并刷新所有子控件）
+    :return: 是否实际设置了样式表
+    """
+    if widget.styleSheet() == style:
+        return False
+    widget.setStyleSheet(style)
+    return True
+
@@ -1,7 +1,39 @@
+'''
+临时消息模块
+消息由 ToastManager 统一显示：复用少量消息框，同时最多显示 MAX_VISIBLE 条（在父窗口附近从上往下排列），
+其余排队；相同的消息合并为一条并显示次数；所有消息框的计时和淡出由同一个定时器驱动
+'''
+
+import time
+from collections import deque
+
+from PyQt6 import sip
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QApplication
-from PyQt6.QtCore import QTimer, QPropertyAnimation, QAbstractAnimation
+from PyQt6.QtCore import QObject, QTimer, QPropertyAnimation
 from PyQt6.QtCore import Qt
 
+# 同时显示的消息数量，也是消息框池的大小
+MAX_VISIBLE = 3
+# 最多排队的消息数量，超出时丢弃最早的消息
+MAX_QUEUED = 20
+# 消息框之间的间距（像素）
+TOAST_SPACING = 6
+# 淡出动画的刷新间隔（毫秒）
+ANIMATION_INTERVAL = 30
+# 有消息在排队时，每条消息最多显示的时间（毫秒），让排队的消息尽快显示
+BUSY_DURATION = 1000
+
+MESSAGE_STYLE = """
+            QLabel {
+                background-color: rgb(70, 70, 70);
+                color: white;
+                border-radius: 6px;
+                padding: 8px;
+                font-size: 13px;
+                font-weight: bold;
+            }
+        """
+
 
 class TempMessageBox(QWidget):
     """
@@ -20,16 +52,7 @@ class TempMessageBox(QWidget):
         # 创建主标签
         self.label = QLabel(message)
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.label.setStyleSheet("""
-            QLabel {
-                background-color: rgb(70, 70, 70);
-                color: white;
-                border-radius: 6px;
-                padding: 8px;
-                font-size: 13px;
-                font-weight: bold;
-            }
-        """)
+        self.label.setStyleSheet(MESSAGE_STYLE)
         
         # 创建布局
         layout = QVBoxLayout()
@@ -74,25 +97,179 @@ class TempMessageBox(QWidget):
         self.activateWindow()
 
 
+class Toast(QWidget):
+    """
+    可复用的消息框，不带自己的定时器和动画，由 ToastManager 驱动
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint)
+        self.label = QLabel()
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.label.setStyleSheet(MESSAGE_STYLE)
+        layout = QVBoxLayout()
+        layout.addWidget(self.label)
+        layout.setContentsMargins(2, 2, 2, 2)  # 小的边距
+        self.setLayout(layout)
+
+        self.message = ""
+        self.count = 0
+        self.duration = 0        # 消息显示时长（毫秒）
+        self.fade_duration = 0   # 淡出时长（毫秒）
+        self.elapsed = 0         # 已经显示的时间（毫秒），超过 duration 后开始淡出
+
+    def set_message(self, message, count, duration, fade_duration):
+        self.message = message
+        self.count = count
+        self.duration = duration
+        self.fade_duration = fade_duration
+        self.elapsed = 0
+        self.label.setText(message if count <= 1 else f"{message} ×{count}")
+        self.setWindowOpacity(1.0)
+        self.adjustSize()
+
+
+class ToastManager(QObject):
+    """
+    临时消息管理器，使用 ToastManager.instance() 获取全局实例
+    """
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = []          # 空闲的消息框
+        self._active = []        # 正在显示的消息框，按显示顺序
+        self._queue = deque()    # 排队的消息 [父窗口, 消息, 次数, 显示时长, 淡出时长]
+        self._last_tick = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(ANIMATION_INTERVAL)
+        self._timer.timeout.connect(self._tick)
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = ToastManager(QApplication.instance())
+        return cls._instance
+
+    def show_message(self, parent, message, duration=1500, fade_duration=1000):
+        """
+        显示消息；与正在显示或排队的消息相同时合并计数
+        :return: 显示该消息的消息框，排队中时返回None
+        """
+        self._purge()
+        for toast in self._active:
+            if toast.message == message and toast.parentWidget() is parent:
+                # 重新开始计时，正在淡出的也恢复为不透明
+                toast.set_message(message, toast.count + 1, max(toast.duration, duration), fade_duration)
+                self._layout(parent)
+                return toast
+        for entry in self._queue:
+            if entry[1] == message and entry[0] is parent:
+                entry[2] += 1
+                entry[3] = max(entry[3], duration)
+                return None
+
+        if len(self._active) >= MAX_VISIBLE:
+            if len(self._queue) >= MAX_QUEUED:
+                self._queue.popleft()
+            self._queue.append([parent, message, 1, duration, fade_duration])
+            return None
+        return self._show(parent, message, 1, duration, fade_duration)
+
+    def clear(self):
+        """隐藏所有消息并清空队列"""
+        self._queue.clear()
+        for toast in list(self._active):
+            self._release(toast)
+        self._timer.stop()
+
+    def _purge(self):
+        """丢弃随父窗口一起销毁的消息框，以及父窗口已销毁的排队消息"""
+        self._active = [toast for toast in self._active if not sip.isdeleted(toast)]
+        self._pool = [toast for toast in self._pool if not sip.isdeleted(toast)]
+        self._queue = deque(
+            entry for entry in self._queue if entry[0] is None or not sip.isdeleted(entry[0])
+        )
+
+    def _acquire(self, parent):
+        if self._pool:
+            toast = self._pool.pop()
+            if toast.parentWidget() is not parent:
+                toast.setParent(parent, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint)
+            return toast
+        return Toast(parent)
+
+    def _show(self, parent, message, count, duration, fade_duration):
+        toast = self._acquire(parent)
+        toast.set_message(message, count, duration, fade_duration)
+        self._active.append(toast)
+        self._layout(parent)
+        toast.show()
+        # 确保消息框在最前面
+        toast.raise_()
+        if not self._timer.isActive():
+            self._last_tick = time.monotonic()
+            self._timer.start()
+        return toast
+
+    def _release(self, toast):
+        self._active.remove(toast)
+        toast.hide()
+        if len(self._pool) < MAX_VISIBLE:
+            self._pool.append(toast)
+        else:
+            toast.deleteLater()
+
+    def _layout(self, parent):
+        """同一个父窗口的消息从上往下排列，第一条的位置与原来单条消息的位置相同"""
+        self._purge()
+        toasts = [toast for toast in self._active if toast.parentWidget() is parent]
+        if not toasts:
+            return
+        if parent is not None:
+            parent_geo = parent.geometry()
+            y = parent_geo.y() + (parent_geo.height() - toasts[0].height()) // 3
+        else:
+            # 如果没有父窗口，居中显示
+            parent_geo = QApplication.primaryScreen().availableGeometry()
+            y = parent_geo.center().y() - toasts[0].height() // 2
+        for toast in toasts:
+            toast.move(parent_geo.x() + (parent_geo.width() - toast.width()) // 2, y)
+            y += toast.height() + TOAST_SPACING
+
+    def _tick(self):
+        now = time.monotonic()
+        delta = round((now - self._last_tick) * 1000)
+        self._last_tick = now
+        self._purge()
+        busy = bool(self._queue)
+        finished = []
+        for toast in self._active:
+            toast.elapsed += delta
+            duration = min(toast.duration, BUSY_DURATION) if busy else toast.duration
+            fading = toast.elapsed - duration
+            if fading >= toast.fade_duration:
+                finished.append(toast)
+            elif fading > 0:
+                toast.setWindowOpacity(1.0 - fading / toast.fade_duration)
+
+        parents = set()
+        for toast in finished:
+            parents.add(toast.parentWidget())
+            self._release(toast)
+        while self._queue and len(self._active) < MAX_VISIBLE:
+            self._show(*self._queue.popleft())
+        for parent in parents:
+            self._layout(parent)
+        if not self._active:
+            self._timer.stop()
+
+
 def show_temp_message(parent, message, duration=1500, fade_duration=1000):
     """
-    在父窗口附近显示临时消息
+    在父窗口附近显示临时消息（由 ToastManager 排队、合并相同的消息）
     duration: 消失时间
     fade_duration: 淡出时间
     parent: 父窗口
+    :return: 显示该消息的消息框，排队中时返回None
     """
-    msg_box = TempMessageBox(message, duration, fade_duration, parent)
-    
-    # 计算显示位置 - 显示在父窗口中心偏上的位置
-    if parent:
-        parent_geo = parent.geometry()
-        msg_x = parent_geo.x() + (parent_geo.width() - msg_box.width()) // 2
-        msg_y = parent_geo.y() + (parent_geo.height() - msg_box.height()) // 3
-    else:
-        # 如果没有父窗口，居中显示
-        screen = QApplication.primaryScreen().availableGeometry()
-        msg_x = screen.center().x() - msg_box.width() // 2
-        msg_y = screen.center().y() - msg_box.height() // 2
-    
-    msg_box.show_at(msg_x, msg_y)
-    return msg_box
\ No newline at end of file
+    return ToastManager.instance().show_message(parent, message, duration, fade_duration)
@@ -2,10 +2,11 @@
 主题管理器 - 负责界面美化和动画效果
 """
 
-import os
 from PyQt6.QtWidgets import QApplication, QWidget, QPushButton
 from PyQt6.QtCore import QEasingCurve, QPropertyAnimation, pyqtProperty, QObject, QEvent
 
+from lib.style_registry import apply_style_sheet, cached_style, load_qss
+
 class ThemeManager:
     """主题管理器类"""
     
@@ -17,23 +18,17 @@ class ThemeManager:
     
     @staticmethod
     def load_theme(theme_name='green'):
-        """加载指定主题"""
+        """加载指定主题，主题文件没有修改时使用缓存的内容"""
         theme_path = ThemeManager.THEMES.get(theme_name, ThemeManager.THEMES['green'])
-        if os.path.exists(theme_path):
-            try:
-                with open(theme_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            except Exception as e:
-                print(f"加载主题文件失败: {e}")
-                return ""
-        return ""
+        return load_qss(theme_path)
     
     @staticmethod
     def apply_theme(widget, theme_name='green'):
         """应用主题到指定控件"""
         stylesheet = ThemeManager.load_theme(theme_name)
         if stylesheet:
-            widget.setStyleSheet(stylesheet)
+            # 已经是同一份主题时不再重新解析
+            apply_style_sheet(widget, stylesheet)
             return True
         return False
 
@@ -188,8 +183,9 @@ class StyleHelper:
     """样式助手类"""
     
     @staticmethod
+    @cached_style
     def create_card_style(title, background_gradient=None):
-        """创建卡片样式"""
+        """创建卡片样式（同样的参数只生成一次）"""
         if background_gradient is None:
             background_gradient = "qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #F8FFF8, stop:1 #E8F5E8)"
         
@@ -214,8 +210,9 @@ class StyleHelper:
         """
     
     @staticmethod
+    @cached_style
     def create_button_style(color_primary, color_hover, color_pressed):
-        """创建按钮样式"""
+        """创建按钮样式（同样的参数只生成一次）"""
         return f"""
         QPushButton {{
             background-color: {color_primary};
@@ -0,0 +1,150 @@
+'''
+缩略图缓存模块
+食物图片的缩略图缓存在 cache/thumbnails 中，按 (路径, 修改时间, 文件大小, 目标尺寸) 命名，
+原图变化后自动生成新的缩略图。缩略图在后台线程中生成（使用线程安全的 QImage），
+界面先显示占位图，缩略图就绪后再替换
+'''
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal
+from PyQt6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = "cache/thumbnails"
+# 内存中最多保留的缩略图数量，超出后丢弃最久未使用的
+MEMORY_CACHE_SIZE = 256
+
+_memory_cache = OrderedDict()  # {缓存键: QImage}，同一次运行中重复打开时直接使用
+_memory_lock = threading.Lock()
+
+
+def thumbnail_key(image_path, width, height):
+    """根据路径、修改时间、文件大小和目标尺寸生成缓存键，原图不存在时返回None"""
+    try:
+        st = os.stat(image_path)
+    except OSError:
+        return None
+    raw = f"{os.path.abspath(image_path)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def load_thumbnail(image_path, width, height):
+    """
+    获取缩略图，依次查找内存缓存、磁盘缓存，都没有时缩放原图并写入磁盘缓存
+    可以在后台线程中调用
+    :return: QImage，原图无法读取时返回None
+    """
+    key = thumbnail_key(image_path, width, height)
+    if key is None:
+        return None
+    with _memory_lock:
+        image = _memory_cache.get(key)
+        if image is not None:
+            _memory_cache.move_to_end(key)
+            return image
+
+    cache_path = os.path.join(THUMBNAIL_DIR, f"{key}.png")
+    image = QImage(cache_path) if os.path.exists(cache_path) else QImage()
+    if image.isNull():
+        source = QImage(image_path)
+        if source.isNull():
+            return None
+        image = source.scaled(
+            width, height,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        try:
+            os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+            image.save(cache_path, "PNG")
+        except OSError as e:
+            logger.warning(f"保存缩略图缓存失败: {e}")
+
+    with _memory_lock:
+        _memory_cache[key] = image
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return image
+
+
+class ThumbnailWorker(QThread):
+    """在后台线程中依次准备缩略图"""
+    thumbnail_ready = pyqtSignal(str, QImage)  # (原图路径, 缩略图)
+    thumbnail_failed = pyqtSignal(str)  # 原图路径
+
+    def __init__(self, image_paths, width, height, parent=None):
+        super().__init__(parent)
+        self.image_paths = list(image_paths)
+        self.width = width
+        self.height = height
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        for image_path in self.image_paths:
+            if self._cancelled:
+                return
+            image = load_thumbnail(image_path, self.width, self.height)
+            if image is None:
+                self.thumbnail_failed.emit(image_path)
+            else:
+                self.thumbnail_ready.emit(image_path, image)
+
+
+class ThumbnailProvider(QObject):
+    """
+    按需提供缩略图：视图只为可见的条目请求缩略图，请求在一个后台线程中排队处理，
+    后请求的先处理，快速滚动时优先生成当前可见的条目
+    """
+    thumbnail_ready = pyqtSignal(str, QImage)  # (原图路径, 缩略图)
+    thumbnail_failed = pyqtSignal(str)  # 原图路径
+
+    def __init__(self, width, height, parent=None):
+        super().__init__(parent)
+        self.width = width
+        self.height = height
+        self._queue = queue.LifoQueue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="ThumbnailProvider", daemon=True)
+        self._thread.start()
+
+    def request(self, image_path):
+        """请求一张缩略图，重复请求会被忽略"""
+        with self._lock:
+            if image_path in self._pending:
+                return
+            self._pending.add(image_path)
+        self._queue.put(image_path)
+
+    def stop(self, timeout=None):
+        """结束后台线程，timeout 不为 None 时最多等待这么久（秒）"""
+        self._queue.put(None)
+        if timeout is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            image_path = self._queue.get()
+            if image_path is None:
+                return
+            try:
+                image = load_thumbnail(image_path, self.width, self.height)
+            except Exception as e:
+                logger.warning(f"生成缩略图失败({image_path}): {e}")
+                image = None
+            with self._lock:
+                self._pending.discard(image_path)
+            if image is None:
+                self.thumbnail_failed.emit(image_path)
+            else:
+                self.thumbnail_ready.emit(image_path, image)
@@ -1,22 +1,42 @@
+import asyncio
+import inspect
+import json
 import logging
-import lib.LogManager as LogManager
-from plugins_manage import PluginManager
+import os
+import threading
+import time
+from lib.plugin_pool import get_plugin_pool
+from plugins_manage import get_registry
+
+SKILL_LIST_PATH = "yyskills/skill_list.json"
+
+_skills_lock = threading.Lock()
+_skills_cache = {"mtime": None, "skills": {}}
+
+
+def load_skill_list(path=SKILL_LIST_PATH):
+    """读取技能列表，文件未修改时直接返回内存中的结果"""
+    mtime = os.stat(path).st_mtime
+    with _skills_lock:
+        if _skills_cache["mtime"] != mtime:
+            with open(path, 'r', encoding='utf-8') as f:
+                _skills_cache["skills"] = json.load(f)
+            _skills_cache["mtime"] = mtime
+        return _skills_cache["skills"]
+
 
 class UESkills:
     def __init__(self, skill_info):
-        LogManager.init_logging()
         self.logger = logging.getLogger(__name__)
         self.skill_info = skill_info
         self.skill_parameter_ls = None
         self.skills_ls = self.load_skills()
 
     def load_skills(self):
-        import json
-        with open("yyskills/skill_list.json", 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_skill_list()
 
-    
-    def analyze_skill(self):
+
+    def _parse_skill(self):
         skill_ls = self.skill_info.split(":")
         self.skill_name  = skill_ls[0] #技能名
         self.skill_parameter = skill_ls[1] #技能参数（如果有的话）
@@ -25,33 +45,84 @@ class UESkills:
         if "," in self.skill_parameter:
             self.skill_parameter_ls = self.skill_parameter.split(",")
 
+    def _plugin_args(self):
+        #处理不需要传入参数的情况
+        if self.skill_name == self.skill_parameter and self.skill_parameter_ls is None:
+            self.logger.debug(f"技能 {self.skill_name} 需要调用外部插件")
+            return []
+        #处理需要传入参数的情况
+        self.logger.debug(f"有参数的技能{self.skill_name}执行")
+        return self.skill_parameter_ls or [self.skill_parameter]
+
+    async def analyze_skill_async(self, on_partial=None):
+        """
+        异步执行技能
+        清单标记为异步的插件在后台线程中导入，导入后确认是协程函数或异步生成器函数时直接在当前事件循环中执行，
+        异步生成器产生的部分结果会实时传给 on_partial；其余插件仍交给插件进程池执行
+        （进程池中的插件返回协程时会在工作进程中运行到结束）
+        :param on_partial: 可选回调，接收流式输出的部分结果
+        """
+        self._parse_skill()
+        if not self.skills_ls[self.skill_name]["have_plugin"]:
+            return await asyncio.to_thread(self.analyze_skill)
+
+        registry = get_registry()
+        info = await asyncio.to_thread(registry.get_info, self.skill_name)
+        if not info or not info.get("async"):
+            return await asyncio.to_thread(self.analyze_skill)
+
+        # 导入插件和同步清单会读写文件，不在事件循环中执行
+        func = await asyncio.to_thread(registry.get, self.skill_name)
+        if not (inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)):
+            return await asyncio.to_thread(self.analyze_skill)
+        pool = get_plugin_pool()
+        args = self._plugin_args()
+        start = time.perf_counter()
+        ok, timed_out = True, False
+        try:
+            if inspect.isasyncgenfunction(func):
+                async def consume():
+                    parts = []
+                    async for partial in func(*args):
+                        parts.append(str(partial))
+                        if on_partial:
+                            on_partial(str(partial))
+                    return "".join(parts)
+                result = await asyncio.wait_for(consume(), pool.timeout)
+            else:
+                result = await asyncio.wait_for(func(*args), pool.timeout)
+        except asyncio.TimeoutError:
+            ok, timed_out = False, True
+            result = f"插件 {self.skill_name} 执行失败: 插件执行超时（{pool.timeout}秒）"
+        except Exception as e:
+            ok = False
+            result = f"插件 {self.skill_name} 执行失败: {type(e).__name__}: {e}"
+        pool.record_call(self.skill_name, (time.perf_counter() - start) * 1000, ok, timed_out)
+        return result
+
+    def analyze_skill(self):
+        self._parse_skill()
 
         #用于处理有外部插件的情况
         if self.skills_ls[self.skill_name]["have_plugin"]:
-            #处理不需要传入参数的情况
-            if self.skill_name == self.skill_parameter and self.skill_parameter_ls is None:
-                self.logger.debug(f"技能 {self.skill_name} 需要调用外部插件")
-                plugins = PluginManager.load_plugins()
-                plugin_result = PluginManager.call_plugin(plugins, self.skill_name)
-                return plugin_result
-            
-            #处理需要传入参数的情况
-            self.logger.debug(f"有参数的技能{self.skill_name}执行")
-            plugins = PluginManager.load_plugins()
-            plugin_result = PluginManager.call_plugin(plugins, self.skill_name, *self.skill_parameter_ls)
-            return plugin_result
-        
+            args = self._plugin_args()
+            plugin_result = get_plugin_pool().call(self.skill_name, args)
+            self.logger.debug(f"插件 {self.skill_name} 耗时 {plugin_result['elapsed_ms']:.1f}ms")
+            if plugin_result["ok"]:
+                return plugin_result["result"]
+            return f"插件 {self.skill_name} 执行失败: {plugin_result['error']}"
+
         if self.skills_ls[self.skill_name]["detailed_info"]:
             with open(f"yyskills/{self.skill_name}.md", "r", encoding='utf-8') as f:
                 detailed_info = f.read()
             return detailed_info
         else:
             self.logger.error(f"调用技能时出现未预料到的结果: {self.skill_info}")
-            
-    
+
+
     def get_skill_info(self, skill_name):
-        return self.skills.get(skill_name, None)
-    
+        return self.skills_ls.get(skill_name, None)
+
 
     def run_skill(self):
-        pass
\ No newline at end of file
+        pass
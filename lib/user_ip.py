@@ -1,4 +1,11 @@
 import requests,geocoder
+import json,logging,os,socket,threading,time
+
+logger = logging.getLogger(__name__)
+
+# 位置缓存文件及有效期（秒）
+LOCATION_CACHE_FILE = "cache/location.json"
+LOCATION_CACHE_TTL = 6 * 60 * 60
 
 # g = geocoder.ip('me')
 # print(g.ip)
@@ -34,6 +41,111 @@ class UserIP:
         return resp.json()['data']['detail']
 
 
+def _network_fingerprint():
+    """
+    获取当前网络的指纹（本机出口网卡地址）
+    UDP的connect不会真正发送数据，所以这里没有网络开销
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
+
+class LocationResolver:
+    """
+    带磁盘缓存的位置解析器
+    缓存过期或网络发生变化时才重新查询公网IP和地址
+    """
+
+    def __init__(self, cache_file=LOCATION_CACHE_FILE, ttl=LOCATION_CACHE_TTL):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache = None
+
+    def _load_cache(self):
+        if self._cache is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._cache = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._cache = {}
+        return self._cache
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"保存位置缓存失败: {e}")
+
+    def _is_valid(self, cache, fingerprint):
+        if not cache.get("address"):
+            return False
+        if time.time() - cache.get("resolved_at", 0) >= self.ttl:
+            return False
+        return cache.get("network") == fingerprint
+
+    def get_address(self, force=False):
+        """
+        获取用户所在地址，缓存有效时不产生任何网络请求
+        :param force: 是否忽略缓存强制重新查询
+        :return: 地址字符串
+        """
+        fingerprint = _network_fingerprint()
+        with self._lock:
+            cache = self._load_cache()
+            if not force and self._is_valid(cache, fingerprint):
+                return cache["address"]
+
+            user_ip = UserIP()
+            ip = user_ip.sendIp()
+            if not force and cache.get("address") and cache.get("ip") == ip:
+                # 出口IP未变，只需刷新缓存时间
+                address = cache["address"]
+            else:
+                address = user_ip.sendAddressIp(ip)['data']['detail']
+                logger.info(f"已重新解析用户地址: {address}")
+
+            self._cache = {
+                "ip": ip,
+                "address": address,
+                "network": fingerprint,
+                "resolved_at": time.time()
+            }
+            self._save_cache()
+            return address
+
+    def get_cached_address(self):
+        """只读取缓存中的地址（不检查有效期），不产生网络请求"""
+        with self._lock:
+            return self._load_cache().get("address")
+
+    def warm_up(self):
+        """在后台线程中预热位置缓存，启动时调用"""
+        def run():
+            try:
+                self.get_address()
+            except Exception as e:
+                logger.warning(f"预热位置缓存失败: {e}")
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+
+_resolver = LocationResolver()
+
+
+def get_location_resolver():
+    """获取全局位置解析器"""
+    return _resolver
+
+
 def main():
     user_ip = UserIP()
     print(user_ip.sendIp())
@@ -6,14 +6,42 @@ lib.vertical_tab_widget 的 Docstring
 
 import sys
 import json, os
+import logging
+import time
 from PyQt6.QtWidgets import (QApplication, QStackedWidget, QDialog, QFontDialog, QStyle, QButtonGroup, 
                             QFrame, QVBoxLayout, QDoubleSpinBox, QSpinBox, QFileDialog, QTabBar, 
                             QHBoxLayout, QLabel, QPushButton, QWidget, QTabWidget, QScrollArea,
                             QTextEdit, QDialogButtonBox, QMessageBox, QSplitter, QMenu, QSystemTrayIcon, QComboBox, QLineEdit)
-from PyQt6.QtCore import Qt, QPoint, QSize, QRectF, pyqtSignal, QObject, QRect, QThread, QPropertyAnimation, QEasingCurve
+from PyQt6.QtCore import Qt, QPoint, QSize, QRectF, pyqtSignal, QObject, QRect, QThread, QPropertyAnimation, QEasingCurve, QTimer
 from PyQt6.QtGui import (QIcon, QMouseEvent, QPainter, QImage, QPixmap, QFontMetrics, QPen, QColor, 
                          QPainterPath, QFont, QTextCursor, QTextCharFormat, QMovie)
 
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLoader(QThread):
+    """在后台线程中执行一个函数（读取磁盘等），完成后在界面线程中收到结果"""
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, func, parent=None):
+        super().__init__(parent)
+        self.func = func
+
+    def run(self):
+        try:
+            self.loaded.emit(self.func())
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+def _wait_loaders(loaders):
+    """等待后台加载线程结束（QThread 对象随父对象销毁时线程必须已经结束）"""
+    for loader in list(loaders):
+        loader.requestInterruption()
+        loader.wait()
+
+
 class VerticalTabBar(QTabBar):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -55,6 +83,11 @@ class VerticalTabWidget(QWidget):
         super().__init__(parent)
         self.font_manager = font_manager
         self.data_setting = self.load_settings()
+        self.mcp_config_widget = None  # 设置页面显示后才创建
+        self._loaders = []  # 正在运行的后台加载线程，保持引用直到结束
+        # 设置窗口关闭后会被销毁，此时还在运行的加载线程要先结束（不能再访问组件自身）
+        loaders = self._loaders
+        self.destroyed.connect(lambda: _wait_loaders(loaders))
         
         # 加载保存的字体设置
         if "font" in self.data_setting:
@@ -131,11 +164,15 @@ class VerticalTabWidget(QWidget):
         self.stacked_widget.addWidget(self.tab3)
         self.stacked_widget.addWidget(self.tab4)
         
-        # 初始化页面内容
-        self.init_tab1_ui()
-        self.init_tab2_ui()  # 插件页面
-        self.init_tab3_ui()
-        self.init_tab4_ui()
+        # 页面内容在第一次切换到该页面时才创建
+        self._page_builders = {
+            0: self.init_tab1_ui,
+            1: self.init_tab2_ui,  # 插件页面
+            2: self.init_tab3_ui,
+            3: self.init_tab4_ui,
+        }
+        self._built_pages = set()
+        self.ensure_page(0)
         
         # 创建按钮
         for i, (name, icon) in enumerate(zip(tab_names, icons)):
@@ -221,7 +258,57 @@ class VerticalTabWidget(QWidget):
     
     def switch_tab(self, button):
         index = self.button_group.id(button)
+        self.ensure_page(index)
         self.stacked_widget.setCurrentIndex(index)
+
+    def ensure_page(self, index):
+        """创建还没有创建的页面，并记录耗时"""
+        if index in self._built_pages or index not in self._page_builders:
+            return
+        self._built_pages.add(index)
+        start = time.perf_counter()
+        self._page_builders[index]()
+        logger.info(f"设置窗口页面 {index} 创建耗时 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def defer_widget(self, layout, factory, placeholder_text):
+        """
+        先在布局中放一个占位标签，等页面显示出来后再创建耗时的子组件并替换占位标签
+        :param factory: 创建子组件的函数
+        """
+        placeholder = QLabel(placeholder_text)
+        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        placeholder.setStyleSheet("color: #666; padding: 20px; font-size: 14px;")
+        layout.addWidget(placeholder)
+
+        def build():
+            start = time.perf_counter()
+            widget = factory()
+            layout.replaceWidget(placeholder, widget)
+            placeholder.deleteLater()
+            logger.info(f"{type(widget).__name__} 创建耗时 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        # 定时器以组件自身为父对象，组件先被销毁时定时器随之销毁，不会再创建
+        # （PyQt6 的 QTimer.singleShot 没有带上下文对象的重载）
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(build)
+        timer.timeout.connect(timer.deleteLater)
+        timer.start(0)
+
+    def run_in_background(self, func, on_loaded, on_failed=None):
+        """在后台线程中执行 func，结果通过 on_loaded 回到界面线程"""
+        loader = BackgroundLoader(func, self)
+        loader.loaded.connect(on_loaded)
+        if on_failed:
+            loader.failed.connect(on_failed)
+        loader.finished.connect(lambda: self._loaders.remove(loader))
+        loader.finished.connect(loader.deleteLater)
+        self._loaders.append(loader)
+        loader.start()
+
+    def closeEvent(self, event):
+        _wait_loaders(self._loaders)
+        super().closeEvent(event)
     
     def load_settings(self):
         setting_path = "demo_setting.json"
@@ -253,20 +340,21 @@ class VerticalTabWidget(QWidget):
         layout = QVBoxLayout(self.tab2)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        # 导入并添加插件页面组件
+        # 插件卡片较多时创建较慢，页面显示后再创建
+        self.defer_widget(layout, self.create_plugin_page, "正在加载插件...")
+
+    def create_plugin_page(self):
+        """创建插件页面组件，失败时返回错误信息标签"""
         try:
             from lib.plugin_page_widget import PluginPageWidget
-            plugin_widget = PluginPageWidget(self.font_manager)
-            layout.addWidget(plugin_widget)
+            return PluginPageWidget(self.font_manager)
         except ImportError as e:
             # 如果导入失败，显示错误信息
             error_label = QLabel(f"插件页面加载失败: {str(e)}")
-            error_label.setStyleSheet("color: red; padding: 20px; font-size: 16px;")
-            layout.addWidget(error_label)
         except Exception as e:
             error_label = QLabel(f"插件页面初始化错误: {str(e)}")
-            error_label.setStyleSheet("color: red; padding: 20px; font-size: 16px;")
-            layout.addWidget(error_label)
+        error_label.setStyleSheet("color: red; padding: 20px; font-size: 16px;")
+        return error_label
     
     def init_tab3_ui(self):
         """初始化设置标签页 - 应用美化主题"""
@@ -542,8 +630,10 @@ class VerticalTabWidget(QWidget):
             self.font_manager.register_widget(self.gif_folder_combo)
         personal_layout.addWidget(self.gif_folder_combo)
         
-        # 加载GIF文件夹选项
-        self.load_gif_folders()
+        # 在后台读取GIF文件夹选项
+        self.gif_folder_combo.addItem("正在加载GIF文件夹...", "")
+        self.gif_folder_combo.setEnabled(False)
+        self.run_in_background(self.list_gif_folders, self.populate_gif_folders)
         
         save_gif_button = QPushButton("💾 保存GIF选择")
         save_gif_button.setObjectName("save-button")
@@ -609,11 +699,8 @@ class VerticalTabWidget(QWidget):
             self.font_manager.register_widget(mcp_title)
         mcp_layout.addWidget(mcp_title)
         
-        # 导入并添加MCP配置组件
-        from lib.mcp_config_widget import MCPConfigWidget
-        self.mcp_config_widget = MCPConfigWidget(font_manager=self.font_manager)
-        self.mcp_config_widget.config_changed.connect(self.on_mcp_config_changed)
-        mcp_layout.addWidget(self.mcp_config_widget)
+        # MCP配置组件在页面显示后再创建
+        self.defer_widget(mcp_layout, self.create_mcp_config_widget, "正在加载MCP配置...")
         
         scroll_layout.addWidget(mcp_group)
         
@@ -820,6 +907,12 @@ class VerticalTabWidget(QWidget):
         layout.addWidget(content_label)
         layout.addStretch()
     
+    def create_mcp_config_widget(self):
+        from lib.mcp_config_widget import MCPConfigWidget
+        self.mcp_config_widget = MCPConfigWidget(font_manager=self.font_manager)
+        self.mcp_config_widget.config_changed.connect(self.on_mcp_config_changed)
+        return self.mcp_config_widget
+
     def on_mcp_config_changed(self):
         """MCP配置改变时的处理"""
         # 可以在这里添加重新初始化MCP连接的逻辑
@@ -944,15 +1037,26 @@ class VerticalTabWidget(QWidget):
 
     def load_gif_folders(self):
         """加载gif文件夹下的所有子文件夹"""
-        import os
+        self.populate_gif_folders(self.list_gif_folders())
+
+    @staticmethod
+    def list_gif_folders():
+        """列出gif文件夹下的所有子文件夹（可以在后台线程中调用）"""
         gif_path = "gif"
-        self.gif_folder_combo.clear()
-        
+        folders = []
         if os.path.exists(gif_path) and os.path.isdir(gif_path):
             for item in os.listdir(gif_path):
                 item_path = os.path.join(gif_path, item)
                 if os.path.isdir(item_path):
-                    self.gif_folder_combo.addItem(item, item)
+                    folders.append(item)
+        return folders
+
+    def populate_gif_folders(self, folders):
+        """把GIF文件夹填入下拉框并选中当前设置"""
+        self.gif_folder_combo.clear()
+        self.gif_folder_combo.setEnabled(True)
+        for item in folders:
+            self.gif_folder_combo.addItem(item, item)
         
         # 添加默认选项
         if self.gif_folder_combo.count() == 0:
@@ -0,0 +1,155 @@
+'''
+天气预取模块
+在后台线程中定时刷新常用城市和最近查询城市的天气，
+让 [Weather:] 指令和天气提醒都直接读取已预热的缓存
+'''
+
+import json
+import logging
+import threading
+import time
+
+from lib.getWeather import MSWeather, get_cached_weather, get_recent_cities
+from lib.user_ip import get_location_resolver
+
+logger = logging.getLogger(__name__)
+
+# 默认刷新间隔（分钟）
+DEFAULT_INTERVAL_MINUTES = 30
+# 失败后退避的最长时间（秒）
+MAX_BACKOFF_SECONDS = 2 * 60 * 60
+
+_prefetcher = None
+
+
+class WeatherPrefetcher:
+    """
+    天气预取调度器
+    按固定间隔刷新天气缓存，单个城市失败时按指数退避重试
+    """
+
+    def __init__(self, cities=None, interval_minutes=DEFAULT_INTERVAL_MINUTES, include_local=True):
+        """
+        :param cities: 需要预取的城市列表
+        :param interval_minutes: 刷新间隔（分钟）
+        :param include_local: 是否预取本地天气
+        """
+        self.cities = list(cities or [])
+        self.interval = max(1, int(interval_minutes)) * 60
+        self.include_local = include_local
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = None
+        self._failures = {}    # {city: 连续失败次数}
+        self._retry_at = {}    # {city: 允许再次尝试的时间}
+
+    @classmethod
+    def from_settings(cls, setting_path="demo_setting.json"):
+        """
+        根据配置文件创建调度器，未启用时返回None
+        配置格式: "weather_prefetch": {"enabled": true, "interval_minutes": 30, "cities": [], "include_local": true}
+        """
+        try:
+            with open(setting_path, "r", encoding="utf-8") as f:
+                config = json.load(f).get("weather_prefetch", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            config = {}
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            cities=config.get("cities", []),
+            interval_minutes=config.get("interval_minutes", DEFAULT_INTERVAL_MINUTES),
+            include_local=config.get("include_local", True)
+        )
+
+    @property
+    def cache_ttl(self):
+        """预取期间缓存的有效期，比刷新间隔略长以覆盖一次刷新耗时"""
+        return self.interval + 5 * 60
+
+    def start(self):
+        """启动后台预取线程"""
+        global _prefetcher
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="WeatherPrefetcher", daemon=True)
+        self._thread.start()
+        _prefetcher = self
+        logger.info(f"天气预取已启动，间隔{self.interval // 60}分钟")
+
+    def stop(self):
+        """停止后台预取线程"""
+        global _prefetcher
+        self._stop_event.set()
+        self._wake_event.set()
+        if _prefetcher is self:
+            _prefetcher = None
+        logger.info("天气预取已停止")
+
+    def refresh_now(self):
+        """立即触发一轮刷新"""
+        self._wake_event.set()
+
+    def _target_cities(self):
+        cities = list(self.cities)
+        if self.include_local:
+            try:
+                cities.append(get_location_resolver().get_address())
+            except Exception as e:
+                logger.warning(f"获取本地地址失败，跳过本地天气预取: {e}")
+        for city in get_recent_cities():
+            if city not in cities:
+                cities.append(city)
+        return cities
+
+    def _refresh_city(self, city):
+        now = time.time()
+        if now < self._retry_at.get(city, 0):
+            return
+        try:
+            # ttl=0 强制刷新缓存
+            MSWeather(city).get_current(ttl=0)
+            self._failures.pop(city, None)
+            self._retry_at.pop(city, None)
+            logger.debug(f"已预取天气: {city}")
+        except Exception as e:
+            failures = self._failures.get(city, 0) + 1
+            self._failures[city] = failures
+            backoff = min(60 * (2 ** failures), MAX_BACKOFF_SECONDS)
+            self._retry_at[city] = now + backoff
+            logger.warning(f"预取天气失败({city})，{backoff}秒后重试: {e}")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            for city in self._target_cities():
+                if self._stop_event.is_set():
+                    return
+                self._refresh_city(city)
+
+            # 有城市处于退避中时，提前醒来检查
+            wait = self.interval
+            if self._retry_at:
+                wait = max(1, min(wait, min(self._retry_at.values()) - time.time()))
+            self._wake_event.wait(wait)
+            self._wake_event.clear()
+
+    def get_weather(self, city):
+        """读取城市的预取天气，不产生网络请求"""
+        return get_cached_weather(city, self.cache_ttl)
+
+    def get_local_weather(self):
+        """
+        读取本地的预取天气，不产生网络请求
+        :return: (城市, 天气数据)，没有缓存时天气数据为None
+        """
+        resolver = get_location_resolver()
+        city = resolver.get_cached_address()
+        if not city:
+            return None, None
+        return city, self.get_weather(city)
+
+
+def get_prefetcher():
+    """获取正在运行的天气预取调度器，未启用时返回None"""
+    return _prefetcher
@@ -1,12 +1,13 @@
 import asyncio
 from email import message
+import multiprocessing
 import sys,os
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QLabel, QSystemTrayIcon, QMenu, 
     QDialog, QVBoxLayout, QTextEdit,  QPushButton, 
     QHBoxLayout, QMessageBox, QSplitter, QFrame
 )
-from PyQt6.QtGui import QIcon, QPixmap, QAction, QMovie, QTextCursor, QColor, QTextCharFormat, QFont, QImage, QPainter, QFontMetrics, QPainterPath
+from PyQt6.QtGui import QIcon, QPixmap, QAction, QTextCursor, QColor, QTextCharFormat, QFont, QImage, QPainter, QFontMetrics, QPainterPath
 from PyQt6.QtCore import Qt, QPoint, QThread, pyqtSignal, QTimer
 # from PyQt6.QtWidgets import QGraphicsDropShadowEffect
 import json
@@ -26,6 +27,11 @@ import logging
 
 
 from lib.pet_reminder import PetReminder
+from lib.user_ip import get_location_resolver
+from lib.weather_scheduler import WeatherPrefetcher
+from lib.gif_player import GifPlayer
+from lib.pet_animation import PetAnimationController
+from lib.animation_governor import AnimationGovernor
 
 # from stegano import lsb
 
@@ -389,6 +395,19 @@ class DesktopPet(QMainWindow):
         # 初始化系统托盘图标
         self.init_tray_icon()
 
+        # 动画调速：窗口看不见时暂停播放，长时间没有交互时降低帧率（demo_setting.json 的 animation_governor）
+        self.animation_governor = AnimationGovernor.from_settings(self, self.gif_player, parent=self)
+        if self.animation_governor:
+            self.animation_governor.start()
+
+        # 后台预热位置缓存，避免查询本地天气时阻塞
+        get_location_resolver().warm_up()
+
+        # 可选的天气预取（在demo_setting.json的weather_prefetch中启用）
+        self.weather_prefetcher = WeatherPrefetcher.from_settings()
+        if self.weather_prefetcher:
+            self.weather_prefetcher.start()
+
         # 初始化宠物提醒系统
         self.pet_reminder = PetReminder()
         # 不要在这里直接调用异步函数，而是在适当的时机启动
@@ -441,6 +460,11 @@ class DesktopPet(QMainWindow):
         # 设置标签的固定大小以控制GIF显示尺寸
         self.label.setFixedSize(80, 80)  # 可以根据需要调整尺寸
 
+        # GIF播放器：帧按标签尺寸和透明度预先缩放并缓存
+        self.gif_player = GifPlayer(self.label, self)
+        # 动画状态机：预加载角色的各个动作，负责切换和回到待机动作
+        self.animation = PetAnimationController(self.gif_player, parent=self)
+
         # 加载GIF动画
         self.load_gif_from_setting()
 
@@ -471,49 +495,10 @@ class DesktopPet(QMainWindow):
 
     #读取demo_setting.json,获取gif文件路径
     def load_gif_from_setting(self):
-        import json
-        try:
-            with open("demo_setting.json", "r", encoding="utf-8") as f:
-                setting = json.load(f)
-            gif_name = setting.get("gif", "闭眼.gif") # 获取GIF文件名，默认"闭眼.gif"
-            gif_name = gif_name.strip()  # 去除可能的空白字符
-            
-            # 使用配置中的GIF文件夹路径，如果未配置则使用默认值
-            gif_folder = setting.get("gif_folder", "gif/猫")
-            
-            gif_path = gif_name
-            # 如果不是绝对路径，则加上配置中的目录
-            if not (gif_path.startswith("/") or ":" in gif_path):
-                gif_path = f"{gif_folder}/{gif_name}"
-        except Exception as e:
-            self.logger.error(f"读取demo_setting.json失败: {e}")
-            gif_path = "gif/猫/闭眼.gif"
-        
-        # 检查GIF文件是否存在
-        if not os.path.exists(gif_path):
-            self.logger.warning(f"GIF文件不存在: {gif_path}，使用默认GIF")
-            gif_path = "gif/猫/闭眼.gif"
-        
+        """读取demo_setting.json中的待机GIF并播放（角色文件夹变化时重新预加载动作）"""
         try:
-            self.movie = QMovie(gif_path)
-            if self.movie.isValid():  # 检查movie是否有效
-                self.movie.frameChanged.connect(self.update_gif_transparency)
-                self.label.setMovie(self.movie)
-                self.movie.start()
-            else:
-                self.logger.warning(f"无法加载GIF文件: {gif_path}")
-                # 尝试使用默认路径
-                default_gif_path = "gif/猫/闭眼.gif"
-                if os.path.exists(default_gif_path):
-                    self.movie = QMovie(default_gif_path)
-                    if self.movie.isValid():
-                        self.movie.frameChanged.connect(self.update_gif_transparency)
-                        self.label.setMovie(self.movie)
-                        self.movie.start()
-                    else:
-                        self.logger.warning("默认GIF也无法加载")
-                else:
-                    self.logger.warning("默认GIF文件不存在")
+            self.animation.reload_settings()
+            self.animation.return_to_idle()
         except Exception as e:
             self.logger.error(f"加载GIF动画失败: {e}")
 
@@ -522,22 +507,10 @@ class DesktopPet(QMainWindow):
         self.load_gif_from_setting()
 
     def update_gif_transparency(self):
-        """更新GIF动画的透明度"""
-        current_frame = self.movie.currentPixmap()
-        if not current_frame.isNull():
-            # 创建透明图像
-            transparent_image = QImage(current_frame.size(), QImage.Format.Format_ARGB32)
-            transparent_image.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(transparent_image)
-            # 使用getattr确保即使transparency_value未初始化也能正常工作
-            transparency = getattr(self, 'transparency_value', 1.0)
-            painter.setOpacity(transparency)
-            painter.drawPixmap(0, 0, current_frame)
-            painter.end()
-
-            # 更新标签显示
-            self.label.setPixmap(QPixmap.fromImage(transparent_image))
+        """更新GIF动画的透明度（切换到对应透明度的缓存帧）"""
+        # 使用getattr确保即使transparency_value未初始化也能正常工作
+        transparency = getattr(self, 'transparency_value', 1.0)
+        self.gif_player.set_opacity(transparency)
 
     def set_transparency(self, value):
         """设置透明度值"""
@@ -549,49 +522,22 @@ class DesktopPet(QMainWindow):
     
     
     def grab_pet(self):
-        with open("demo_setting.json", "r", encoding="utf-8") as f:
-            setting = json.load(f)
-            dir_name = setting.get("gif_folder", "gif/猫")
-        if "站起.gif" in os.listdir(f"{dir_name}"):
-            self.movie = QMovie(f"{dir_name}/站起.gif")
-            self.label.setMovie(self.movie)
-            self.movie.start()
+        """抓起宠物时切换到站立动作，松开后回到待机动作"""
+        self.animation.set_state("stand")
 
     
     def eat_pet(self):
-        with open("demo_setting.json", "r", encoding="utf-8") as f:
-            setting = json.load(f)
-            dir_name = setting.get("gif_folder", "gif/猫")
-        if "吃东西.gif" in os.listdir(f"{dir_name}"):
-            # 更新设置中的GIF值
-            setting["gif"] = "吃东西.gif"
-            # 将修改后的设置写回文件
-            with open("demo_setting.json", "w", encoding="utf-8") as f:
-                json.dump(setting, f, ensure_ascii=False, indent=4)
-
-            self.movie = QMovie(f"{dir_name}/吃东西.gif")
-            self.label.setMovie(self.movie)
-            self.movie.start()
+        """进食期间以进食动作作为待机动作（写入配置，重启后保持）"""
+        self.animation.set_idle("吃东西.gif")
 
     
     def over_eat_pet(self):
-        with open("demo_setting.json", "r", encoding="utf-8") as f:
-            setting = json.load(f)
-            dir_name = setting.get("gif_folder", "gif/猫")
-        if "闭眼.gif" in os.listdir(f"{dir_name}"):
-            # 更新设置中的GIF值
-            setting["gif"] = "闭眼.gif"
-            # 将修改后的设置写回文件
-            with open("demo_setting.json", "w", encoding="utf-8") as f:
-                json.dump(setting, f, ensure_ascii=False, indent=4)
-
-            self.movie = QMovie(f"{dir_name}/闭眼.gif")
-            self.label.setMovie(self.movie)
-            self.movie.start()
+        """进食结束后恢复闭眼待机动作"""
+        self.animation.set_idle("闭眼.gif")
 
 
     def put_pet(self):
-        self.load_gif_from_setting()
+        self.animation.return_to_idle()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -927,6 +873,8 @@ class DesktopPet(QMainWindow):
             # 启动宠物说话提醒（使用Qt定时器方式）
             self.pet_reminder.start_talk_reminder(self, 10*60)  # 每10分钟提醒一次
             self.pet_reminder.start_eat_reminder(self, 3*60) #每3分钟检查一次
+            if self.weather_prefetcher:
+                self.pet_reminder.start_weather_reminder(self, 60*60) #每小时提醒一次天气
             self.logger.info("宠物提醒任务已启动")
 
     def closeEvent(self, event):
@@ -935,6 +883,9 @@ class DesktopPet(QMainWindow):
         if hasattr(self, 'pet_reminder'):
             self.pet_reminder.stop_talk_reminder()
             self.pet_reminder.stop_eat_reminder()
+            self.pet_reminder.stop_weather_reminder()
+        if getattr(self, 'weather_prefetcher', None):
+            self.weather_prefetcher.stop()
         super().closeEvent(event)
 
     def save_eating_progress(self, progress_data):
@@ -1010,7 +961,8 @@ class DesktopPet(QMainWindow):
             self.chat_dialog.add_message("系统", message, is_user=False)
 
 if __name__ == '__main__':
-    
+    # 插件进程池使用spawn方式创建子进程，打包后的程序需要此调用
+    multiprocessing.freeze_support()
 
     app = QApplication(sys.argv)
     # 设置应用程序属性，确保在没有窗口显示时也能正常运行
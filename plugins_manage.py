@@ -1,47 +1,334 @@
+import ast
 import importlib.util
+import json
+import os
 import sys
+import threading
+import time
 from pathlib import Path
 
+MANIFEST_NAME = "manifest.json"
 
-class PluginManager:
-    def __init__(self):
-        pass
 
-    def load_plugins(plugin_dir="plugins"):
-        """加载所有插件，返回 {plugin_name: callable} 字典"""
-        if getattr(sys, 'frozen', False):
-            base_dir = Path(sys.executable).parent
-        else:
-            base_dir = Path(__file__).parent
-
-        plugin_path = base_dir / plugin_dir
-        if not plugin_path.exists():
-            print(f"插件目录 {plugin_path} 不存在")
-            return {}
-
-        plugins = {}
-        for py_file in plugin_path.glob("*.py"):
-            module_name = py_file.stem  # 插件名
-            spec = importlib.util.spec_from_file_location(module_name, py_file)
-            if spec is None or spec.loader is None:
+def _base_dir():
+    """获取插件目录所在的根目录（兼容打包后的程序）"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).parent
+    return Path(__file__).parent
+
+
+def _describe_args(func_node):
+    """根据函数定义生成参数说明"""
+    args = func_node.args
+    schema = []
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    for arg, default in zip(positional, defaults):
+        item = {"name": arg.arg, "required": default is None}
+        if default is not None:
+            item["default"] = ast.unparse(default)
+        schema.append(item)
+    if args.vararg:
+        schema.append({"name": "*" + args.vararg.arg, "required": False})
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        item = {"name": arg.arg, "required": default is None, "keyword_only": True}
+        if default is not None:
+            item["default"] = ast.unparse(default)
+        schema.append(item)
+    if args.kwarg:
+        schema.append({"name": "**" + args.kwarg.arg, "required": False})
+    return schema
+
+
+def _own_nodes(func_node):
+    """遍历函数自身的语法节点，不进入内部定义的函数、lambda 和类"""
+    nested = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+    stack = [node for node in func_node.body if not isinstance(node, nested)]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(child for child in ast.iter_child_nodes(node) if not isinstance(child, nested))
+
+
+def scan_plugin_file(py_file):
+    """
+    静态分析插件文件生成清单条目，不会导入插件模块
+    "async" 只是提示：执行前会在导入后再确认，register() 返回其他表达式时标记为同步，由进程池执行
+    :return: {"name", "entry", "args", "async", "stream", "mtime"}，没有register函数时返回None
+    """
+    py_file = Path(py_file)
+    source = py_file.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(py_file))
+
+    functions = {}
+    register_node = None
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions[node.name] = node
+            if node.name == "register":
+                register_node = node
+    if register_node is None:
+        return None
+
+    # register() 返回的函数名即为入口，优先匹配 register() 内部定义的函数
+    entry = None
+    for node in _own_nodes(register_node):
+        if isinstance(node, ast.Return) and isinstance(node.value, ast.Name):
+            entry = node.value.id
+            break
+    local_functions = {
+        node.name: node for node in ast.walk(register_node)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node is not register_node
+    }
+    entry_node = local_functions.get(entry) or functions.get(entry)
+    is_async = isinstance(entry_node, ast.AsyncFunctionDef)
+    # 函数自身含有yield的异步函数是异步生成器，可以流式返回部分结果
+    is_stream = is_async and any(
+        isinstance(node, (ast.Yield, ast.YieldFrom)) for node in _own_nodes(entry_node)
+    )
+    return {
+        "name": py_file.stem,
+        "entry": entry,
+        "args": _describe_args(entry_node) if entry_node else [],
+        "async": is_async,
+        "stream": is_stream,
+        "mtime": py_file.stat().st_mtime
+    }
+
+
+class PluginManifest:
+    """
+    插件清单
+    记录插件的名称、入口函数、参数说明、是否异步以及是否流式输出，用于在不导入插件的情况下列出插件。
+    清单是根据插件文件自动生成的缓存（不纳入版本控制），条目按文件修改时间更新
+    """
+
+    def __init__(self, plugin_path):
+        self.plugin_path = Path(plugin_path)
+        self.manifest_path = self.plugin_path / MANIFEST_NAME
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        try:
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=4, sort_keys=True)
+        except OSError as e:
+            print(f"保存插件清单失败: {e}")
+
+    def sync(self):
+        """根据插件目录同步清单，只重新分析修改过的文件"""
+        changed = False
+        found = set()
+        for py_file in self.plugin_path.glob("*.py"):
+            name = py_file.stem
+            found.add(name)
+            entry = self.entries.get(name)
+            mtime = py_file.stat().st_mtime
+            if entry and entry.get("mtime") == mtime:
                 continue
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
             try:
-                spec.loader.exec_module(module)
-            except Exception as e:
-                print(f"加载插件 {module_name} 失败: {e}")
+                new_entry = scan_plugin_file(py_file)
+            except (SyntaxError, UnicodeDecodeError, OSError) as e:
+                print(f"分析插件 {name} 失败: {e}")
+                new_entry = None
+            if new_entry is None:
+                if self.entries.pop(name, None) is not None:
+                    changed = True
                 continue
+            self.entries[name] = new_entry
+            changed = True
+
+        for name in list(self.entries):
+            if name not in found:
+                del self.entries[name]
+                changed = True
+        if changed:
+            self.save()
+        return changed
+
 
-            if hasattr(module, 'register'):
-                try:
-                    plugin_func = module.register()
-                    plugins[module_name] = plugin_func
-                except Exception as e:
-                    print(f"执行插件 {module_name}.register() 失败: {e}")
-            else:
-                print(f"插件 {module_name} 缺少 register 函数，已忽略")
-        return plugins
+class PluginRegistry:
+    """
+    插件注册表
+    通过插件清单列出插件，插件模块在首次调用时才导入并常驻内存，
+    某个插件文件的修改时间变化时只重新加载该文件
+    """
+
+    def __init__(self, plugin_dir="plugins"):
+        self.plugin_path = _base_dir() / plugin_dir
+        self._lock = threading.RLock()
+        self._plugins = {}  # {plugin_name: {"path", "mtime", "func", "loaded"}}
+        self._dir_mtime = None
+        self._manifest = None
+        self.import_times = {}  # {plugin_name: 导入耗时（毫秒）}
+
+    def _module_key(self, name):
+        # 使用独立的模块名，避免覆盖 sys.modules 中的同名模块
+        return f"_yyplugin_{name}"
+
+    def _load_file(self, py_file):
+        """加载单个插件文件，返回 register() 得到的可调用对象"""
+        module_name = py_file.stem
+        spec = importlib.util.spec_from_file_location(self._module_key(module_name), py_file)
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        key = self._module_key(module_name)
+        # 执行前登记模块：插件导入自身、使用 dataclasses/类型前向引用或序列化自己的类时都需要
+        sys.modules[key] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            sys.modules.pop(key, None)
+            print(f"加载插件 {module_name} 失败: {e}")
+            return None
+
+        if not hasattr(module, 'register'):
+            sys.modules.pop(key, None)
+            print(f"插件 {module_name} 缺少 register 函数，已忽略")
+            return None
+        try:
+            plugin_func = module.register()
+        except Exception as e:
+            sys.modules.pop(key, None)
+            print(f"执行插件 {module_name}.register() 失败: {e}")
+            return None
+        return plugin_func
+
+    def _import(self, name, entry):
+        """首次使用时导入插件，并记录导入耗时"""
+        start = time.perf_counter()
+        entry["func"] = self._load_file(entry["path"])
+        entry["loaded"] = True
+        self.import_times[name] = (time.perf_counter() - start) * 1000
+        print(f"插件 {name} 已加载，耗时 {self.import_times[name]:.1f}ms")
+
+    def _reload_if_changed(self, name, entry):
+        try:
+            mtime = os.stat(entry["path"]).st_mtime
+        except OSError:
+            # 文件已被删除
+            self._plugins.pop(name, None)
+            sys.modules.pop(self._module_key(name), None)
+            return None
+        if mtime != entry["mtime"]:
+            reloading = entry["loaded"]
+            entry["mtime"] = mtime
+            self._manifest.sync()
+            self._import(name, entry)
+            if reloading:
+                print(f"插件 {name} 已热重载")
+        elif not entry["loaded"]:
+            self._import(name, entry)
+        return entry
+
+    def refresh(self):
+        """根据插件清单登记新增的插件并移除已删除的插件（不导入插件模块）"""
+        with self._lock:
+            if not self.plugin_path.exists():
+                print(f"插件目录 {self.plugin_path} 不存在")
+                self._plugins.clear()
+                return
+            dir_mtime = os.stat(self.plugin_path).st_mtime
+            if dir_mtime == self._dir_mtime:
+                return
+            self._dir_mtime = dir_mtime
+
+            if self._manifest is None:
+                self._manifest = PluginManifest(self.plugin_path)
+            self._manifest.sync()
+
+            for name in self._manifest.entries:
+                if name not in self._plugins:
+                    py_file = self.plugin_path / f"{name}.py"
+                    self._plugins[name] = {
+                        "path": py_file,
+                        "mtime": py_file.stat().st_mtime,
+                        "func": None,
+                        "loaded": False
+                    }
+            for name in list(self._plugins):
+                if name not in self._manifest.entries:
+                    del self._plugins[name]
+                    sys.modules.pop(self._module_key(name), None)
+
+    def list_plugins(self):
+        """列出所有插件的清单信息，不会导入任何插件"""
+        with self._lock:
+            self.refresh()
+            if self._manifest is None:
+                return {}
+            return {name: dict(entry) for name, entry in self._manifest.entries.items()}
+
+    def get_info(self, plugin_name):
+        """获取单个插件的清单信息，不会导入插件"""
+        with self._lock:
+            self.refresh()
+            if self._manifest is None:
+                return None
+            entry = self._manifest.entries.get(plugin_name)
+            return dict(entry) if entry else None
+
+    def get(self, plugin_name):
+        """获取插件的可调用对象，文件有修改时自动热重载"""
+        with self._lock:
+            entry = self._plugins.get(plugin_name)
+            if entry is None:
+                # 可能是新增的插件
+                self.refresh()
+                entry = self._plugins.get(plugin_name)
+                if entry is None:
+                    return None
+            entry = self._reload_if_changed(plugin_name, entry)
+            return entry["func"] if entry else None
+
+    def plugins(self):
+        """返回当前所有可用插件 {plugin_name: callable}（会导入全部插件）"""
+        with self._lock:
+            self.refresh()
+            result = {}
+            for name in list(self._plugins):
+                entry = self._reload_if_changed(name, self._plugins[name])
+                if entry and entry["func"] is not None:
+                    result[name] = entry["func"]
+            return result
+
+    def call(self, plugin_name, *args, **kwargs):
+        """调用指定的插件（如果存在）"""
+        func = self.get(plugin_name)
+        if func is None:
+            print(f"插件 {plugin_name} 未找到")
+            return None
+        return func(*args, **kwargs)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(plugin_dir="plugins"):
+    """获取指定插件目录的全局注册表"""
+    with _registries_lock:
+        if plugin_dir not in _registries:
+            _registries[plugin_dir] = PluginRegistry(plugin_dir)
+        return _registries[plugin_dir]
+
+
+class PluginManager:
+    def __init__(self):
+        pass
+
+    def load_plugins(plugin_dir="plugins"):
+        """加载所有插件，返回 {plugin_name: callable} 字典（已加载的插件会被复用）"""
+        return get_registry(plugin_dir).plugins()
 
     def call_plugin(plugins_dict, plugin_name, *args, **kwargs):
         """调用指定的插件（如果存在）"""
@@ -50,7 +337,7 @@ class PluginManager:
         else:
             print(f"插件 {plugin_name} 未找到")
             return None
-        
+
 def main():
     plugins = PluginManager.load_plugins()
     a = PluginManager.call_plugin(plugins, "GetTime")
@@ -62,4 +349,4 @@ def main():
     # PluginManager.call_plugin(plugins, "demo", 1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,25 @@
+'''
+测试公共配置
+界面相关的测试使用 offscreen 平台，不需要显示器；
+会在当前目录写入 cache/、logs/ 的模块在临时目录中运行
+'''
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    """切换到临时目录，模块写入的相对路径（cache/ 等）不会落到仓库中"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
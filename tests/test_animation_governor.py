@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from PIL import Image
+from PyQt6.QtCore import QEvent
+from PyQt6.QtWidgets import QApplication, QLabel, QWidget
+
+from lib.animation_governor import ACTIVE, IDLE, SUSPENDED, AnimationGovernor
+from lib.gif_player import GifPlayer
+
+
+@pytest.fixture
+def pet(qapp, in_tmp):
+    gif = str(in_tmp / "walk.gif")
+    frames = [Image.new("RGB", (20, 20), color) for color in [(255, 0, 0), (0, 0, 255)]]
+    frames[0].save(gif, save_all=True, append_images=frames[1:], duration=100, loop=0)
+    window = QWidget()
+    window.setGeometry(100, 100, 80, 80)
+    label = QLabel(window)
+    label.resize(80, 80)
+    player = GifPlayer(label)
+    assert player.play(gif)
+    yield window, player
+    player.stop()
+    window.close()
+
+
+def settle(qapp):
+    """处理可见性事件后延迟执行的检查"""
+    for _ in range(3):
+        qapp.processEvents()
+
+
+def test_hidden_window_suspends_and_showing_resumes(qapp, pet):
+    window, player = pet
+    governor = AnimationGovernor(window, player, idle_seconds=60, idle_fps=5)
+    states = []
+    governor.stateChanged.connect(states.append)
+    governor.start()
+    assert governor.state == SUSPENDED and player.is_paused()
+
+    window.show()
+    settle(qapp)
+    assert governor.state == ACTIVE and player.is_playing()
+
+    window.hide()
+    settle(qapp)
+    assert governor.state == SUSPENDED
+    assert states == [SUSPENDED, ACTIVE, SUSPENDED]
+    governor.stop()
+
+
+def test_idle_throttles_until_interaction(qapp, pet):
+    window, player = pet
+    window.show()
+    governor = AnimationGovernor(window, player, idle_seconds=60, idle_fps=5)
+    governor.start()
+    assert governor.state == ACTIVE
+
+    governor._on_idle()
+    assert governor.state == IDLE
+    assert player._max_fps == 5 and player.is_playing()
+    assert governor.diagnostics()["max_fps"] == 5
+
+    QApplication.sendEvent(window, QEvent(QEvent.Type.Enter))
+    assert governor.state == ACTIVE and player._max_fps is None
+    assert governor._idle_timer.isActive()
+    governor.stop()
+
+
+def test_invisible_or_offscreen_window_suspends(qapp, pet):
+    window, player = pet
+    window.show()
+    governor = AnimationGovernor(window, player)
+    governor.start()
+
+    window.setWindowOpacity(0.0)
+    governor._update()
+    assert governor.state == SUSPENDED
+    window.setWindowOpacity(1.0)
+    governor._update()
+    assert governor.state == ACTIVE
+
+    window.move(-10000, -10000)
+    settle(qapp)
+    assert governor.state == SUSPENDED
+
+    governor.stop()
+    assert governor.state == ACTIVE and not player.is_paused()
+    # 停止后不再响应窗口事件
+    window.hide()
+    settle(qapp)
+    assert governor.state == ACTIVE
+
+
+def test_from_settings(qapp, pet, in_tmp):
+    window, player = pet
+    setting = in_tmp / "demo_setting.json"
+    assert AnimationGovernor.from_settings(window, player, str(setting)) is not None
+
+    setting.write_text(json.dumps({"animation_governor": {"idle_seconds": 2, "idle_fps": 3}}), encoding="utf-8")
+    governor = AnimationGovernor.from_settings(window, player, str(setting))
+    assert governor.idle_fps == 3 and governor._idle_timer.interval() == 2000
+
+    setting.write_text(json.dumps({"animation_governor": {"enabled": False}}), encoding="utf-8")
+    assert AnimationGovernor.from_settings(window, player, str(setting)) is None
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import textwrap
+
+import pytest
+
+import lib.ues_skills as ues_skills
+from lib.plugin_pool import InlinePluginRunner, resolve_result
+from plugins_manage import PluginRegistry, scan_plugin_file
+
+
+def scan(tmp_path, source):
+    path = tmp_path / "plugin.py"
+    path.write_text(textwrap.dedent(source), encoding="utf-8")
+    return scan_plugin_file(path)
+
+
+def test_async_function_entry_is_marked_async(tmp_path):
+    info = scan(tmp_path, """
+        async def fetch(city):
+            return city
+        def register():
+            return fetch
+    """)
+    assert info["async"] and not info["stream"]
+
+
+def test_async_generator_entry_is_marked_stream(tmp_path):
+    info = scan(tmp_path, """
+        def register():
+            async def chat(text):
+                yield text
+            return chat
+    """)
+    assert info["entry"] == "chat"
+    assert info["async"] and info["stream"]
+
+
+def test_yield_in_nested_function_does_not_make_entry_stream(tmp_path):
+    info = scan(tmp_path, """
+        async def fetch():
+            def helper():
+                yield 1
+            return list(helper())
+        def register():
+            def inner():
+                return None
+            return fetch
+    """)
+    assert info["entry"] == "fetch"
+    assert info["async"] and not info["stream"]
+
+
+def test_resolve_result_runs_coroutines_and_joins_async_generators():
+    async def coroutine():
+        return 42
+
+    async def generator():
+        for part in ("a", "b", "c"):
+            yield part
+
+    assert resolve_result(coroutine()) == 42
+    assert resolve_result(generator()) == "abc"
+    assert resolve_result("plain") == "plain"
+
+
+@pytest.fixture
+def skill_env(in_tmp, monkeypatch):
+    """临时目录中的技能列表和插件目录，插件在当前线程中执行"""
+    plugins = in_tmp / "plugins"
+    plugins.mkdir()
+    (plugins / "story.py").write_text(textwrap.dedent("""
+        async def tell(topic):
+            for part in ("从前", "有一只", topic):
+                yield part
+        def register():
+            return tell
+    """), encoding="utf-8")
+    (in_tmp / "yyskills").mkdir()
+    (in_tmp / "yyskills" / "skill_list.json").write_text(
+        json.dumps({"story": {"have_plugin": True, "detailed_info": False}}), encoding="utf-8")
+
+    registry = PluginRegistry(str(plugins))
+    runner = InlinePluginRunner(plugin_dir=str(plugins), timeout=5)
+    monkeypatch.setattr(ues_skills, "_skills_cache", {"mtime": None, "skills": {}})
+    monkeypatch.setattr(ues_skills, "get_registry", lambda: registry)
+    monkeypatch.setattr(ues_skills, "get_plugin_pool", lambda: runner)
+    return runner
+
+
+def test_streaming_plugin_delivers_partial_results(skill_env):
+    partials = []
+    result = asyncio.run(ues_skills.UESkills("story:小猫").analyze_skill_async(partials.append))
+    assert partials == ["从前", "有一只", "小猫"]
+    assert result == "从前有一只小猫"
+    assert skill_env.get_stats()["story"]["calls"] == 1
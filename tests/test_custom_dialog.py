@@ -0,0 +1,108 @@
+import sys
+import types
+
+import pytest
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QWidget
+
+import lib.LogManager as LogManager
+
+
+class FakeSettingsTab(QWidget):
+    """代替设置页（真实的设置页需要AI接口等配置），只提供对话框用到的接口"""
+    transparency_changed = pyqtSignal(float)
+    luminance_changed = pyqtSignal(int)
+    background_changed = pyqtSignal(str)
+    background_path = ""
+
+    def __init__(self, font_manager=None):
+        super().__init__()
+
+    def get_transparency_img_value(self):
+        return 1.0
+
+    def get_luminance_img_value(self):
+        return 0
+
+    def get_background_path(self):
+        return self.background_path
+
+
+@pytest.fixture
+def make_dialog(qapp, in_tmp, monkeypatch):
+    monkeypatch.setattr(LogManager, "init_logging", lambda *args, **kwargs: None)
+    monkeypatch.setitem(sys.modules, "lib.vertical_tab_widget",
+                        types.SimpleNamespace(VerticalTabWidget=FakeSettingsTab))
+    from lib.custom_dialog import CustomDialog
+    dialogs = []
+
+    def make(background_path=""):
+        monkeypatch.setattr(FakeSettingsTab, "background_path", background_path)
+        dialog = CustomDialog()
+        dialog.resize(300, 200)
+        dialogs.append(dialog)
+        return dialog
+
+    yield make
+    for dialog in dialogs:
+        dialog.close()
+
+
+def save_image(path, size, color):
+    image = QImage(size[0], size[1], QImage.Format.Format_RGB32)
+    image.fill(QColor(color))
+    assert image.save(str(path))
+    return str(path)
+
+
+def test_large_background_is_reduced_while_decoding(make_dialog, in_tmp):
+    # 离屏平台的屏幕为 800x800，按比例缩小到刚好能覆盖屏幕
+    dialog = make_dialog(save_image(in_tmp / "big.png", (3200, 1600), "red"))
+    assert (dialog.background_image.width(), dialog.background_image.height()) == (1600, 800)
+
+    small = save_image(in_tmp / "small.png", (100, 50), "blue")
+    dialog.handle_background_changed(small)
+    assert dialog.background_image.width() == 100
+    dialog.handle_background_changed("")
+    assert dialog.background_image.isNull() and not dialog._scaled_cache
+
+    dialog.handle_background_changed(str(in_tmp / "missing.png"))
+    assert dialog.background_image.isNull()
+
+
+def test_scaled_background_is_cached_per_size(make_dialog, in_tmp):
+    dialog = make_dialog(save_image(in_tmp / "bg.png", (400, 400), "red"))
+    dialog.show()  # 隐藏的窗口调整大小时不会立即收到 resizeEvent
+    dialog._resize_timer.stop()
+    first = dialog.scaled_background()
+    assert (first.width(), first.height()) == (300, 200)
+    assert dialog.scaled_background() is first
+
+    # 调整大小的过程中先拉伸上一次的结果
+    dialog.resize(320, 220)
+    assert dialog._resize_timer.isActive()
+    assert dialog.scaled_background() is first
+    dialog._resize_timer.stop()
+    resized = dialog.scaled_background()
+    assert (resized.width(), resized.height()) == (320, 220)
+
+    for width in range(330, 380, 10):
+        dialog.resize(width, 220)
+        dialog._resize_timer.stop()
+        dialog.scaled_background()
+    assert len(dialog._scaled_cache) == 4
+
+
+def test_opacity_is_applied_when_painting(make_dialog, in_tmp):
+    dialog = make_dialog(save_image(in_tmp / "bg.png", (400, 400), "red"))
+    dialog._resize_timer.stop()
+    opaque = dialog.grab().toImage().pixelColor(150, 100)
+    cached = dialog.scaled_background()
+
+    dialog.handle_transparency_changed(0.5)
+    faded = dialog.grab().toImage().pixelColor(150, 100)
+    # 修改透明度不会重新缩放背景
+    assert dialog.scaled_background() is cached
+    assert opaque.red() == 255 and opaque.alpha() == 255
+    assert faded.alpha() == pytest.approx(128, abs=2)
@@ -0,0 +1,95 @@
+import os
+import shutil
+
+import pytest
+
+from lib.food_index import FoodIndex
+
+FOOD = {"FoodName": "苹果", "FoodCalories": 52}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = FoodIndex(str(tmp_path / "cache" / "food_index.sqlite"))
+    yield index
+    if index._conn is not None:
+        index._conn.close()
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "apple.png"
+    path.write_bytes(b"fake image bytes")
+    return str(path)
+
+
+class Decoder:
+    """记录调用次数的解码函数"""
+
+    def __init__(self, result=(True, FOOD)):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return self.result
+
+
+def test_second_lookup_skips_decoding(index, image):
+    decoder = Decoder()
+    assert index.lookup(image, decoder) == (True, FOOD)
+    assert index.lookup(image, decoder) == (True, FOOD)
+    assert decoder.calls == 1
+
+
+def test_copied_image_is_found_by_content_hash(index, image, tmp_path):
+    index.lookup(image, Decoder())
+    copy = str(tmp_path / "copy.png")
+    shutil.copy(image, copy)
+    decoder = Decoder()
+    assert index.lookup(copy, decoder) == (True, FOOD)
+    assert decoder.calls == 0
+
+
+def test_changed_image_is_decoded_again(index, image):
+    index.lookup(image, Decoder())
+    with open(image, "ab") as f:
+        f.write(b"edited")
+    decoder = Decoder((True, {"FoodName": "梨"}))
+    assert index.lookup(image, decoder) == (True, {"FoodName": "梨"})
+    assert decoder.calls == 1
+
+
+def test_only_definite_results_are_cached(index, image):
+    failing = Decoder((False, {"error": "读取食物信息失败: 文件被占用"}))
+    index.lookup(image, failing)
+    index.lookup(image, failing)
+    assert failing.calls == 2
+
+    missing = Decoder((False, {"error": "未找到嵌入的食物信息"}))
+    index.lookup(image, missing)
+    index.lookup(image, missing)
+    assert missing.calls == 1
+
+
+def test_put_and_cached_many_skip_stale_entries(index, tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"food{i}.png"
+        path.write_bytes(bytes([i]) * 10)
+        index.put(str(path), {"FoodName": f"食物{i}"})
+        paths.append(str(path))
+    with open(paths[1], "ab") as f:
+        f.write(b"changed")
+    unknown = str(tmp_path / "unknown.png")
+
+    cached = index.cached_many(paths + [unknown])
+    assert set(cached) == {paths[0], paths[2]}
+    assert cached[paths[2]] == (True, {"FoodName": "食物2"})
+
+
+def test_prune_removes_deleted_images(index, image):
+    index.lookup(image, Decoder())
+    os.remove(image)
+    assert index.prune() == 1
+    assert index.prune() == 0
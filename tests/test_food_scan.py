@@ -0,0 +1,79 @@
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from PIL import Image
+
+import lib.food_index as food_index
+from food_editor import LoadFoodListWorker
+from lib.food_manager import FoodVerification
+
+IMAGE_COUNT = 24
+
+
+@pytest.fixture
+def food_folder(in_tmp, monkeypatch):
+    """临时目录中的食物图片（只有像素LSB信息，索引为空）"""
+    monkeypatch.setattr(food_index, "_index", None)
+    folder = in_tmp / "outfood"
+    folder.mkdir()
+    for i in range(IMAGE_COUNT):
+        message = json.dumps({"FoodName": f"食物{i}", "FoodCalories": i})
+        FoodVerification.lsb_hide(Image.new("RGB", (40, 40), (i, 100, 200)), message).save(folder / f"{i:02d}.png")
+    (folder / "notes.txt").write_text("不是图片", encoding="utf-8")
+    yield folder
+    index = food_index._index
+    if index is not None and index._conn is not None:
+        index._conn.close()
+
+
+def run_scan(folder, executor):
+    rows, progress, finished = [], [], []
+    worker = LoadFoodListWorker(str(folder), executor)
+    worker.batch_ready.connect(rows.extend)
+    worker.progress.connect(lambda done, total: progress.append((done, total)))
+    worker.finished.connect(finished.append)
+    worker.run()  # 直接在测试线程中执行，信号同步送达
+    return rows, progress, finished
+
+
+class NoExecutor:
+    def submit(self, *args):
+        pytest.fail("所有图片都应该从索引中读取")
+
+
+def test_scan_in_process_pool_then_from_index(qapp, food_folder):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=context) as executor:
+        rows, progress, finished = run_scan(food_folder, executor)
+
+    assert finished == [True]
+    assert progress[-1] == (IMAGE_COUNT, IMAGE_COUNT)
+    by_name = {row[0]: row for row, _ in rows}
+    assert len(by_name) == IMAGE_COUNT
+    assert by_name["05.png"][1:4] == ["食物5", "", "5"]
+
+    # 多个扫描进程同时写入的索引条目都在，第二次扫描不再解码
+    rows_again, _, finished_again = run_scan(food_folder, NoExecutor())
+    assert finished_again == [True]
+    assert sorted(rows_again) == sorted(rows)
+
+
+def test_undecodable_image_is_listed_but_not_indexed(qapp, food_folder):
+    (food_folder / "broken.png").write_bytes(b"not a png")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+        rows, _, _ = run_scan(food_folder, executor)
+        broken = [row for row, _ in rows if row[0] == "broken.png"]
+        assert broken == [["broken.png"] + [""] * 6]
+        assert food_index.get_food_index().cached_many([str(food_folder / "broken.png")]) == {}
+
+
+def test_cancelled_scan_submits_nothing(qapp, food_folder):
+    finished = []
+    worker = LoadFoodListWorker(str(food_folder), NoExecutor())
+    worker.finished.connect(finished.append)
+    worker.cancel()
+    worker.run()
+    assert finished == []
@@ -0,0 +1,63 @@
+from PyQt6.QtCore import QSortFilterProxyModel, Qt
+
+from food_editor import FOOD_TABLE_HEADERS, FoodTableModel, food_row
+
+
+def make_proxy(model):
+    """与食物编辑窗口相同的代理配置"""
+    proxy = QSortFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.setSortRole(FoodTableModel.SortRole)
+    proxy.setFilterKeyColumn(-1)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
+
+
+def record(name, calories, water="", food_type="主食"):
+    data = {"FoodName": name, "FoodCalories": calories, "FoodWater": water, "FoodType": food_type}
+    return food_row(f"/foods/{name}.png", True, data)
+
+
+def column(proxy, col):
+    return [proxy.index(row, col).data() for row in range(proxy.rowCount())]
+
+
+def test_every_scanned_row_reaches_the_proxy(qapp):
+    model = FoodTableModel()
+    for start in range(0, 1000, 100):
+        model.append_records([record(f"食物{i}", i) for i in range(start, start + 100)])
+    proxy = make_proxy(model)
+    assert model.columnCount() == len(FOOD_TABLE_HEADERS)
+    assert proxy.rowCount() == model.total_count() == 1000
+
+    # 降序排序后第一行是整个列表中的最大值，而不只是已显示部分的最大值
+    proxy.sort(3, Qt.SortOrder.DescendingOrder)
+    assert proxy.index(0, 0).data() == "食物999.png"
+
+
+def test_numeric_columns_sort_by_value(qapp):
+    model = FoodTableModel()
+    model.append_records([record("a", 100), record("b", 9), record("c", "abc"), record("d", 25.5)])
+    proxy = make_proxy(model)
+    proxy.sort(3, Qt.SortOrder.AscendingOrder)
+    # 无法解析的数值排在最前，其余按数值而不是字符串排序
+    assert column(proxy, 3) == ["abc", "9", "25.5", "100"]
+
+    proxy.sort(1, Qt.SortOrder.AscendingOrder)
+    assert column(proxy, 1) == ["a", "b", "c", "d"]
+
+
+def test_filter_matches_any_column_and_maps_back_to_image(qapp):
+    model = FoodTableModel()
+    model.append_records([record("Apple", 52, food_type="水果"), record("米饭", 116), record("香蕉", 89, food_type="水果")])
+    proxy = make_proxy(model)
+
+    proxy.setFilterFixedString("水果")
+    assert column(proxy, 1) == ["Apple", "香蕉"]
+    proxy.setFilterFixedString("apple")
+    assert proxy.rowCount() == 1
+    source_row = proxy.mapToSource(proxy.index(0, 0)).row()
+    assert model.image_path(source_row) == "/foods/Apple.png"
+
+    model.clear()
+    assert proxy.rowCount() == 0
@@ -0,0 +1,87 @@
+import os
+
+from PIL import Image
+from PyQt6.QtCore import QSize
+
+from lib.gif_optimizer import (_dedupe, optimize_folder, optimize_gif, optimized_path,
+                               preferred_gif)
+from lib.gif_player import decode_gif
+
+RED, BLUE = (255, 0, 0, 255), (0, 0, 255, 255)
+
+
+def frame(color, size=(4, 4)):
+    return Image.new("RGBA", size, color)
+
+
+def make_gif(path, colors, durations, size=(96, 96)):
+    """调色板第0项为透明色，每帧左上角透明、其余部分为指定颜色"""
+    palette = [0, 0, 0] + [channel for color in colors for channel in color]
+    frames = []
+    for i in range(len(colors)):
+        image = Image.new("P", size, i + 1)
+        image.paste(0, (0, 0, size[0] // 2, size[1] // 2))
+        image.putpalette(palette)
+        frames.append(image)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations,
+                   loop=0, disposal=2, transparency=0)
+    return str(path)
+
+
+def test_dedupe_merges_only_consecutive_duplicates():
+    frames, delays = _dedupe([frame(RED), frame(RED), frame(BLUE), frame(RED)], [100, 50, 30, 20])
+    assert [f.getpixel((0, 0)) for f in frames] == [RED, BLUE, RED]
+    assert delays == [150, 30, 20]
+
+
+def test_optimized_copy_goes_to_cache_and_is_preferred(qapp, in_tmp):
+    folder = in_tmp / "gif" / "角色"
+    folder.mkdir(parents=True)
+    gif = make_gif(folder / "走路.gif", [(255, 0, 0), (0, 0, 255), (0, 255, 0)], [200, 100, 300])
+
+    report = optimize_gif(gif, 40, 40)
+    assert report["kept"]
+    assert (report["source_frames"], report["output_frames"]) == (3, 3)
+    assert report["output_memory"] < report["source_memory"]
+    output = optimized_path(gif, 40, 40)
+    assert output.startswith(os.path.join("cache", "optimized", "角色_"))
+    assert output.endswith(os.path.join("40x40", "走路.gif"))
+    assert sorted(os.listdir(folder)) == ["走路.gif"]
+    assert preferred_gif(gif, 40, 40) == output
+    assert preferred_gif(gif, 80, 80) == gif
+
+    images, delays = decode_gif(output, QSize(40, 40))
+    # 延时不变，透明区域保持透明
+    assert delays == [200, 100, 300]
+    assert images[0].pixelColor(5, 5).alpha() == 0
+    assert images[0].pixelColor(35, 35).red() > 200
+
+    # 原图在优化之后被修改时使用原图
+    st = os.stat(output)
+    os.utime(gif, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert preferred_gif(gif, 40, 40) == gif
+
+
+def test_optimize_folder_reports_failures(qapp, in_tmp):
+    folder = in_tmp / "角色"
+    folder.mkdir()
+    make_gif(folder / "a.gif", [(255, 0, 0), (0, 0, 255)], [100, 100])
+    (folder / "b.gif").write_bytes(b"not a gif")
+    (folder / "readme.txt").write_text("x")
+    reports = optimize_folder(str(folder), 32, 32)
+    assert [r["name"] for r in reports] == ["a.gif", "b.gif"]
+    assert "error" not in reports[0] and "error" in reports[1]
+    assert not os.path.exists(optimized_path(str(folder / "b.gif"), 32, 32) + ".tmp")
+
+
+def test_copy_that_saves_nothing_is_not_kept(qapp, in_tmp):
+    gif = make_gif(in_tmp / "a.gif", [(255, 0, 0)], [100], size=(16, 16))
+    output = optimized_path(gif, 16, 16)
+    os.makedirs(os.path.dirname(output))
+    with open(output, "wb") as f:
+        f.write(b"stale")
+    report = optimize_gif(gif, 16, 16)
+    assert not report["kept"]
+    # 旧的副本也被删除，解码时使用原图
+    assert not os.path.exists(output) and not os.path.exists(output + ".tmp")
+    assert preferred_gif(gif, 16, 16) == gif
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+
+import pytest
+from PIL import Image
+from PyQt6.QtWidgets import QLabel
+
+import lib.gif_player as gif_player
+from lib.gif_player import DEFAULT_FRAME_DELAY, GifPlayer, load_gif_frames
+
+COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 255, 255)]
+
+
+@pytest.fixture(autouse=True)
+def empty_frame_caches(monkeypatch):
+    monkeypatch.setattr(gif_player, "_decoded", OrderedDict())
+    monkeypatch.setattr(gif_player, "_frames", OrderedDict())
+
+
+def make_gif(path, durations):
+    frames = [Image.new("RGB", (40, 40), COLORS[i % len(COLORS)]) for i in range(len(durations))]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations, loop=0)
+    return str(path)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(gif_player.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def player(qapp, in_tmp, clock):
+    label = QLabel()
+    label.resize(20, 20)
+    player = GifPlayer(label)
+    assert player.play(make_gif(in_tmp / "walk.gif", [100] * 5))
+    cycles = []
+    player.cycleFinished.connect(lambda: cycles.append(True))
+    player.cycles = cycles
+    yield player
+    player.stop()
+
+
+def test_frames_are_scaled_cached_and_shared_between_opacities(qapp, in_tmp):
+    gif = make_gif(in_tmp / "idle.gif", [100, 300, 50])
+    frames = load_gif_frames(gif, gif_player.QSize(30, 20))
+    assert len(frames) == 3
+    assert frames.pixmaps[0].width() == 30 and frames.pixmaps[0].height() == 20
+    assert frames.delays == [100, 300, 50]
+    assert load_gif_frames(gif, gif_player.QSize(30, 20)) is frames
+
+    faded = load_gif_frames(gif, gif_player.QSize(30, 20), opacity=0.5)
+    assert faded is not frames
+    assert faded.pixmaps[0].toImage().pixelColor(0, 0).alpha() == pytest.approx(128, abs=2)
+    # 不同透明度共用同一份解码结果
+    assert len(gif_player._decoded) == 1
+
+    assert load_gif_frames(str(in_tmp / "missing.gif"), gif_player.QSize(30, 20)) is None
+
+
+def test_default_delay_for_frames_without_one(qapp, in_tmp):
+    gif = str(in_tmp / "still.gif")
+    frames = [Image.new("RGB", (10, 10), color) for color in COLORS[:2]]
+    frames[0].save(gif, save_all=True, append_images=frames[1:], loop=0)
+    assert load_gif_frames(gif, gif_player.QSize(10, 10)).delays == [DEFAULT_FRAME_DELAY] * 2
+
+
+def test_next_frame_follows_real_time(player, clock):
+    assert player._index == 0
+    clock.advance(250)
+    player._next_frame()
+    # 经过两帧半：跳到第3帧，并记住已经显示了50毫秒
+    assert (player._index, player._elapsed) == (2, 50)
+    assert player._interval() == 50
+
+    # 定时器提前触发时不切换
+    clock.advance(30)
+    player._next_frame()
+    assert player._index == 2
+    assert player._timer.remainingTime() <= 20
+
+    clock.advance(270)
+    player._next_frame()
+    assert (player._index, player._elapsed) == (0, 50)
+    assert player.cycles == [True]
+
+
+def test_long_stall_advances_at_most_one_cycle(player, clock):
+    clock.advance(10_000)
+    player._next_frame()
+    assert (player._index, player._elapsed) == (0, 0)
+    assert player.cycles == [True]
+
+
+def test_max_fps_limits_updates_without_slowing_the_animation(player, clock):
+    player.set_max_fps(4)
+    assert player._interval() == 250
+    shown = []
+    player.frameChanged.connect(shown.append)
+    for _ in range(4):
+        clock.advance(player._interval())
+        player._next_frame()
+    # 1秒内只更新了4次画面，动画仍然前进了10帧（两轮）
+    assert shown == [2, 0, 2, 0]
+    assert player.cycles == [True, True]
+    assert player.effective_fps() == pytest.approx(5 / gif_player.FPS_WINDOW)
+
+
+def test_pause_and_resume_keep_the_current_frame(player, clock):
+    clock.advance(120)
+    player._next_frame()
+    player.pause()
+    assert not player.is_playing() and player.effective_fps() == 0.0
+    clock.advance(5000)
+    player.resume()
+    assert player._index == 1 and player.is_playing()
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+import lib.user_ip as user_ip
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """替换公网IP和地址查询，记录每次网络请求"""
+    calls = {"ip": 0, "address": 0}
+    state = {"ip": "1.2.3.4", "network": "192.168.1.2"}
+
+    def send_ip(self):
+        calls["ip"] += 1
+        return state["ip"]
+
+    def send_address_ip(self, ip):
+        calls["address"] += 1
+        return {"data": {"detail": f"地址-{ip}"}}
+
+    monkeypatch.setattr(user_ip.UserIP, "sendIp", send_ip)
+    monkeypatch.setattr(user_ip.UserIP, "sendAddressIp", send_address_ip)
+    monkeypatch.setattr(user_ip, "_network_fingerprint", lambda: state["network"])
+    return calls, state
+
+
+def test_valid_cache_makes_no_request(tmp_path, lookups):
+    calls, _ = lookups
+    resolver = user_ip.LocationResolver(str(tmp_path / "location.json"), ttl=60)
+    assert resolver.get_address() == "地址-1.2.3.4"
+    assert user_ip.LocationResolver(str(tmp_path / "location.json"), ttl=60).get_address() == "地址-1.2.3.4"
+    assert calls == {"ip": 1, "address": 1}
+
+
+def test_network_change_with_same_ip_only_refreshes(tmp_path, lookups):
+    calls, state = lookups
+    resolver = user_ip.LocationResolver(str(tmp_path / "location.json"), ttl=60)
+    resolver.get_address()
+    state["network"] = "10.0.0.5"
+    assert resolver.get_address() == "地址-1.2.3.4"
+    # 出口IP没有变化，不需要重新查询地址
+    assert calls == {"ip": 2, "address": 1}
+
+    state["network"] = "10.0.0.6"
+    state["ip"] = "5.6.7.8"
+    assert resolver.get_address() == "地址-5.6.7.8"
+    assert calls == {"ip": 3, "address": 2}
+
+
+def test_expired_cache_is_resolved_again(tmp_path, lookups, monkeypatch):
+    calls, _ = lookups
+    resolver = user_ip.LocationResolver(str(tmp_path / "location.json"), ttl=60)
+    resolver.get_address()
+    now = time.time()
+    monkeypatch.setattr(user_ip.time, "time", lambda: now + 61)
+    resolver.get_address()
+    assert calls["ip"] == 2
+    assert resolver.get_cached_address() == "地址-1.2.3.4"
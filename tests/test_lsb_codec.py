@@ -0,0 +1,106 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+from stegano import lsb
+
+from lib import lsb_codec
+
+MESSAGE = '{"FoodName": "红烧肉", "FoodCalories": 500, "FoodTime": "10m"}'
+
+
+def noisy_image(mode, size=(64, 48), seed=0):
+    rng = np.random.default_rng(seed)
+    channels = len(mode)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], channels), dtype=np.uint8), mode)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA"])
+def test_hidden_pixels_match_stegano(mode):
+    image = noisy_image(mode)
+    ours = np.asarray(lsb_codec.hide(image, MESSAGE))
+    theirs = np.asarray(lsb.hide(image, MESSAGE))
+    assert np.array_equal(ours, theirs)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA"])
+def test_reads_messages_written_by_stegano(tmp_path, mode):
+    path = str(tmp_path / "food.png")
+    lsb.hide(noisy_image(mode, seed=1), MESSAGE).save(path)
+    # 文件路径走按行解码PNG的路径，PIL Image 走整图路径
+    assert lsb_codec.reveal(path) == MESSAGE
+    with Image.open(path) as image:
+        assert lsb_codec.reveal(image) == MESSAGE
+
+
+def _paeth(left, up, upper_left):
+    p = left + up - upper_left
+    pa, pb, pc = abs(p - left), abs(p - up), abs(p - upper_left)
+    if pa <= pb and pa <= pc:
+        return left
+    return up if pb <= pc else upper_left
+
+
+def write_png_with_filters(path, pixels):
+    """手工编码PNG，第 i 行使用第 i % 5 种行滤波（None/Sub/Up/Average/Paeth）"""
+    height, width, channels = pixels.shape
+    raw = bytearray()
+    prev = bytes(width * channels)
+    for y in range(height):
+        line = pixels[y].tobytes()
+        filter_type = y % 5
+        out = bytearray()
+        for i, value in enumerate(line):
+            left = line[i - channels] if i >= channels else 0
+            up = prev[i]
+            upper_left = prev[i - channels] if i >= channels else 0
+            predictor = (0, left, up, (left + up) >> 1, _paeth(left, up, upper_left))[filter_type]
+            out.append((value - predictor) & 0xFF)
+        raw += bytes([filter_type]) + out
+        prev = line
+
+    def chunk(chunk_type, data):
+        return (struct.pack(">I", len(data)) + chunk_type + data
+                + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+    color_type = {3: 2, 4: 6}[channels]
+    with open(path, "wb") as f:
+        f.write(lsb_codec.PNG_SIGNATURE)
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(bytes(raw))))
+        f.write(chunk(b"IEND", b""))
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA"])
+def test_png_row_reader_handles_every_filter(tmp_path, mode):
+    pixels = np.asarray(lsb_codec.hide(noisy_image(mode, size=(40, 30), seed=2), MESSAGE * 3))
+    path = str(tmp_path / "filters.png")
+    write_png_with_filters(path, pixels)
+    with Image.open(path) as image:
+        assert np.array_equal(np.asarray(image), pixels)
+
+    reader = lsb_codec._PngRowReader(path)
+    try:
+        assert np.array_equal(reader.rows(30), pixels)
+    finally:
+        reader.close()
+    assert lsb_codec.reveal(path) == MESSAGE * 3
+
+
+def test_image_without_message_raises_like_stegano(tmp_path):
+    path = str(tmp_path / "plain.png")
+    Image.new("RGB", (32, 32), (255, 255, 255)).save(path)
+    with pytest.raises(IndexError):
+        lsb_codec.reveal(path)
+
+
+def test_unsupported_mode_is_reported():
+    with pytest.raises(lsb_codec.UnsupportedImageError):
+        lsb_codec.hide(Image.new("L", (16, 16)), MESSAGE)
+
+
+def test_message_too_long_is_rejected():
+    with pytest.raises(Exception, match="too long"):
+        lsb_codec.hide(noisy_image("RGB", size=(4, 4)), MESSAGE)
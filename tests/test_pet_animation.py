@@ -0,0 +1,96 @@
+import json
+import os
+from collections import OrderedDict
+
+import pytest
+from PIL import Image
+from PyQt6.QtWidgets import QLabel
+
+import lib.gif_player as gif_player
+from lib.gif_player import GifPlayer
+from lib.pet_animation import PetAnimationController
+
+
+@pytest.fixture(autouse=True)
+def empty_frame_caches(monkeypatch):
+    monkeypatch.setattr(gif_player, "_decoded", OrderedDict())
+    monkeypatch.setattr(gif_player, "_frames", OrderedDict())
+
+
+def make_gif(path, color=(255, 0, 0)):
+    frames = [Image.new("RGB", (30, 30), color), Image.new("RGB", (30, 30), (0, 0, 0))]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
+
+
+def touch_folder(folder, offset):
+    """保证文件夹的修改时间与建立索引时不同（有些文件系统的时间精度较低）"""
+    st = os.stat(folder)
+    os.utime(folder, ns=(st.st_atime_ns, st.st_mtime_ns + offset))
+
+
+@pytest.fixture
+def controller(qapp, in_tmp):
+    folder = in_tmp / "gif" / "角色"
+    folder.mkdir(parents=True)
+    for name in ["闭眼.gif", "吃饭.gif", "走路.gif"]:
+        make_gif(folder / name)
+    (in_tmp / "demo_setting.json").write_text(
+        json.dumps({"gif_folder": "gif/角色", "gif": "闭眼.gif", "other": 1}), encoding="utf-8"
+    )
+    label = QLabel()
+    label.resize(20, 20)
+    controller = PetAnimationController(GifPlayer(label))
+    controller.reload_settings()
+    controller.return_to_idle()
+    yield controller
+    controller.player.stop()
+
+
+def test_index_and_preload(controller):
+    assert controller.resolve("eat") == "gif/角色/吃饭.gif"
+    assert controller.resolve("走路.gif") == "gif/角色/走路.gif"
+    assert controller.has_pose("sleep") and not controller.has_pose("happy")
+    assert controller.resolve("不存在.gif") is None
+    # 所有动作都已经按显示尺寸解码
+    assert len(gif_player._frames) == 3
+    assert controller.player.gif_path == "gif/角色/闭眼.gif"
+
+
+def test_gif_added_at_runtime_is_indexed(controller):
+    make_gif(os.path.join("gif", "角色", "开口.gif"), (0, 255, 0))
+    touch_folder(os.path.join("gif", "角色"), 1_000_000)
+    assert controller.has_pose("happy")
+    assert controller.resolve("happy") == "gif/角色/开口.gif"
+
+    make_gif(os.path.join("gif", "角色", "生气.gif"), (0, 0, 255))
+    touch_folder(os.path.join("gif", "角色"), 2_000_000)
+    assert controller.react("angry")
+    assert controller.player.gif_path == "gif/角色/生气.gif"
+
+
+def test_reaction_returns_to_idle_after_its_loops(controller):
+    assert controller.react("eat", loops=2)
+    assert controller.state == "eat"
+    controller.player.cycleFinished.emit()
+    assert controller.state == "eat"
+    controller.player.cycleFinished.emit()
+    assert controller.state == "idle"
+    assert controller.player.gif_path == "gif/角色/闭眼.gif"
+
+    # 角色没有的动作保持当前动作
+    assert not controller.set_state("happy")
+    assert controller.state == "idle"
+
+    assert controller.set_state("walk", duration_ms=60_000)
+    assert controller._return_timer.isActive()
+    controller.return_to_idle()
+    assert not controller._return_timer.isActive()
+
+
+def test_set_idle_persists_other_settings(controller):
+    assert not controller.set_idle("不存在.gif")
+    assert controller.set_idle("走路.gif")
+    assert controller.player.gif_path == "gif/角色/走路.gif"
+    with open("demo_setting.json", encoding="utf-8") as f:
+        setting = json.load(f)
+    assert setting == {"gif_folder": "gif/角色", "gif": "走路.gif", "other": 1}
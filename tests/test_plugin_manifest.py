@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+import textwrap
+
+import plugins_manage
+from plugins_manage import MANIFEST_NAME, PluginManifest, PluginRegistry
+
+
+def write_plugin(folder, name, source):
+    path = folder / f"{name}.py"
+    path.write_text(textwrap.dedent(source), encoding="utf-8")
+    return path
+
+
+def test_listing_plugins_does_not_import_them(tmp_path):
+    write_plugin(tmp_path, "weather", """
+        raise RuntimeError("列出插件时不应导入")
+        def query(city, days=3):
+            pass
+        def register():
+            return query
+    """)
+    registry = PluginRegistry(str(tmp_path))
+    info = registry.list_plugins()["weather"]
+    assert info["entry"] == "query"
+    assert [arg["name"] for arg in info["args"]] == ["city", "days"]
+    assert info["args"][1] == {"name": "days", "required": False, "default": "3"}
+    assert "_yyplugin_weather" not in sys.modules
+
+
+def test_sync_only_rescans_changed_files(tmp_path, monkeypatch):
+    write_plugin(tmp_path, "a", "def register():\n    return register\n")
+    write_plugin(tmp_path, "b", "def register():\n    return register\n")
+    manifest = PluginManifest(tmp_path)
+    assert manifest.sync()
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8")).keys() == {"a", "b"}
+
+    scanned = []
+    original = plugins_manage.scan_plugin_file
+    monkeypatch.setattr(plugins_manage, "scan_plugin_file", lambda path: scanned.append(path.stem) or original(path))
+    # 重新读取磁盘上的清单，模拟重新启动
+    manifest = PluginManifest(tmp_path)
+    assert not manifest.sync()
+    assert scanned == []
+
+    path = tmp_path / "b.py"
+    path.write_text("def go():\n    pass\ndef register():\n    return go\n", encoding="utf-8")
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+    assert manifest.sync()
+    assert scanned == ["b"]
+    assert manifest.entries["b"]["entry"] == "go"
+
+
+def test_removed_or_invalid_plugins_leave_the_manifest(tmp_path):
+    write_plugin(tmp_path, "keep", "def register():\n    return register\n")
+    gone = write_plugin(tmp_path, "gone", "def register():\n    return register\n")
+    write_plugin(tmp_path, "helper", "def not_a_plugin():\n    pass\n")
+    manifest = PluginManifest(tmp_path)
+    manifest.sync()
+    assert set(manifest.entries) == {"keep", "gone"}
+
+    gone.unlink()
+    assert manifest.sync()
+    assert set(manifest.entries) == {"keep"}
@@ -0,0 +1,97 @@
+import json
+import os
+
+import pytest
+
+from lib.plugin_page_widget import MAX_COLS, PluginPageWidget
+
+
+def plugin(description):
+    return {"discription": description, "format": "[X]", "usage": "", "attention": "",
+            "AI_can_use": True, "detailed_info": False}
+
+
+def write_plugins(plugins):
+    os.makedirs("yyskills", exist_ok=True)
+    with open("yyskills/skill_list.json", "w", encoding="utf-8") as f:
+        json.dump(plugins, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def page(qapp, in_tmp):
+    write_plugins({f"p{i}": plugin(f"插件{i}") for i in range(5)})
+    page = PluginPageWidget()
+    yield page
+    page.close()
+
+
+def positions(page):
+    """{插件名称: (行, 列)}"""
+    layout = page.cards_layout
+    result = {}
+    for name, card in page.plugin_cards.items():
+        row, col, _, _ = layout.getItemPosition(layout.indexOf(card))
+        result[name] = (row, col)
+    return result
+
+
+def sync(page, plugins):
+    write_plugins(plugins)
+    page.plugin_manager.load_plugins()
+    page.load_plugins()
+
+
+def expected_positions(order):
+    return {name: (i // MAX_COLS, i % MAX_COLS) for i, name in enumerate(order)}
+
+
+def test_initial_cards_fill_the_grid(page):
+    assert page.card_order == ["p0", "p1", "p2", "p3", "p4"]
+    assert positions(page) == expected_positions(page.card_order)
+    assert page.plugin_cards["p3"].desc_label.text() == "插件3"
+
+
+def test_sync_reuses_unchanged_cards(page):
+    cards = dict(page.plugin_cards)
+    plugins = {f"p{i}": plugin(f"插件{i}") for i in range(5)}
+    del plugins["p1"]
+    plugins["p3"] = plugin("新的描述")
+    plugins["p5"] = plugin("插件5")
+    sync(page, plugins)
+
+    order = ["p0", "p2", "p3", "p4", "p5"]
+    assert page.card_order == order
+    assert positions(page) == expected_positions(order)
+    # 没有变化和只是内容变化的卡片都是原来的对象
+    for name in ["p0", "p2", "p3", "p4"]:
+        assert page.plugin_cards[name] is cards[name]
+    assert page.plugin_cards["p3"].desc_label.text() == "新的描述"
+    assert "p1" not in page.plugin_cards
+    assert page.status_label.text() == "已加载 5 个插件"
+
+
+def test_rename_keeps_position_and_card(page):
+    card = page.plugin_cards["p2"]
+    data = page.plugin_manager.get_plugin("p2")
+    assert page.plugin_manager.delete_plugin("p2")
+    assert page.plugin_manager.add_plugin("重命名", dict(data))
+    page.refresh_card("p2", "重命名")
+    assert page.plugin_cards["重命名"] is card
+    assert card.name_label.text() == "重命名"
+    assert page.card_order[2] == "重命名"
+    assert positions(page)["重命名"] == (1, 0)
+
+
+def test_removing_cards_reflows_and_shows_empty_state(page):
+    assert page.remove_card("p0") == 0
+    assert positions(page) == expected_positions(["p1", "p2", "p3", "p4"])
+    assert page.remove_card("不存在") is None
+    for name in list(page.card_order):
+        page.remove_card(name)
+    assert page.state_label is not None
+    assert page.status_label.text() == "暂无插件"
+
+    # 重新添加插件时移除空状态提示
+    page.create_card("新插件", plugin("描述"))
+    assert page.state_label is None
+    assert positions(page) == {"新插件": (0, 0)}
@@ -0,0 +1,125 @@
+import textwrap
+import threading
+import time
+
+import pytest
+
+from lib.plugin_pool import InlinePluginRunner, PluginProcessPool, to_plain
+
+PLUGINS = {
+    "echo": """
+        def run(value):
+            return value
+        def register():
+            return run
+    """,
+    "custom": """
+        class Box:
+            def __init__(self, value):
+                self.value = value
+            def __repr__(self):
+                return f"Box({self.value})"
+        def run():
+            return {"box": Box(1), "items": [Box(2), 3]}
+        def register():
+            return run
+    """,
+    "sleepy": """
+        import time
+        def run(seconds):
+            time.sleep(seconds)
+            return "awake"
+        def register():
+            return run
+    """,
+    "crash": """
+        import os
+        def run():
+            os._exit(3)
+        def register():
+            return run
+    """,
+}
+
+
+@pytest.fixture(scope="module")
+def plugin_dir(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("plugins")
+    for name, source in PLUGINS.items():
+        (folder / f"{name}.py").write_text(textwrap.dedent(source), encoding="utf-8")
+    return str(folder)
+
+
+@pytest.fixture
+def pool(plugin_dir):
+    pool = PluginProcessPool(plugin_dir=plugin_dir, size=1, timeout=5, memory_limit_mb=0)
+    yield pool
+    pool.shutdown()
+
+
+def assert_pool_intact(pool):
+    """工作进程要么归还，要么被替换，空闲队列中始终有 size 个进程"""
+    assert len(pool._workers) == pool.size
+    assert pool._idle.qsize() == pool.size
+
+
+def test_to_plain_keeps_builtins_and_reprs_the_rest():
+    class Custom:
+        def __repr__(self):
+            return "Custom()"
+
+    assert to_plain({"a": [1, 2.5, None, (True, b"x")]}) == {"a": [1, 2.5, None, (True, b"x")]}
+    assert to_plain({"a": Custom(), "b": {Custom()}}) == {"a": "Custom()", "b": {"Custom()"}}
+
+
+def test_call_returns_result_and_records_stats(pool):
+    result = pool.call("echo", ("hi",))
+    assert result["ok"] and result["result"] == "hi"
+    assert pool.get_stats()["echo"]["calls"] == 1
+
+
+def test_plugin_defined_classes_come_back_as_repr(pool):
+    result = pool.call("custom")
+    assert result["result"] == {"box": "Box(1)", "items": ["Box(2)", 3]}
+    assert_pool_intact(pool)
+
+
+def test_unpicklable_arguments_do_not_leak_the_worker(pool):
+    for _ in range(pool.size + 2):
+        result = pool.call("echo", (threading.Lock(),))
+        assert not result["ok"] and "无法传递" in result["error"]
+    assert_pool_intact(pool)
+    assert pool.call("echo", (1,))["result"] == 1
+
+
+def test_crashed_worker_is_replaced(pool):
+    assert not pool.call("crash")["ok"]
+    assert_pool_intact(pool)
+    assert pool.call("echo", (2,))["result"] == 2
+
+
+def test_timed_out_worker_is_replaced(pool):
+    result = pool.call("sleepy", (10,), timeout=0.5)
+    assert not result["ok"] and "超时" in result["error"]
+    assert pool.get_stats()["sleepy"]["timeouts"] == 1
+    assert_pool_intact(pool)
+
+
+def test_waiting_for_a_busy_pool_counts_against_the_timeout(pool):
+    busy = threading.Thread(target=pool.call, args=("sleepy", (1.5,)))
+    busy.start()
+    time.sleep(0.3)
+    start = time.perf_counter()
+    result = pool.call("echo", (3,), timeout=0.3)
+    elapsed = time.perf_counter() - start
+    busy.join()
+    assert not result["ok"] and "等待空闲插件进程超时" in result["error"]
+    assert elapsed < 1.0
+    assert_pool_intact(pool)
+
+
+def test_inline_runner_has_the_same_result_shape(plugin_dir):
+    runner = InlinePluginRunner(plugin_dir=plugin_dir)
+    assert runner.call("echo", ("x",))["result"] == "x"
+    missing = runner.call("missing")
+    assert not missing["ok"] and "未找到" in missing["error"]
@@ -0,0 +1,108 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
+from plugins_manage import PluginRegistry
+
+
+def write_plugin(folder, name, source, mtime=None):
+    path = folder / f"{name}.py"
+    path.write_text(textwrap.dedent(source), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    folder = tmp_path / "plugins"
+    folder.mkdir()
+    yield folder
+    for key in [key for key in sys.modules if key.startswith("_yyplugin_")]:
+        del sys.modules[key]
+
+
+def test_plugin_is_hot_reloaded_when_its_file_changes(plugin_dir):
+    write_plugin(plugin_dir, "greet", """
+        def run():
+            return "v1"
+        def register():
+            return run
+    """, mtime=1_000_000)
+    registry = PluginRegistry(str(plugin_dir))
+    assert registry.get("greet")() == "v1"
+    first = sys.modules["_yyplugin_greet"]
+
+    write_plugin(plugin_dir, "greet", """
+        def run():
+            return "v2"
+        def register():
+            return run
+    """, mtime=1_000_100)
+    assert registry.get("greet")() == "v2"
+    assert sys.modules["_yyplugin_greet"] is not first
+
+
+def test_unchanged_plugin_is_imported_once(plugin_dir):
+    write_plugin(plugin_dir, "counter", """
+        import builtins
+        builtins.counter_imports = getattr(builtins, "counter_imports", 0) + 1
+        def register():
+            return lambda: None
+    """)
+    registry = PluginRegistry(str(plugin_dir))
+    for _ in range(3):
+        registry.get("counter")
+    import builtins
+    try:
+        assert builtins.counter_imports == 1
+    finally:
+        del builtins.counter_imports
+
+
+def test_module_is_registered_before_it_executes(plugin_dir):
+    # 依赖 sys.modules 中已有自身模块：dataclass 前向引用、导入时序列化自己的类
+    write_plugin(plugin_dir, "selfref", """
+        from __future__ import annotations
+        import dataclasses
+        import pickle
+
+        @dataclasses.dataclass
+        class Node:
+            name: str
+            child: Node | None = None
+
+        pickle.loads(pickle.dumps(Node("root")))
+
+        def run():
+            return repr(Node("a", Node("b")))
+
+        def register():
+            return run
+    """)
+    registry = PluginRegistry(str(plugin_dir))
+    assert registry.get("selfref")() == "Node(name='a', child=Node(name='b', child=None))"
+
+
+def test_failed_import_leaves_no_module_behind(plugin_dir):
+    write_plugin(plugin_dir, "broken", """
+        def register():
+            return run
+        raise ValueError("boom")
+    """)
+    registry = PluginRegistry(str(plugin_dir))
+    assert registry.get("broken") is None
+    assert "_yyplugin_broken" not in sys.modules
+
+
+def test_deleted_plugin_disappears(plugin_dir):
+    path = write_plugin(plugin_dir, "gone", """
+        def register():
+            return lambda: "here"
+    """)
+    registry = PluginRegistry(str(plugin_dir))
+    assert registry.get("gone")() == "here"
+    path.unlink()
+    assert registry.get("gone") is None
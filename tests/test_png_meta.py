@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lib import png_meta
+from lib.food_manager import FoodVerification
+
+TEXT = json.dumps({"FoodName": "番茄炒蛋", "FoodDescription": "家常菜"}, ensure_ascii=False)
+
+
+@pytest.fixture
+def png(tmp_path):
+    path = str(tmp_path / "food.png")
+    rng = np.random.default_rng(0)
+    Image.fromarray(rng.integers(0, 256, (20, 20, 3), dtype=np.uint8), "RGB").save(path)
+    return path
+
+
+def test_itxt_round_trip_leaves_pixels_untouched(png):
+    with Image.open(png) as image:
+        before = np.asarray(image).copy()
+    assert png_meta.read_food_chunk(png) is None
+
+    png_meta.write_food_chunk(png, TEXT)
+    assert png_meta.read_food_chunk(png) == TEXT
+    with Image.open(png) as image:
+        assert np.array_equal(np.asarray(image), before)
+        image.load()
+        # 其他程序也能读到标准的 iTXt 文本块
+        assert image.text[png_meta.FOOD_KEYWORD.decode()] == TEXT
+
+
+def test_rewriting_replaces_the_previous_chunk(png):
+    png_meta.write_food_chunk(png, TEXT)
+    png_meta.write_food_chunk(png, "第二版")
+    assert png_meta.read_food_chunk(png) == "第二版"
+    with open(png, "rb") as f:
+        assert f.read().count(png_meta.FOOD_KEYWORD + b"\0") == 1
+
+
+def test_non_png_is_ignored_and_rejected(tmp_path):
+    path = str(tmp_path / "food.jpg")
+    Image.new("RGB", (8, 8)).save(path, "JPEG")
+    assert png_meta.read_food_chunk(path) is None
+    with pytest.raises(ValueError):
+        png_meta.write_food_chunk(path, TEXT)
+
+
+def test_decode_prefers_the_text_chunk(png, monkeypatch):
+    FoodVerification.save_food_image(FoodVerification.lsb_hide(png, TEXT), TEXT, png)
+    monkeypatch.setattr(FoodVerification, "lsb_reveal",
+                        staticmethod(lambda path: pytest.fail("有文本块时不应解码像素")))
+    success, data = FoodVerification.decode_food_info(png)
+    assert success and data["FoodName"] == "番茄炒蛋"
+    assert data["FoodType"] == "未知类型"
+
+
+def test_upgrade_copies_lsb_payload_into_a_chunk(tmp_path):
+    folder = tmp_path / "food"
+    folder.mkdir()
+    path = str(folder / "old.png")
+    FoodVerification.lsb_hide(Image.new("RGB", (40, 40), (200, 100, 50)), TEXT).save(path)
+
+    report = png_meta.upgrade_folders([str(folder)])
+    assert report == {"upgraded": 1, "skipped": 0, "failed": []}
+    assert png_meta.read_food_chunk(path) == TEXT
+    assert png_meta.upgrade_folders([str(folder)])["skipped"] == 1
@@ -0,0 +1,122 @@
+import json
+import time
+
+import pytest
+from PyQt6 import sip
+from PyQt6.QtCore import Qt, qInstallMessageHandler
+
+import lib.food_index as food_index
+import lib.food_manager as food_manager
+from lib.food_manager import FoodFilterProxyModel, FoodListModel, FoodVerification, RecipePopup
+
+FOODS = [
+    ("apple", {"FoodName": "苹果", "FoodType": "水果", "FoodCalories": 52, "FoodWater": 86, "FoodDescription": "脆甜"}),
+    ("rice", {"FoodName": "米饭", "FoodType": "主食", "FoodCalories": 116, "FoodWater": 70, "FoodDescription": "白米"}),
+    ("cake", {"FoodName": "蛋糕", "FoodType": "甜点", "FoodCalories": 347, "FoodWater": 20, "FoodDescription": "奶油"}),
+    ("plain", None),
+]
+
+
+@pytest.fixture
+def food_folder(in_tmp, monkeypatch):
+    monkeypatch.setattr(food_index, "_index", None)
+    monkeypatch.setattr(food_manager.LogManager, "init_logging", lambda *args, **kwargs: None)
+    folder = in_tmp / "outfood"
+    folder.mkdir()
+    from PIL import Image
+    for name, info in FOODS:
+        image = Image.new("RGB", (60, 40), (200, 120, 40))
+        if info is not None:
+            image = FoodVerification.lsb_hide(image, json.dumps(info, ensure_ascii=False))
+        image.save(folder / f"{name}.png")
+    yield folder
+    index = food_index._index
+    if index is not None and index._conn is not None:
+        index._conn.close()
+
+
+def wait_until(qapp, condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def visible_names(proxy):
+    return sorted(proxy.index(row, 0).data() for row in range(proxy.rowCount()))
+
+
+def test_filter_by_keyword_type_and_numeric_conditions(qapp, food_folder):
+    paths = sorted(str(path) for path in food_folder.iterdir())
+    model = FoodListModel(paths)
+    try:
+        assert wait_until(qapp, lambda: len(model._info) == len(paths))
+        proxy = FoodFilterProxyModel()
+        proxy.setSourceModel(model)
+        assert visible_names(proxy) == ["plain", "米饭", "苹果", "蛋糕"]
+        assert model.food_types() == ["主食", "水果", "甜点"]
+
+        proxy.set_query("热量>100")
+        assert visible_names(proxy) == ["米饭", "蛋糕"]
+        proxy.set_query("热量 >= 52 水分<80")
+        assert visible_names(proxy) == ["米饭", "蛋糕"]
+        proxy.set_query("热量=52")
+        assert visible_names(proxy) == ["苹果"]
+        # 关键字匹配名称、类型、描述和文件名，不区分大小写
+        proxy.set_query("奶油")
+        assert visible_names(proxy) == ["蛋糕"]
+        proxy.set_query("APPLE")
+        assert visible_names(proxy) == ["苹果"]
+        proxy.set_query("")
+        proxy.set_food_type("主食")
+        assert visible_names(proxy) == ["米饭"]
+        proxy.set_food_type(None)
+        assert proxy.rowCount() == len(paths)
+        apple = model.index(model._rows[str(food_folder / "apple.png")])
+        assert apple.data(Qt.ItemDataRole.ToolTipRole) == "水果  热量: 52  水分: 86"
+    finally:
+        model.stop(food_manager.STOP_WAIT_MS)
+
+
+def test_popup_keeps_loading_after_close_and_stops_on_quit(qapp, food_folder):
+    popup = RecipePopup(str(food_folder))
+    model = popup.food_model
+    thumbnails, info_loader = model.thumbnails, model.info_loader
+
+    # 弹窗只是被关闭（隐藏），之后还会再次显示，缩略图线程要继续工作
+    popup.show()
+    popup.close()
+    assert thumbnails._thread.is_alive()
+    path = str(food_folder / "apple.png")
+    model.data(model.index(model._rows[path]), Qt.ItemDataRole.DecorationRole)
+    assert wait_until(qapp, lambda: path in model._pixmaps)
+
+    qapp.aboutToQuit.emit()
+    assert not thumbnails._thread.is_alive()
+    assert info_loader.isFinished()
+    sip.delete(popup)
+
+
+def test_destroying_popup_waits_for_threads(qapp, food_folder, monkeypatch):
+    extract = FoodVerification.extract_food_info
+
+    def slow_extract(image_path):
+        time.sleep(0.2)
+        return extract(image_path)
+
+    monkeypatch.setattr(FoodVerification, "extract_food_info", staticmethod(slow_extract))
+    messages = []
+    previous = qInstallMessageHandler(lambda mode, context, message: messages.append(message))
+    try:
+        popup = RecipePopup(str(food_folder))
+        thumbnails, info_loader = popup.food_model.thumbnails, popup.food_model.info_loader
+        assert wait_until(qapp, info_loader.isRunning)
+        sip.delete(popup)
+    finally:
+        qInstallMessageHandler(previous)
+    # 线程在 QThread 对象销毁前已经结束
+    assert sip.isdeleted(info_loader)
+    assert not any("Destroyed while thread" in message for message in messages)
+    thumbnails._thread.join(5)
+    assert not thumbnails._thread.is_alive()
@@ -0,0 +1,63 @@
+import json
+import os
+
+import pytest
+
+import lib.skill_catalog as catalog
+
+SKILL_MD = """# 技能说明
+
+**使用方法**: 输出 `[USESKILLS:名称:参数]`
+
+## 3. 更多技能列表
+skill_list.json 字段说明……
+"""
+
+SKILLS = {
+    "weather": {"discription": "查询天气", "format": "[USESKILLS:weather:城市]", "AI_can_use": True},
+    "secret": {"discription": "内部技能", "format": "-", "AI_can_use": False},
+    "guide": {"discription": "使用说明", "format": "[USESKILLS:guide:guide]", "AI_can_use": True,
+              "detailed_info": True},
+}
+
+
+@pytest.fixture
+def skill_files(tmp_path, monkeypatch):
+    for name in ("_stat_key", "_content_hash", "_compiled"):
+        monkeypatch.setattr(catalog, name, None)
+    md_path = tmp_path / "SKILL.md"
+    list_path = tmp_path / "skill_list.json"
+    md_path.write_text(SKILL_MD, encoding="utf-8")
+    list_path.write_text(json.dumps(SKILLS, ensure_ascii=False), encoding="utf-8")
+    return str(md_path), str(list_path)
+
+
+def test_catalog_keeps_only_usable_skills_in_compact_form(skill_files):
+    compiled = catalog.compile_skill_catalog(*skill_files)
+    assert "使用方法: 输出 [USESKILLS:名称:参数]" in compiled
+    assert "字段说明" not in compiled
+    assert "weather|查询天气|[USESKILLS:weather:城市]" in compiled
+    assert "guide|使用说明|[USESKILLS:guide:guide]|可调用获取详细说明" in compiled
+    assert "secret" not in compiled
+    assert catalog.estimate_tokens(compiled) < catalog.estimate_tokens(SKILL_MD + json.dumps(SKILLS))
+
+
+def test_catalog_is_recompiled_only_when_content_changes(skill_files, monkeypatch):
+    md_path, list_path = skill_files
+    first = catalog.compile_skill_catalog(md_path, list_path)
+    assert catalog.compile_skill_catalog(md_path, list_path) is first
+
+    # 只改变修改时间，内容没变时不重新编译
+    compiled = []
+    original = catalog._compact_skill_list
+    monkeypatch.setattr(catalog, "_compact_skill_list", lambda skills: compiled.append(1) or original(skills))
+    st = os.stat(list_path)
+    os.utime(list_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    assert catalog.compile_skill_catalog(md_path, list_path) is first
+    assert compiled == []
+
+    skills = dict(SKILLS, secret=dict(SKILLS["secret"], AI_can_use=True))
+    with open(list_path, "w", encoding="utf-8") as f:
+        json.dump(skills, f, ensure_ascii=False)
+    assert "secret|内部技能" in catalog.compile_skill_catalog(md_path, list_path)
+    assert compiled == [1]
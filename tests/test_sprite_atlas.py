@@ -0,0 +1,100 @@
+import os
+
+import pytest
+from PIL import Image
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage
+
+import lib.sprite_atlas as sprite_atlas
+from lib.gif_player import decode_gif
+from lib.sprite_atlas import _anchor, atlas_index_path, get_atlas, pack_folder
+
+SIZE = 24
+
+
+def make_gif(path, colors, duration=80):
+    frames = [Image.new("RGB", (48, 48), color) for color in colors]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=duration, loop=0)
+
+
+@pytest.fixture
+def character(in_tmp, monkeypatch):
+    monkeypatch.setattr(sprite_atlas, "_atlases", {})
+    folder = in_tmp / "gif" / "角色"
+    folder.mkdir(parents=True)
+    make_gif(folder / "走路.gif", [(255, 0, 0), (0, 255, 0), (0, 0, 255)])
+    make_gif(folder / "闭眼.gif", [(10, 20, 30), (40, 50, 60)], duration=200)
+    (folder / "broken.gif").write_bytes(b"GIF89a")
+    return str(folder)
+
+
+def assert_same_frames(atlas_frames, decoded):
+    images, delays = atlas_frames
+    assert delays == decoded[1]
+    assert len(images) == len(decoded[0])
+    for image, expected in zip(images, decoded[0]):
+        assert image == expected
+
+
+def test_pack_writes_only_under_cache_and_round_trips(character):
+    report = pack_folder(character, SIZE, SIZE)
+    assert (report["animations"], report["frames"], report["failed"]) == (2, 5, ["broken.gif"])
+    assert report["atlas_bytes"] == 5 * SIZE * SIZE * 4
+    assert sorted(os.listdir(character)) == ["broken.gif", "走路.gif", "闭眼.gif"]
+    index_path = atlas_index_path(character, SIZE, SIZE)
+    assert os.path.dirname(index_path).startswith(os.path.join("cache", "atlas", "角色_"))
+
+    atlas = get_atlas(character, SIZE, SIZE)
+    assert sorted(atlas.names()) == ["走路.gif", "闭眼.gif"]
+    assert get_atlas(character, SIZE, SIZE) is atlas
+    for name in atlas.names():
+        gif_path = os.path.join(character, name)
+        assert_same_frames(atlas.frames(gif_path), decode_gif(gif_path, QSize(SIZE, SIZE)))
+    assert atlas.frames(os.path.join(character, "broken.gif")) is None
+    # 其他尺寸没有图集
+    assert get_atlas(character, SIZE * 2, SIZE * 2) is None
+
+
+def test_repack_while_mapped_uses_a_new_sheet(character):
+    pack_folder(character, SIZE, SIZE)
+    old = get_atlas(character, SIZE, SIZE)
+    old_frames = old.frames(os.path.join(character, "走路.gif"))
+
+    make_gif(os.path.join(character, "开口.gif"), [(9, 9, 9)])
+    pack_folder(character, SIZE, SIZE)
+    new = get_atlas(character, SIZE, SIZE)
+    assert new is not old and new.sheet_path != old.sheet_path
+    assert new.has("开口.gif")
+    sheets = [name for name in os.listdir(os.path.dirname(new.sheet_path)) if name.endswith(".rgba")]
+    assert sheets == [os.path.basename(new.sheet_path)]
+    # 之前打开的图集仍然可以读取
+    assert_same_frames(old.frames(os.path.join(character, "走路.gif")), old_frames)
+
+
+def test_changed_or_missing_source_falls_back(character):
+    pack_folder(character, SIZE, SIZE)
+    atlas = get_atlas(character, SIZE, SIZE)
+    walk = os.path.join(character, "走路.gif")
+    make_gif(walk, [(1, 2, 3)] * 4)
+    assert atlas.frames(walk) is None
+    os.remove(os.path.join(character, "闭眼.gif"))
+    assert atlas.frames(os.path.join(character, "闭眼.gif")) is None
+
+
+def test_truncated_sheet_is_ignored(character):
+    pack_folder(character, SIZE, SIZE)
+    sheet_path = get_atlas(character, SIZE, SIZE).sheet_path
+    sprite_atlas._atlases.clear()
+    with open(sheet_path, "r+b") as f:
+        f.truncate(SIZE * SIZE * 4)
+    assert get_atlas(character, SIZE, SIZE) is None
+
+
+def test_anchor_is_bottom_centre_of_opaque_area():
+    image = QImage(20, 20, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QColor(0, 0, 0, 0))
+    assert _anchor(image) == [10, 20]
+    for x in range(4, 10):
+        for y in range(2, 16):
+            image.setPixelColor(x, y, QColor(255, 0, 0))
+    assert _anchor(image) == [7, 16]
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from PyQt6.QtWidgets import QLabel
+
+import lib.style_registry as style_registry
+from lib.style_registry import apply_style_sheet, cached_style, load_qss
+
+
+@pytest.fixture(autouse=True)
+def empty_qss_cache(monkeypatch):
+    monkeypatch.setattr(style_registry, "_qss_files", {})
+
+
+def test_cached_style_builds_once_per_arguments():
+    calls = []
+
+    @cached_style
+    def button_style(color, radius=4):
+        calls.append((color, radius))
+        return f"QPushButton {{ background: {color}; border-radius: {radius}px; }}"
+
+    first = button_style("#fff")
+    assert button_style("#fff") is first
+    button_style("#000", radius=8)
+    assert calls == [("#fff", 4), ("#000", 8)]
+
+
+def test_load_qss_rereads_only_after_change(in_tmp):
+    path = in_tmp / "theme.qss"
+    path.write_text("QWidget { color: red; }", encoding="utf-8")
+    assert load_qss(str(path)) == "QWidget { color: red; }"
+
+    # 内容变了但修改时间相同时仍然使用缓存，说明没有重新读取
+    st = os.stat(path)
+    path.write_text("QWidget { color: blue; }", encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert load_qss(str(path)) == "QWidget { color: red; }"
+
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_qss(str(path)) == "QWidget { color: blue; }"
+
+    os.remove(path)
+    assert load_qss(str(path)) == ""
+    assert str(path) not in style_registry._qss_files
+
+
+def test_load_qss_unreadable_file(in_tmp):
+    path = in_tmp / "broken.qss"
+    path.write_bytes(b"\xff\xfe\xfa")
+    assert load_qss(str(path)) == ""
+
+
+def test_apply_style_sheet_skips_identical_style(qapp):
+    label = QLabel()
+    style = "QLabel { color: red; }"
+    assert apply_style_sheet(label, style)
+    assert not apply_style_sheet(label, style)
+    assert apply_style_sheet(label, "")
+    assert label.styleSheet() == ""
+
+
+def test_glass_buttons_share_one_style_sheet(qapp):
+    from lib.glass_button_lib import glass_button_style
+    assert glass_button_style((10, 20, 30, 200), 12) is glass_button_style((10, 20, 30, 200), 12)
+    assert glass_button_style((10, 20, 30, 200), 12, pressed=False) != glass_button_style((10, 20, 30, 200), 12)
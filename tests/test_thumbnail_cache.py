@@ -0,0 +1,92 @@
+import os
+import time
+from collections import OrderedDict
+
+import pytest
+from PyQt6.QtGui import QColor, QImage
+
+import lib.thumbnail_cache as thumbnail_cache
+from lib.thumbnail_cache import ThumbnailProvider, load_thumbnail
+
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache(monkeypatch):
+    monkeypatch.setattr(thumbnail_cache, "_memory_cache", OrderedDict())
+
+
+def make_image(path, color, size=(200, 100)):
+    image = QImage(*size, QImage.Format.Format_RGB32)
+    image.fill(QColor(color))
+    assert image.save(str(path))
+    return str(path)
+
+
+def cache_files():
+    return os.listdir(thumbnail_cache.THUMBNAIL_DIR)
+
+
+def test_thumbnail_is_scaled_and_written_to_disk(qapp, in_tmp):
+    source = make_image(in_tmp / "food.png", "red")
+    image = load_thumbnail(source, 50, 50)
+    assert (image.width(), image.height()) == (50, 25)
+    assert len(cache_files()) == 1
+
+    # 同一次运行中直接返回内存中的对象
+    assert load_thumbnail(source, 50, 50) is image
+    # 不同的目标尺寸是不同的缓存
+    assert load_thumbnail(source, 20, 20).width() == 20
+    assert len(cache_files()) == 2
+
+
+def test_disk_cache_is_used_until_the_source_changes(qapp, in_tmp, monkeypatch):
+    source = make_image(in_tmp / "food.png", "red")
+    load_thumbnail(source, 50, 50)
+    # 把磁盘上的缩略图换成蓝色，新的一次运行应该读到它而不是重新缩放原图
+    cached_path = os.path.join(thumbnail_cache.THUMBNAIL_DIR, cache_files()[0])
+    make_image(cached_path, "blue", (50, 25))
+    monkeypatch.setattr(thumbnail_cache, "_memory_cache", OrderedDict())
+    assert load_thumbnail(source, 50, 50).pixelColor(0, 0) == QColor("blue")
+
+    # 原图内容变化后重新生成
+    make_image(source, "green", (300, 100))
+    image = load_thumbnail(source, 50, 50)
+    assert image.pixelColor(0, 0) == QColor("green")
+    assert (image.width(), image.height()) == (50, 16)
+
+
+def test_missing_or_unreadable_source(qapp, in_tmp):
+    assert load_thumbnail(str(in_tmp / "missing.png"), 50, 50) is None
+    (in_tmp / "broken.png").write_bytes(b"not an image")
+    assert load_thumbnail(str(in_tmp / "broken.png"), 50, 50) is None
+
+
+def test_memory_cache_drops_least_recently_used(qapp, in_tmp, monkeypatch):
+    monkeypatch.setattr(thumbnail_cache, "MEMORY_CACHE_SIZE", 2)
+    paths = [make_image(in_tmp / f"{i}.png", "red") for i in range(3)]
+    first = load_thumbnail(paths[0], 10, 10)
+    load_thumbnail(paths[1], 10, 10)
+    assert load_thumbnail(paths[0], 10, 10) is first
+    load_thumbnail(paths[2], 10, 10)
+    assert len(thumbnail_cache._memory_cache) == 2
+    assert load_thumbnail(paths[0], 10, 10) is first
+    assert load_thumbnail(paths[1], 10, 10) is not None
+
+
+def test_provider_reports_ready_and_failed_then_stops(qapp, in_tmp):
+    good = make_image(in_tmp / "food.png", "red")
+    bad = str(in_tmp / "missing.png")
+    ready, failed = [], []
+    provider = ThumbnailProvider(40, 40)
+    provider.thumbnail_ready.connect(lambda path, image: ready.append((path, image.width())))
+    provider.thumbnail_failed.connect(failed.append)
+    provider.request(good)
+    provider.request(bad)
+    deadline = time.monotonic() + 5
+    while len(ready) + len(failed) < 2 and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    assert ready == [(good, 40)]
+    assert failed == [bad]
+
+    provider.stop(timeout=5)
+    assert not provider._thread.is_alive()
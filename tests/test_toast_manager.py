@@ -0,0 +1,115 @@
+import pytest
+from PyQt6 import sip
+from PyQt6.QtWidgets import QWidget
+
+import lib.temp_message_box as temp_message_box
+from lib.temp_message_box import BUSY_DURATION, MAX_QUEUED, MAX_VISIBLE, TOAST_SPACING, ToastManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 50.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(temp_message_box.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def manager(qapp, clock):
+    manager = ToastManager()
+    yield manager
+    manager.clear()
+
+
+@pytest.fixture
+def parent(qapp):
+    window = QWidget()
+    window.setGeometry(100, 100, 400, 300)
+    yield window
+    if not sip.isdeleted(window):
+        window.close()
+
+
+def advance(manager, clock, ms):
+    """时间前进 ms 毫秒并触发一次定时器"""
+    clock.now += ms / 1000
+    manager._tick()
+
+
+def messages(manager):
+    return [toast.label.text() for toast in manager._active]
+
+
+def test_same_message_is_merged(manager, clock, parent):
+    toast = manager.show_message(parent, "已保存")
+    assert manager.show_message(parent, "已保存", duration=3000) is toast
+    assert messages(manager) == ["已保存 ×2"]
+    assert toast.duration == 3000
+
+    # 正在淡出的消息再次出现时恢复为不透明并重新计时
+    advance(manager, clock, 3500)
+    assert toast.windowOpacity() == pytest.approx(0.5, abs=0.05)
+    manager.show_message(parent, "已保存")
+    assert toast.windowOpacity() == 1.0 and toast.elapsed == 0
+    assert messages(manager) == ["已保存 ×3"]
+
+
+def test_extra_messages_queue_and_show_faster(manager, clock, parent):
+    for i in range(MAX_VISIBLE + 2):
+        manager.show_message(parent, f"消息{i}", duration=5000, fade_duration=100)
+    assert messages(manager) == ["消息0", "消息1", "消息2"]
+    assert manager.show_message(parent, "消息4") is None
+    assert [entry[1:3] for entry in manager._queue] == [["消息3", 1], ["消息4", 2]]
+
+    # 有消息排队时每条消息最多显示 BUSY_DURATION
+    advance(manager, clock, BUSY_DURATION + 100)
+    assert messages(manager) == ["消息3", "消息4 ×2"]
+    assert not manager._queue
+
+    # 队列空了以后按原本的时长显示
+    advance(manager, clock, 4000)
+    assert len(manager._active) == 2
+    advance(manager, clock, 1100)
+    assert manager._active == [] and not manager._timer.isActive()
+
+
+def test_toasts_are_stacked_and_reused(manager, clock, parent):
+    first = manager.show_message(parent, "第一条")
+    second = manager.show_message(parent, "第二条")
+    assert second.y() == first.y() + first.height() + TOAST_SPACING
+    assert first.x() == parent.geometry().x() + (parent.width() - first.width()) // 2
+
+    advance(manager, clock, 1600)
+    advance(manager, clock, 1000)
+    assert manager._active == []
+    # 消息框回到池中，下一条消息复用它
+    assert manager.show_message(parent, "第三条") in (first, second)
+
+
+def test_queue_is_bounded_and_drops_destroyed_parents(manager, parent):
+    other = QWidget()
+    for i in range(MAX_VISIBLE):
+        manager.show_message(parent, f"显示{i}")
+    for i in range(MAX_QUEUED + 5):
+        manager.show_message(other, f"排队{i}")
+    assert len(manager._queue) == MAX_QUEUED
+    assert manager._queue[0][1] == "排队5"
+
+    sip.delete(other)
+    manager.show_message(parent, "显示0")
+    assert not manager._queue
+
+
+def test_toasts_destroyed_with_parent_are_forgotten(manager, clock, parent):
+    manager.show_message(parent, "消息")
+    sip.delete(parent)
+    advance(manager, clock, 100)
+    assert manager._active == [] and manager._pool == []
+    assert manager.show_message(None, "没有父窗口") is not None
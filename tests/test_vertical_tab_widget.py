@@ -0,0 +1,80 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+from PyQt6 import sip
+from PyQt6.QtCore import qInstallMessageHandler
+from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+
+class FakeChatWidget(QWidget):
+    """代替聊天页（真实的聊天页需要AI接口配置）"""
+
+    def __init__(self, font_manager=None):
+        super().__init__()
+
+
+@pytest.fixture
+def tab_widget(qapp, in_tmp, monkeypatch):
+    monkeypatch.setitem(sys.modules, "lib.chat_widget", types.SimpleNamespace(ChatWidget=FakeChatWidget))
+    from lib.vertical_tab_widget import VerticalTabWidget
+    return VerticalTabWidget()
+
+
+def wait_until(qapp, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_deferred_widget_replaces_placeholder(qapp, tab_widget):
+    page = QWidget(tab_widget)
+    layout = QVBoxLayout(page)
+    tab_widget.defer_widget(layout, lambda: QLabel("真实内容"), "正在加载...")
+    assert layout.itemAt(0).widget().text() == "正在加载..."
+    assert wait_until(qapp, lambda: layout.itemAt(0).widget().text() == "真实内容")
+    assert layout.count() == 1
+
+
+def test_deferred_build_skipped_after_widget_is_destroyed(qapp, tab_widget):
+    calls = []
+    layout = QVBoxLayout(QWidget(tab_widget))
+    tab_widget.defer_widget(layout, lambda: calls.append(True) or QLabel(), "正在加载...")
+    sip.delete(tab_widget)
+    for _ in range(5):
+        qapp.processEvents()
+    assert calls == []
+
+
+def test_background_result_arrives_in_ui_thread(qapp, tab_widget):
+    results = []
+    tab_widget.run_in_background(lambda: threading.get_ident(), results.append)
+    assert wait_until(qapp, lambda: results and not tab_widget._loaders)
+    assert results[0] != threading.get_ident()
+
+    errors = []
+    tab_widget.run_in_background(lambda: 1 / 0, results.append, errors.append)
+    assert wait_until(qapp, lambda: errors)
+    assert "division by zero" in errors[0]
+
+
+@pytest.mark.parametrize("close_first", [True, False])
+def test_running_loaders_finish_before_destruction(qapp, tab_widget, close_first):
+    tab_widget.run_in_background(lambda: time.sleep(0.3), lambda result: None)
+    loader = tab_widget._loaders[0]
+    assert loader.isRunning()
+    messages = []
+    previous = qInstallMessageHandler(lambda mode, context, message: messages.append(message))
+    try:
+        if close_first:
+            tab_widget.close()
+            assert loader.isFinished()
+        sip.delete(tab_widget)
+    finally:
+        qInstallMessageHandler(previous)
+    assert sip.isdeleted(loader)
+    assert not any("Destroyed while thread" in message for message in messages)
@@ -0,0 +1,76 @@
+import json
+import time
+
+import pytest
+
+import lib.getWeather as weather
+
+
+CURRENT = {"temp": 21, "cap": "晴", "windDir": 90}
+PAYLOAD = {"responses": [{"weather": [{"current": CURRENT}]}]}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def caches(tmp_path, monkeypatch):
+    """每个测试使用独立的接口地址缓存文件和空的结果缓存"""
+    monkeypatch.setattr(weather, "ENDPOINT_CACHE_FILE", str(tmp_path / "cache" / "weather_endpoints.json"))
+    monkeypatch.setattr(weather, "_endpoint_cache", None)
+    monkeypatch.setattr(weather, "_weather_cache", {})
+    return tmp_path
+
+
+def test_endpoint_cache_persists_to_disk(caches, monkeypatch):
+    weather.save_endpoint("北京", "https://example/overview?apikey=1")
+    monkeypatch.setattr(weather, "_endpoint_cache", None)  # 模拟重新启动
+    assert weather.get_cached_endpoint("北京") == "https://example/overview?apikey=1"
+
+    weather.save_endpoint("北京", None)
+    with open(weather.ENDPOINT_CACHE_FILE, encoding="utf-8") as f:
+        assert json.load(f) == {}
+
+
+def test_weather_result_expires_after_ttl(caches, monkeypatch):
+    weather.put_cached_weather("上海", CURRENT)
+    assert weather.get_cached_weather("上海", ttl=60) == CURRENT
+    now = time.time()
+    monkeypatch.setattr(weather.time, "time", lambda: now + 61)
+    assert weather.get_cached_weather("上海", ttl=60) is None
+
+
+def test_cached_endpoint_skips_browser(caches, monkeypatch):
+    weather.save_endpoint("广州", "https://example/cached")
+    requested = []
+    monkeypatch.setattr(weather.requests, "get", lambda url, timeout: requested.append(url) or FakeResponse(PAYLOAD))
+    monkeypatch.setattr(weather.MSWeather, "_discover_endpoint",
+                        lambda self: pytest.fail("有缓存的接口地址时不应启动浏览器"))
+
+    ms = weather.MSWeather("广州")
+    assert ms.get_current() == CURRENT
+    # 第二次查询直接使用结果缓存，不再请求接口
+    assert weather.MSWeather("广州").get_current() == CURRENT
+    assert requested == ["https://example/cached"]
+
+
+def test_stale_endpoint_is_rediscovered(caches, monkeypatch):
+    weather.save_endpoint("深圳", "https://example/stale")
+
+    def fake_get(url, timeout):
+        # 失效的接口返回的数据结构不对
+        return FakeResponse(PAYLOAD if url == "https://example/fresh" else {"error": "expired"})
+
+    monkeypatch.setattr(weather.requests, "get", fake_get)
+    monkeypatch.setattr(weather.MSWeather, "_discover_endpoint", lambda self: "https://example/fresh")
+
+    assert weather.MSWeather("深圳").get_current() == CURRENT
+    assert weather.get_cached_endpoint("深圳") == "https://example/fresh"
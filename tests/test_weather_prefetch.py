@@ -0,0 +1,70 @@
+import json
+
+import lib.weather_scheduler as scheduler
+
+
+def test_from_settings_requires_enabled(tmp_path):
+    path = tmp_path / "setting.json"
+    path.write_text(json.dumps({"weather_prefetch": {"enabled": False}}), encoding="utf-8")
+    assert scheduler.WeatherPrefetcher.from_settings(str(path)) is None
+
+    path.write_text(json.dumps({"weather_prefetch": {
+        "enabled": True, "interval_minutes": 15, "cities": ["北京"], "include_local": False
+    }}), encoding="utf-8")
+    prefetcher = scheduler.WeatherPrefetcher.from_settings(str(path))
+    assert prefetcher.cities == ["北京"]
+    assert prefetcher.interval == 15 * 60
+    # 缓存有效期覆盖一次刷新间隔
+    assert prefetcher.cache_ttl > prefetcher.interval
+
+
+def test_failed_city_backs_off_exponentially(monkeypatch):
+    attempts = []
+
+    class FailingWeather:
+        def __init__(self, city):
+            self.city = city
+
+        def get_current(self, ttl):
+            attempts.append(self.city)
+            raise RuntimeError("network down")
+
+    now = [1000.0]
+    monkeypatch.setattr(scheduler, "MSWeather", FailingWeather)
+    monkeypatch.setattr(scheduler.time, "time", lambda: now[0])
+
+    prefetcher = scheduler.WeatherPrefetcher(include_local=False)
+    prefetcher._refresh_city("北京")
+    assert prefetcher._retry_at["北京"] == 1000 + 120
+    prefetcher._refresh_city("北京")  # 退避期间不会再次请求
+    assert attempts == ["北京"]
+
+    now[0] = 1000 + 121
+    prefetcher._refresh_city("北京")
+    assert attempts == ["北京", "北京"]
+    assert prefetcher._retry_at["北京"] == now[0] + 240
+
+
+def test_targets_include_recent_cities_once(monkeypatch):
+    monkeypatch.setattr(scheduler, "get_recent_cities", lambda: ["上海", "北京"])
+    prefetcher = scheduler.WeatherPrefetcher(cities=["北京"], include_local=False)
+    assert prefetcher._target_cities() == ["北京", "上海"]
+
+
+def test_success_fills_cache_read_by_get_weather(monkeypatch):
+    import lib.getWeather as weather
+    monkeypatch.setattr(weather, "_weather_cache", {})
+
+    class FakeWeather:
+        def __init__(self, city):
+            self.city = city
+
+        def get_current(self, ttl):
+            weather.put_cached_weather(self.city, {"temp": 20})
+            return {"temp": 20}
+
+    monkeypatch.setattr(scheduler, "MSWeather", FakeWeather)
+    prefetcher = scheduler.WeatherPrefetcher(include_local=False)
+    prefetcher._refresh_city("杭州")
+    assert prefetcher.get_weather("杭州") == {"temp": 20}
+    assert "杭州" not in prefetcher._failures